@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+两阶段调度吞吐基准测试
+
+模拟一连串短消息：每条消息先经过 AI 阶段（--ai-ms），再经过剪贴板/粘贴
+阶段（--inject-ms）。对比逐条串行处理与 RequestScheduler 流水线处理的
+总耗时；流水线的吞吐应受较慢阶段限制，而不是两阶段之和。
+
+用法:
+    python benchmarks/bench_pipelined_scheduling.py [--messages 10] [--ai-ms 300] [--inject-ms 250]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import InjectionLoop
+from server.scheduler import RequestScheduler
+
+
+async def fake_ai(seconds):
+    await asyncio.sleep(seconds)
+
+
+async def fake_inject(seconds):
+    await asyncio.sleep(seconds)
+
+
+async def sequential(messages, ai, inject):
+    for _ in range(messages):
+        await fake_ai(ai)
+        await fake_inject(inject)
+
+
+async def pipelined(scheduler, messages, ai, inject):
+    async def request():
+        ticket = scheduler.reserve()
+        await scheduler.run_ai(fake_ai(ai))
+        await scheduler.inject(ticket, fake_inject(inject))
+
+    await asyncio.gather(*(request() for _ in range(messages)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sequential and pipelined AI/injection scheduling')
+    parser.add_argument('--messages', type=int, default=10)
+    parser.add_argument('--ai-ms', type=float, default=300)
+    parser.add_argument('--inject-ms', type=float, default=250)
+    parser.add_argument('--ai-concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    ai, inject = args.ai_ms / 1000, args.inject_ms / 1000
+    print(f"{args.messages} messages, AI {args.ai_ms:.0f} ms, inject {args.inject_ms:.0f} ms\n")
+
+    started = time.perf_counter()
+    asyncio.run(sequential(args.messages, ai, inject))
+    print(f"{'sequential':<12} {time.perf_counter() - started:6.2f} s")
+
+    injection_loop = InjectionLoop()
+    scheduler = RequestScheduler(injection_loop, max_ai_concurrency=args.ai_concurrency)
+    try:
+        started = time.perf_counter()
+        asyncio.run(pipelined(scheduler, args.messages, ai, inject))
+        print(f"{'pipelined':<12} {time.perf_counter() - started:6.2f} s")
+    finally:
+        scheduler.stop()
+        injection_loop.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+HTTP 服务单请求开销基准测试
+
+对比 Flask/Werkzeug 开发服务器（AIPUT_SERVER_MODE=dev）与 aiohttp 生产服务器
+处理 /type 请求的框架开销。请求体为空文本，处理器会立即返回，不触发 AI、
+剪贴板或键盘操作，因此测得的就是纯粹的服务器开销。
+
+用法:
+    python benchmarks/bench_server_overhead.py [--requests 500] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import aiohttp
+
+from server import TypeHandler, create_http_server
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def run_load(url: str, total: int, concurrency: int, keep_alive: bool):
+    """Send `total` POST /type requests with `concurrency` workers; return latencies."""
+    latencies = []
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=not keep_alive)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                started = time.perf_counter()
+                async with session.post(url, json={'text': ''}) as response:
+                    await response.read()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def report(name: str, latencies, elapsed: float):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{name:<28} {len(latencies) / elapsed:>9.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-request overhead of the dev and production servers')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    handler = TypeHandler()
+    print(f"{args.requests} requests, concurrency {args.concurrency}\n")
+
+    for mode in ('dev', 'production'):
+        port = free_port()
+        server = create_http_server(handler, mode=mode)
+        server.start('127.0.0.1', port)
+        url = f'http://127.0.0.1:{port}/type'
+        try:
+            for keep_alive in (False, True):
+                # 屏蔽处理器的请求日志，避免 print 影响测量
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    # 预热
+                    asyncio.run(run_load(url, 20, 1, keep_alive=True))
+                    latencies, elapsed = asyncio.run(run_load(url, args.requests, args.concurrency, keep_alive))
+                label = f"{mode} ({'keep-alive' if keep_alive else 'new conn'})"
+                report(label, latencies, elapsed)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
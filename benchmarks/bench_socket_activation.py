@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+套接字激活冷启动基准测试
+
+模拟 systemd 的套接字激活：由本脚本绑定端口，客户端先连接并发送请求
+（请求在内核队列中等待），再以 LISTEN_FDS=1 启动 `cli.py serve`，测量
+首个请求从发出到收到响应的时间（冷启动延迟）、随后请求的延迟（热延迟），
+以及空闲超时后进程自动退出的时间。无需安装 systemd。
+
+用法:
+    python benchmarks/bench_socket_activation.py [--runs 5] [--idle-timeout 1]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# 在子进程中把监听套接字放到 fd 3 并设置 LISTEN_PID/LISTEN_FDS，然后 exec（PID 不变）
+ACTIVATE = (
+    'import os, sys; os.dup2(int(sys.argv[1]), 3); '
+    'os.environ.update(LISTEN_PID=str(os.getpid()), LISTEN_FDS="1"); '
+    'os.execv(sys.executable, [sys.executable] + sys.argv[2:])'
+)
+
+
+def get(port: int, path: str = '/stats') -> float:
+    """Seconds for one GET request on a new connection."""
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        connection.request('GET', path)
+        connection.getresponse().read()
+    finally:
+        connection.close()
+    return time.perf_counter() - started
+
+
+def activate_once(idle_timeout: float):
+    """Return (cold request seconds, warm request seconds, seconds from last request to exit)."""
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(128)
+    port = listener.getsockname()[1]
+
+    # 客户端在进程启动前连接：连接由内核接受并排队
+    client = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    started = time.perf_counter()
+    client.connect()
+    client.request('GET', '/stats')
+
+    process = subprocess.Popen(
+        [sys.executable, '-c', ACTIVATE, str(listener.fileno()), os.path.join(SRC_DIR, 'cli.py'),
+         'serve', '--no-qr', '--idle-timeout', str(idle_timeout)],
+        pass_fds=(listener.fileno(),),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        client.getresponse().read()
+        cold = time.perf_counter() - started
+        client.close()
+        warm = statistics.median(get(port) for _ in range(5))
+
+        last_request = time.perf_counter()
+        process.wait(timeout=idle_timeout + 30)
+        idle_exit = time.perf_counter() - last_request
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+        listener.close()
+    return cold, warm, idle_exit
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure socket-activated cold start and idle shutdown')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--idle-timeout', type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = [activate_once(args.idle_timeout) for _ in range(args.runs)]
+    cold, warm, idle_exit = (statistics.median(values) for values in zip(*results))
+    print(f"first request (cold start) {cold * 1000:8.1f} ms (median of {args.runs})")
+    print(f"later requests (warm)      {warm * 1000:8.1f} ms")
+    print(f"exit after last request    {idle_exit:8.1f} s  (idle timeout {args.idle_timeout:g} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+启动时间基准测试
+
+测量 `cli.py serve`（无界面模式）从启动进程到 HTTP 服务可用的时间及此时的
+常驻内存，并单独测量图形界面入口额外需要导入的 tkinter / qrcode / PIL
+模块的开销（无需显示器）。
+
+用法:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+GUI_IMPORTS = 'import tkinter, tkinter.ttk, qrcode; from PIL import Image, ImageTk'
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_kib(pid: int):
+    """VmRSS of a process in KiB (Linux only)."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def time_serve(timeout: float = 30):
+    """Start `cli.py serve` and return (seconds until GET / succeeds, RSS in KiB)."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SRC_DIR, 'cli.py'), 'serve', '--host', '127.0.0.1',
+         '--port', str(port), '--no-qr'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1):
+                    return time.perf_counter() - started, rss_kib(process.pid)
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError('server did not start')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def time_gui_imports():
+    """Seconds spent importing the GUI-only modules in a fresh interpreter (None if unavailable)."""
+    code = f'import time; t = time.perf_counter(); {GUI_IMPORTS}; print(time.perf_counter() - t)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure headless startup time and the GUI import cost')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    serve_times, rss = [], []
+    for _ in range(args.runs):
+        seconds, kib = time_serve()
+        serve_times.append(seconds)
+        if kib:
+            rss.append(kib)
+    print(f"aiput serve ready in      {statistics.median(serve_times) * 1000:8.1f} ms (median of {args.runs})")
+    if rss:
+        print(f"aiput serve RSS           {statistics.median(rss) / 1024:8.1f} MiB")
+
+    gui_times = [t for t in (time_gui_imports() for _ in range(args.runs)) if t is not None]
+    if gui_times:
+        print(f"GUI-only imports          {statistics.median(gui_times) * 1000:8.1f} ms (not paid by serve)")
+    else:
+        print("GUI-only imports          unavailable (tkinter / qrcode / PIL not installed)")
+
+
+if __name__ == '__main__':
+    main()
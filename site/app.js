@@ -76,6 +76,253 @@ function hideLoading() {
     input.focus();
 }
 
+// WebSocket channel to the server
+// One connection carries every submission and delivers stage events; when it is
+// not available (e.g. the Flask dev server) requests fall back to fetch('/type').
+const STAGE_MESSAGES = {
+    queued: "排队中...",
+    ai_started: "AI处理中...",
+    ai_done: "AI处理完成，正在粘贴...",
+    pasted: "已粘贴",
+    submitted: "已发送 Ctrl+Enter"
+};
+
+const typeChannel = {
+    ws: null,
+    pending: new Map(),     // message id -> { resolve, reject, onEvent }
+    nextId: 0,
+    retryDelay: 1000,
+    pingTimer: null,
+    lastMessageAt: 0,
+    unsupported: false,
+
+    connect() {
+        if (this.unsupported || !('WebSocket' in window)) return;
+        const scheme = location.protocol === 'https:' ? 'wss://' : 'ws://';
+        let opened = false;
+        const ws = new WebSocket(scheme + location.host + '/ws');
+        this.ws = ws;
+
+        ws.onopen = () => {
+            opened = true;
+            this.retryDelay = 1000;
+            this.lastMessageAt = Date.now();
+            // The server is reachable again
+            if (outboxPending > 0) flushOutbox();
+        };
+        ws.onmessage = (event) => this.handleMessage(JSON.parse(event.data));
+        ws.onclose = () => {
+            this.ws = null;
+            clearInterval(this.pingTimer);
+            // Requests in flight are not re-sent: the paste may already have happened
+            this.pending.forEach(({ reject }) => reject(new TypeError('WebSocket closed')));
+            this.pending.clear();
+            if (!opened && this.retryDelay >= 8000) {
+                // Server never accepted the upgrade: stay on fetch
+                this.unsupported = true;
+                return;
+            }
+            setTimeout(() => this.connect(), this.retryDelay);
+            this.retryDelay = Math.min(this.retryDelay * 2, 30000);
+        };
+    },
+
+    handleMessage(message) {
+        this.lastMessageAt = Date.now();
+        if (message.type === 'hello') {
+            // Application-level heartbeat: browsers cannot observe protocol pings
+            const interval = (message.heartbeat || 20) * 1000;
+            clearInterval(this.pingTimer);
+            this.pingTimer = setInterval(() => {
+                if (Date.now() - this.lastMessageAt > interval * 2.5) {
+                    this.ws && this.ws.close();
+                    return;
+                }
+                this.send({ type: 'ping' });
+            }, interval);
+            return;
+        }
+
+        const entry = this.pending.get(message.id);
+        if (!entry) return;
+        if (message.type === 'event') {
+            entry.onEvent && entry.onEvent(message.stage, message);
+        } else if (message.type === 'result') {
+            this.pending.delete(message.id);
+            const { type, id, ...data } = message;
+            entry.resolve(data);
+        }
+    },
+
+    isOpen() {
+        return this.ws !== null && this.ws.readyState === WebSocket.OPEN;
+    },
+
+    send(message) {
+        if (this.isOpen()) this.ws.send(JSON.stringify(message));
+    },
+
+    submit(body, onEvent) {
+        const id = String(++this.nextId);
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, { resolve, reject, onEvent });
+            this.send({ type: 'submit', id: id, ...body });
+        });
+    }
+};
+
+// Set once the server turns out not to offer the job API (Flask dev server)
+let jobsUnsupported = false;
+
+/**
+ * Submit a job and follow its progress over Server-Sent Events
+ * EventSource reconnects on its own and resumes with Last-Event-ID, so a
+ * backgrounded tab or network switch does not lose the result.
+ * @param {object} body - Same fields as the /type JSON body
+ * @param {function} onEvent - Called with (stage, event) for progress events
+ * @returns {Promise<object|null>} The /type response body, or null if jobs are unsupported
+ */
+function postJob(body, onEvent) {
+    return fetch('/jobs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    })
+    .then(response => {
+        if (response.status === 404 || response.status === 405) {
+            jobsUnsupported = true;
+            return null;
+        }
+        return response.json();
+    })
+    .then(job => {
+        if (!job) return null;
+        if (!job.job_id) return job;  // e.g. 503 with an error body
+
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(job.events);
+            source.addEventListener('stage', event => {
+                const data = JSON.parse(event.data);
+                onEvent && onEvent(data.stage, data);
+            });
+            source.addEventListener('result', event => {
+                source.close();
+                resolve(JSON.parse(event.data));
+            });
+            source.onerror = () => {
+                // CONNECTING means the browser is retrying; CLOSED is final (e.g. job expired)
+                if (source.readyState === EventSource.CLOSED) {
+                    reject(new TypeError('Job stream closed'));
+                }
+            };
+        });
+    });
+}
+
+/**
+ * Send a /type request over the WebSocket channel if it is open, otherwise
+ * as a job with SSE progress, falling back to a plain fetch('/type')
+ * @param {object} body - Same fields as the /type JSON body
+ * @param {function} onEvent - Called with (stage, event) for progress events
+ * @returns {Promise<object>} The /type response body
+ */
+function postType(body, onEvent) {
+    if (typeChannel.isOpen()) {
+        return typeChannel.submit(body, onEvent);
+    }
+    const plainFetch = () => fetch('/type', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    }).then(response => response.json());
+
+    if (jobsUnsupported || !('EventSource' in window)) {
+        return plainFetch();
+    }
+    return postJob(body, onEvent).then(data => data || plainFetch());
+}
+
+// Offline outbox (outbox.js)
+// Submissions that fail with a network error are queued in IndexedDB and sent
+// in order with one POST /sync once the server is reachable again. While items
+// are queued, new submissions are queued behind them so the order is kept.
+const outboxSupported = typeof Outbox !== 'undefined' && Outbox.isSupported();
+const OUTBOX_RETRY_MS = 10000;
+let outboxPending = 0;
+let outboxRetryTimer = null;
+
+/**
+ * Queue a request body in the outbox and ask the service worker (if any) to flush it
+ * @param {object} body - /type JSON body, with the idempotency key of the failed attempt
+ * @returns {Promise<void>}
+ */
+function queueOffline(body) {
+    return Outbox.add(body).then(() => {
+        outboxPending += 1;
+        if ('serviceWorker' in navigator && navigator.serviceWorker.controller) {
+            navigator.serviceWorker.ready
+                .then(registration => registration.sync && registration.sync.register('aiput-outbox'))
+                .catch(() => {});
+        }
+        scheduleOutboxRetry();
+    });
+}
+
+function scheduleOutboxRetry() {
+    clearTimeout(outboxRetryTimer);
+    if (outboxPending > 0) {
+        outboxRetryTimer = setTimeout(flushOutbox, OUTBOX_RETRY_MS);
+    }
+}
+
+/**
+ * Send queued submissions if there are any; retried periodically until the outbox is empty
+ */
+function flushOutbox() {
+    if (!outboxSupported) return;
+    Outbox.size()
+        .then(size => {
+            outboxPending = size;
+            return size ? Outbox.flush().then(showFlushSummary) : null;
+        })
+        .catch(err => console.warn('Outbox flush failed:', err))
+        .finally(() => Outbox.size().then(size => {
+            outboxPending = size;
+            scheduleOutboxRetry();
+        }).catch(() => {}));
+}
+
+/**
+ * Report the outcome of an outbox flush in the status line
+ * @param {{results: object[], expired: number}} summary - Result of Outbox.flush()
+ */
+function showFlushSummary(summary) {
+    const sent = summary.results.filter(result => result.success).length;
+    const failed = summary.results.filter(result => !result.success && !result.skipped).length;
+    if (!sent && !failed && !summary.expired) return;
+
+    const parts = [];
+    if (sent) parts.push(`✓ 已补发 ${sent} 条离线消息`);
+    if (failed) parts.push(`✕ ${failed} 条发送失败`);
+    if (summary.expired) parts.push(`${summary.expired} 条已过期未发送`);
+    if (isLoading) return;
+    status.innerText = parts.join('，');
+    status.style.color = failed || summary.expired ? "#ff9500" : "#34c759";
+    setTimeout(() => {
+        status.innerText = "";
+    }, 3000);
+}
+
+/**
+ * Show server-pushed progress in the loading overlay
+ * @param {string} stage - Stage name from the server
+ */
+function showStage(stage) {
+    if (STAGE_MESSAGES[stage] && isLoading) {
+        loadingText.textContent = STAGE_MESSAGES[stage];
+    }
+}
+
 // Load prompts configuration
 async function loadPrompts() {
     try {
@@ -112,6 +359,22 @@ async function loadPrompts() {
 
 // Initialize
 window.onload = function() {
+    // Open the WebSocket channel early so the first send can use it
+    typeChannel.connect();
+
+    // Send anything queued while offline, and again whenever the connection returns
+    flushOutbox();
+    window.addEventListener('online', flushOutbox);
+    if ('serviceWorker' in navigator && window.isSecureContext) {
+        navigator.serviceWorker.register('/sw.js').catch(err => console.warn('Service worker:', err));
+        navigator.serviceWorker.addEventListener('message', event => {
+            if (event.data && event.data.type === 'outbox-flushed') {
+                showFlushSummary(event.data.summary);
+                Outbox.size().then(size => { outboxPending = size; });
+            }
+        });
+    }
+
     // Load prompts first
     loadPrompts().then(() => {
         renderHistory();
@@ -264,6 +527,75 @@ function handleClear() {
     input.focus();
 }
 
+/**
+ * Check whether a prompt entry requires AI processing
+ * @param {object} promptInfo - Entry from prompts.json
+ * @returns {boolean} True for single-prompt and multi-stage modes
+ */
+function isAIMode(promptInfo) {
+    if (!promptInfo || promptInfo.id === 'normal') return false;
+    return Boolean(promptInfo.prompt) || Boolean(promptInfo.stages && promptInfo.stages.length);
+}
+
+/**
+ * Generate an idempotency key for one logical submission
+ * (crypto.randomUUID is only available in secure contexts, the page is usually plain http)
+ * @returns {string} Random key
+ */
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    const bytes = new Uint8Array(16);
+    crypto.getRandomValues(bytes);
+    return Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Labels for the server's per-stage timings (milliseconds)
+const TIMING_LABELS = {
+    ai_wait: 'AI排队',
+    ai: 'AI',
+    queue: '排队',
+    clipboard: '剪贴板',
+    clipboard_settle: '等待',
+    paste: '粘贴',
+    paste_settle: '等待',
+    sound: '提示音',
+    ctrl_enter: '回车',
+    total: '总计'
+};
+
+/**
+ * Format the server's stage timings for the status line
+ * The trace id is logged so a "it was slow" report can be matched to the server log
+ * @param {object} data - /type response body
+ * @returns {string} e.g. "AI 1200ms · 粘贴 3ms · 总计 1450ms", or '' without timings
+ */
+function formatTimings(data) {
+    if (!data.timings) return '';
+    console.info('trace', data.trace_id, data.timings);
+    const merged = {};
+    for (const [stage, ms] of Object.entries(data.timings)) {
+        const label = TIMING_LABELS[stage] || stage;
+        merged[label] = (merged[label] || 0) + ms;
+    }
+    return Object.entries(merged)
+        .filter(([label, ms]) => ms >= 1 || label === TIMING_LABELS.total)
+        .map(([label, ms]) => `${label} ${Math.round(ms)}ms`)
+        .join(' · ');
+}
+
+/**
+ * Show a success message with the timing breakdown on a second line
+ * @param {string} message - Status text
+ * @param {object} data - /type response body
+ */
+function showSuccess(message, data) {
+    const timings = formatTimings(data);
+    status.innerText = timings ? `${message}\n${timings}` : message;
+    status.style.color = "#34c759";
+}
+
 /**
  * Send text to the server with loading states
  * Shows appropriate loading message based on AI processing mode
@@ -280,7 +612,7 @@ function sendRequest(text) {
     let loadingMessage = "发送中...";
 
     // Determine loading message based on processing mode
-    if (promptInfo && promptInfo.prompt && promptInfo.id !== 'normal') {
+    if (isAIMode(promptInfo)) {
         loadingMessage = "AI处理中...";
         if (braveMode) {
             loadingMessage = "AI处理中... (勇敢模式)";
@@ -290,11 +622,19 @@ function sendRequest(text) {
     showLoading(loadingMessage);
 
     // Prepare request body
-    const requestBody = { text: text };
+    // The key is reused by retries and the plain-text fallback so the server
+    // never pastes the same submission twice
+    const idempotencyKey = newIdempotencyKey();
+    const requestBody = {
+        text: text,
+        idempotency_key: idempotencyKey,
+        trace_id: newIdempotencyKey().replace(/-/g, '').slice(0, 16)
+    };
 
     // Add AI processing parameters if not in normal mode
-    if (promptInfo && promptInfo.prompt && promptInfo.id !== 'normal') {
-        requestBody.prompt = promptInfo.prompt;
+    // (multi-stage modes send an empty prompt; the server resolves their stages by mode id)
+    if (isAIMode(promptInfo)) {
+        requestBody.prompt = promptInfo.prompt || '';
         requestBody.mode = promptInfo.id;
         requestBody.provider = 'zai';
     }
@@ -303,12 +643,13 @@ function sendRequest(text) {
         requestBody.auto_submit = true;
     }
 
-    fetch('/type', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(requestBody)
-    })
-    .then(response => response.json())
+    // Keep the order: queue behind earlier offline submissions
+    if (outboxSupported && (outboxPending > 0 || navigator.onLine === false)) {
+        saveOffline(requestBody);
+        return;
+    }
+
+    postType(requestBody, showStage)
     .then(data => {
         hideLoading();
 
@@ -322,28 +663,41 @@ function sendRequest(text) {
                     const processedInfo = data.original_length && data.processed_length
                         ? ` (${data.original_length}→${data.processed_length}字)`
                         : '';
-                    status.innerText = "✓ AI处理完成" + processedInfo +
-                        (braveMode ? " (Ctrl+Enter)" : "");
-                    status.style.color = "#34c759";
+                    showSuccess("✓ AI处理完成" + processedInfo +
+                        (braveMode ? " (Ctrl+Enter)" : ""), data);
                 } else {
-                    status.innerText = braveMode ? "✓ 已发送 (Ctrl+Enter)" : "✓ 已发送";
-                    status.style.color = "#34c759";
+                    showSuccess(braveMode ? "✓ 已发送 (Ctrl+Enter)" : "✓ 已发送", data);
                 }
             }
             input.value = '';
             setTimeout(() => {
                 status.innerText = "";
                 input.focus();
-            }, 1500);
+            }, data.timings ? 3000 : 1500);
+        } else if (data.overloaded) {
+            // Server is shedding load: keep the text and ask the user to retry later
+            status.innerText = `✕ 服务器繁忙，请 ${data.retry_after} 秒后重试`;
+            status.style.color = "#ff3b30";
+            setTimeout(() => {
+                status.innerText = "";
+                input.focus();
+            }, 2000);
         } else {
             throw new Error(data.error || "Server error");
         }
     })
     .catch(err => {
+        const networkError = err.message === 'Failed to fetch' || err.name === 'TypeError';
+        if (networkError && outboxSupported) {
+            // Same idempotency key: if the server did paste it, the flush will not paste again
+            saveOffline(requestBody);
+            return;
+        }
+
         hideLoading();
 
         // Check if it's a network error
-        if (err.message === 'Failed to fetch' || err.name === 'TypeError') {
+        if (networkError) {
             status.innerText = "✕ 网络错误，请检查连接";
         } else {
             status.innerText = "✕ 发送失败";
@@ -356,7 +710,7 @@ function sendRequest(text) {
             setTimeout(() => {
                 if (confirm("AI处理失败，是否发送原始文本？")) {
                     // Send without AI processing
-                    sendPlainRequest(text, braveMode);
+                    sendPlainRequest(text, braveMode, idempotencyKey);
                 } else {
                     setTimeout(() => {
                         status.innerText = "";
@@ -373,32 +727,54 @@ function sendRequest(text) {
     });
 }
 
+/**
+ * Queue a submission in the offline outbox and tell the user
+ * @param {object} body - /type JSON body
+ */
+function saveOffline(body) {
+    queueOffline(body)
+    .then(() => {
+        hideLoading();
+        input.value = '';
+        status.innerText = `⏳ 已离线保存 (${outboxPending} 条待发送)，连接恢复后自动发送`;
+        status.style.color = "#ff9500";
+        setTimeout(() => {
+            status.innerText = "";
+            input.focus();
+        }, 3000);
+        flushOutbox();
+    })
+    .catch(err => {
+        hideLoading();
+        status.innerText = "✕ 网络错误，请检查连接";
+        status.style.color = "#ff3b30";
+        console.error('Outbox:', err);
+    });
+}
+
 // Helper function to send plain request without AI processing
-function sendPlainRequest(text, braveMode) {
+// If the original request did paste (only the response was lost), the shared
+// idempotency key makes the server return that outcome instead of pasting again
+function sendPlainRequest(text, braveMode, idempotencyKey) {
     showLoading("发送中...");
 
     const plainRequestBody = {
         text: text,
-        auto_submit: braveMode
+        auto_submit: braveMode,
+        idempotency_key: idempotencyKey
     };
 
-    fetch('/type', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(plainRequestBody)
-    })
-    .then(response => response.json())
+    postType(plainRequestBody, showStage)
     .then(data => {
         hideLoading();
 
         if (data.success) {
-            status.innerText = "✓ 已发送（原始文本）";
-            status.style.color = "#34c759";
+            showSuccess("✓ 已发送（原始文本）", data);
             input.value = '';
             setTimeout(() => {
                 status.innerText = "";
                 input.focus();
-            }, 1500);
+            }, data.timings ? 3000 : 1500);
         }
     })
     .catch(() => {
@@ -0,0 +1,131 @@
+// Offline outbox shared by the page and the service worker
+// Submissions that could not reach the server are stored in IndexedDB under an
+// auto-increment sequence number and flushed in one POST /sync round trip.
+// Every item keeps the idempotency key of its original attempt, so flushing an
+// item that did paste (only the response was lost) never pastes it twice.
+const Outbox = (() => {
+    const DB_NAME = 'aiput';
+    const STORE = 'outbox';
+    // Older submissions are dropped: the server may have forgotten their idempotency key
+    // (AIPUT_IDEMPOTENCY_TTL, 600 s by default, minus a 60 s margin). The server enforces
+    // the limit and reports it as max_age_ms; this default only covers the first flush.
+    let maxAgeMs = 9 * 60 * 1000;
+    // Server limit per /sync request (AIPUT_SYNC_MAX_ITEMS); the rest goes in the next flush
+    const BATCH_SIZE = 50;
+
+    let dbPromise = null;
+    let flushing = null;
+
+    function open() {
+        if (!dbPromise) {
+            dbPromise = new Promise((resolve, reject) => {
+                const request = indexedDB.open(DB_NAME, 1);
+                request.onupgradeneeded = () => {
+                    request.result.createObjectStore(STORE, { keyPath: 'seq', autoIncrement: true });
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            });
+        }
+        return dbPromise;
+    }
+
+    // Run work(store) in one transaction; resolves with the result of the request it returns
+    function transaction(mode, work) {
+        return open().then(db => new Promise((resolve, reject) => {
+            const tx = db.transaction(STORE, mode);
+            const request = work(tx.objectStore(STORE));
+            tx.oncomplete = () => resolve(request ? request.result : undefined);
+            tx.onerror = tx.onabort = () => reject(tx.error);
+        }));
+    }
+
+    /**
+     * Check whether IndexedDB is usable (missing in some private browsing modes)
+     * @returns {boolean}
+     */
+    function isSupported() {
+        return typeof indexedDB !== 'undefined';
+    }
+
+    /**
+     * Queue a /type request body
+     * @param {object} body - /type JSON body, including its idempotency_key
+     * @returns {Promise<number>} Sequence number of the queued item
+     */
+    function add(body) {
+        return transaction('readwrite', store => store.add({ ...body, queued_at: Date.now() }));
+    }
+
+    /**
+     * @returns {Promise<object[]>} Queued items in sequence order
+     */
+    function all() {
+        return transaction('readonly', store => store.getAll());
+    }
+
+    function remove(seqs) {
+        return transaction('readwrite', store => {
+            seqs.forEach(seq => store.delete(seq));
+        });
+    }
+
+    /**
+     * @returns {Promise<number>} Number of queued items
+     */
+    function size() {
+        return transaction('readonly', store => store.count());
+    }
+
+    /**
+     * Send every queued item in one POST /sync and remove the ones the server handled
+     * Items the server skipped (overloaded) stay queued; concurrent calls share one request.
+     * @returns {Promise<{results: object[], expired: number, remaining: number}>}
+     */
+    function flush() {
+        if (!flushing) {
+            flushing = doFlush().finally(() => { flushing = null; });
+        }
+        return flushing;
+    }
+
+    async function doFlush() {
+        const items = await all();
+        const now = Date.now();
+        const expired = items.filter(item => now - item.queued_at > maxAgeMs);
+        const fresh = items.filter(item => now - item.queued_at <= maxAgeMs);
+        const batch = fresh.slice(0, BATCH_SIZE);
+        if (expired.length) {
+            await remove(expired.map(item => item.seq));
+        }
+        if (!fresh.length) {
+            return { results: [], expired: expired.length, remaining: 0 };
+        }
+
+        const response = await fetch('/sync', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                items: batch.map(({ queued_at, ...item }) => ({ ...item, age_ms: Date.now() - queued_at }))
+            })
+        });
+        if (!response.ok) {
+            throw new TypeError(`Sync failed (${response.status})`);
+        }
+        const data = await response.json();
+        if (typeof data.max_age_ms === 'number') {
+            maxAgeMs = data.max_age_ms;
+        }
+        const results = data.results || [];
+        const handled = results.filter(result => !result.skipped).map(result => result.seq);
+        await remove(handled);
+        const expiredByServer = results.filter(result => result.expired).length;
+        return {
+            results: results.filter(result => !result.expired),
+            expired: expired.length + expiredByServer,
+            remaining: fresh.length - handled.length
+        };
+    }
+
+    return { isSupported, add, all, size, flush };
+})();
@@ -0,0 +1,106 @@
+// Service worker: offline app shell and background flushing of the outbox
+// Only registered in secure contexts (https or localhost); over plain http on
+// the LAN the page flushes the outbox itself when the server is reachable again.
+importScripts('/static/outbox.js');
+
+const CACHE = 'aiput-shell-v1';
+const SYNC_TAG = 'aiput-outbox';
+
+// Cached alongside the assets index.html references (outbox.js is also loaded unhashed by importScripts)
+const SHELL_EXTRAS = ['/static/config/prompts.json', '/static/outbox.js'];
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        Promise.all([caches.open(CACHE), fetch('/')])
+            .then(([cache, response]) => {
+                if (!response.ok) throw new Error(`index.html: HTTP ${response.status}`);
+                return cacheShell(cache, response);
+            })
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+            .then(() => caches.open(CACHE))
+            .then(cache => cache.match('/').then(index => index && index.text()
+                .then(html => pruneShell(cache, shellAssets(html)))))
+            .then(() => self.clients.claim())
+    );
+});
+
+// /static/ URLs of the current page: the fingerprinted app.<hash>.js, outbox.<hash>.js, style.<hash>.css
+function shellAssets(html) {
+    const urls = new Set(SHELL_EXTRAS);
+    for (const match of html.matchAll(/(?:src|href)="(\/static\/[^"]+)"/g)) urls.add(match[1]);
+    return Array.from(urls);
+}
+
+// Store index.html with every asset it references, so the page also loads offline
+// right after the first visit; assets of superseded versions are deleted
+function cacheShell(cache, response) {
+    return response.clone().text().then(html => {
+        const assets = shellAssets(html);
+        return Promise.all(assets.map(url => cache.match(url).then(cached => cached || cache.add(url))))
+            .then(() => cache.put('/', response))
+            .then(() => pruneShell(cache, assets));
+    });
+}
+
+function pruneShell(cache, assets) {
+    return cache.keys().then(requests => Promise.all(requests
+        .filter(request => {
+            const path = new URL(request.url).pathname;
+            return path.startsWith('/static/') && !assets.includes(path);
+        })
+        .map(request => cache.delete(request))));
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== location.origin) return;
+
+    if (url.pathname.startsWith('/static/')) {
+        // Fingerprinted assets never change; others revalidate with their ETag in the background.
+        // Versions no longer referenced by index.html are pruned when the shell is next cached
+        event.respondWith(caches.open(CACHE).then(cache => cache.match(request).then(cached => {
+            const network = fetch(request).then(response => {
+                if (response.ok) cache.put(request, response.clone());
+                return response;
+            });
+            if (cached) {
+                network.catch(() => {});  // offline: the cached copy is enough
+                return cached;
+            }
+            return network;
+        })));
+    } else if (request.mode === 'navigate') {
+        // Network first so a new index.html (new asset hashes) is picked up as soon as possible
+        event.respondWith(fetch(request)
+            .then(response => {
+                if (response.ok) {
+                    const copy = response.clone();
+                    event.waitUntil(caches.open(CACHE).then(cache => cacheShell(cache, copy)).catch(() => {}));
+                }
+                return response;
+            })
+            .catch(() => caches.match('/')));
+    }
+});
+
+// Background Sync: the browser wakes the worker once connectivity returns,
+// even if the page has been closed; a failed flush is retried by the browser
+self.addEventListener('sync', event => {
+    if (event.tag === SYNC_TAG) {
+        event.waitUntil(Outbox.flush().then(notifyClients));
+    }
+});
+
+function notifyClients(summary) {
+    return self.clients.matchAll().then(clients => {
+        clients.forEach(client => client.postMessage({ type: 'outbox-flushed', summary: summary }));
+    });
+}
@@ -1,8 +1,8 @@
 """AI processing module for AIPut"""
 
-from .processor import AIProcessor
+from .processor import AIProcessor, StreamingProcessor
 from .processing_service import ProcessingService
 from .zai_processor import ZAIProcessor
 from .anthropic_processor import AnthropicProcessor
 
-__all__ = ['AIProcessor', 'ProcessingService', 'ZAIProcessor', 'AnthropicProcessor']
\ No newline at end of file
+__all__ = ['AIProcessor', 'StreamingProcessor', 'ProcessingService', 'ZAIProcessor', 'AnthropicProcessor']
\ No newline at end of file
@@ -1,14 +1,16 @@
 import os
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Optional
 import aiohttp
 import json
-from .processor import AIProcessor
+from .processor import StreamingProcessor, anthropic_stream_delta
 
 
-class AnthropicProcessor(AIProcessor):
+class AnthropicProcessor(StreamingProcessor):
     """Anthropic Claude processor implementation"""
 
+    log_name = "Anthropic"
+
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize Anthropic processor
@@ -20,6 +22,8 @@ class AnthropicProcessor(AIProcessor):
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+        # Smaller, quicker model for short inputs (see ai/routing.py); only used when configured
+        self.fast_model = os.getenv("ANTHROPIC_FAST_MODEL") or None
         self.base_url = base_url or os.getenv("ANTHROPIC_API_BASE_URL", "https://api.anthropic.com/v1/messages")
         self.timeout = int(os.getenv("AI_PROCESSING_TIMEOUT", "30"))
         self.max_tokens = 4000  # Claude's max tokens limit
@@ -28,13 +32,14 @@ class AnthropicProcessor(AIProcessor):
         """Check if processor has valid API key"""
         return bool(self.api_key)
 
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    async def process_text(self, text: str, prompt: str, model: Optional[str] = None) -> Optional[str]:
         """
         Process text using Anthropic API
 
         Args:
             text: Input text to process
             prompt: Processing prompt
+            model: Model override for this request (defaults to self.model)
 
         Returns:
             Processed text or None if failed
@@ -47,29 +52,10 @@ class AnthropicProcessor(AIProcessor):
             return text
 
         try:
-            # Prepare the full message
-            user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
-
-            # Prepare request payload for Claude API
-            payload = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                "temperature": 0.7
-            }
-
-            headers = {
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json"
-            }
-
-            # Make async request with retries
+            payload = self._request_payload(text, prompt, model)
+            headers = self._request_headers()
+
+            # Make async request with retries (limited by the shared retry budget)
             max_retries = 2
             for attempt in range(max_retries + 1):
                 try:
@@ -96,8 +82,7 @@ class AnthropicProcessor(AIProcessor):
                                     return None
                             elif response.status == 429:
                                 # Rate limited, wait and retry
-                                if attempt < max_retries:
-                                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                                if attempt < max_retries and await self._wait_before_retry(attempt):
                                     continue
                                 print("[Anthropic Error] Rate limit exceeded")
                                 return None
@@ -114,15 +99,13 @@ class AnthropicProcessor(AIProcessor):
                             else:
                                 error_text = await response.text()
                                 print(f"[Anthropic Error] HTTP {response.status}: {error_text}")
-                                if attempt < max_retries:
-                                    await asyncio.sleep(1)
+                                if attempt < max_retries and await self._wait_before_retry(attempt):
                                     continue
                                 return None
 
                 except asyncio.TimeoutError:
-                    if attempt < max_retries:
+                    if attempt < max_retries and await self._wait_before_retry(attempt):
                         print(f"[Anthropic Error] Request timed out, retrying... (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(1)
                         continue
                     print("[Anthropic Error] Request timed out after retries")
                     return None
@@ -131,6 +114,33 @@ class AnthropicProcessor(AIProcessor):
             print(f"[Anthropic Error] Processing failed: {str(e)}")
             return None
 
+    def _stream_endpoint(self) -> str:
+        return self.base_url
+
+    def _request_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json"
+        }
+
+    def _request_payload(self, text: str, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
+        return {
+            "model": model or self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ],
+            "temperature": 0.7
+        }
+
+    def _stream_delta(self, event: Dict[str, Any]) -> Optional[str]:
+        return anthropic_stream_delta(event)
+
     async def __aenter__(self):
         return self
 
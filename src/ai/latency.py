@@ -0,0 +1,244 @@
+"""Adaptive per-provider timeouts learned from observed latencies"""
+
+import os
+import json
+import math
+import atexit
+import threading
+from typing import Optional, Dict, Any
+
+# Seconds between recording a sample and writing the sketches to disk
+SAVE_DELAY_SECONDS = 60.0
+# Bumped when the key layout changes; older state files are ignored
+STATE_VERSION = 2
+
+
+def default_state_path() -> str:
+    """Location of the persisted latency sketches (XDG data dir)"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "aiput", "latency_sketches.json")
+
+
+class LatencySketch:
+    """
+    Streaming quantile sketch with bounded relative error
+
+    Values are counted in logarithmically sized buckets (DDSketch style),
+    so any quantile is accurate to within relative_accuracy while memory
+    stays at a few dozen buckets. Counts are halved once max_count is
+    reached so the sketch follows recent behaviour.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02, max_count: int = 2000):
+        self.relative_accuracy = relative_accuracy
+        self.max_count = max_count
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, float] = {}
+        self.count = 0.0
+
+    def add(self, value: float):
+        """Record one observation (seconds)"""
+        value = max(value, 1e-3)
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0.0) + 1
+        self.count += 1
+
+        if self.count >= self.max_count:
+            self.buckets = {k: v / 2 for k, v in self.buckets.items() if v >= 1}
+            self.count = sum(self.buckets.values())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for persistence"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "count": self.count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Restore a persisted sketch"""
+        sketch = cls(relative_accuracy=data.get("relative_accuracy", 0.02))
+        sketch.buckets = {int(k): float(v) for k, v in data.get("buckets", {}).items()}
+        sketch.count = float(data.get("count", sum(sketch.buckets.values())))
+        return sketch
+
+
+class AdaptiveTimeouts:
+    """
+    Derives request timeouts per (provider, model, mode) from observed p99 latency
+
+    The model is part of the key because model tiering sends requests of
+    the same mode to very different models; mixing their latencies would
+    cut off the slower one. Samples are written to disk by a timer thread
+    (and at exit), never on the caller's thread.
+    """
+
+    def __init__(self, default_timeout: float, state_path: Optional[str] = None):
+        """
+        Initialize adaptive timeouts
+
+        Args:
+            default_timeout: Static timeout used until enough samples exist;
+                also the default upper bound
+            state_path: JSON file used to persist sketches across restarts
+        """
+        self.enabled = os.getenv("AI_ADAPTIVE_TIMEOUT", "true").lower() == "true"
+        self.min_timeout = float(os.getenv("AI_TIMEOUT_MIN", "5"))
+        self.max_timeout = float(os.getenv("AI_TIMEOUT_MAX", str(default_timeout)))
+        self.multiplier = float(os.getenv("AI_TIMEOUT_P99_MULTIPLIER", "2.0"))
+        self.min_samples = int(os.getenv("AI_TIMEOUT_MIN_SAMPLES", "20"))
+        self.default_timeout = default_timeout
+        self.state_path = state_path or os.getenv("AI_LATENCY_STATE_FILE") or default_state_path()
+
+        self._sketches: Dict[str, LatencySketch] = {}
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._save_timer: Optional[threading.Timer] = None
+        self._load()
+        atexit.register(self.save)
+
+    @staticmethod
+    def _key(provider: str, mode: Optional[str], model: Optional[str]) -> str:
+        return f"{provider}/{model or 'default'}/{mode or 'default'}"
+
+    def record(self, provider: str, mode: Optional[str], seconds: float, model: Optional[str] = None):
+        """
+        Record the latency of a successful request
+
+        Args:
+            provider: Provider name
+            mode: Processing mode
+            seconds: Observed latency
+            model: Model that served the request
+        """
+        self._add(self._key(provider, mode, model), seconds)
+
+    def record_timeout(self, provider: str, mode: Optional[str], timeout: float, model: Optional[str] = None):
+        """
+        Record a request that was cut off by its timeout
+
+        The real latency is unknown but at least the timeout, so it is
+        counted as a (censored) sample at that value. Otherwise only calls
+        that beat the timeout would be seen, the learned p99 could only
+        shrink, and a provider that slows down would time out on every
+        call once the timeout reached its floor. With more than 1% of
+        calls timing out the p99 climbs to the timeout, so the next
+        timeout grows by the multiplier (up to AI_TIMEOUT_MAX).
+
+        Args:
+            provider: Provider name
+            mode: Processing mode
+            timeout: Timeout the request hit (seconds)
+            model: Model that served the request
+        """
+        self._add(self._key(provider, mode, model), timeout)
+
+    def _add(self, key: str, seconds: float):
+        with self._lock:
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                sketch = self._sketches[key] = LatencySketch()
+            sketch.add(seconds)
+            self._unsaved += 1
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def timeout_for(self, provider: str, mode: Optional[str], model: Optional[str] = None) -> float:
+        """
+        Timeout to apply to the next request
+
+        Args:
+            provider: Provider name
+            mode: Processing mode
+            model: Model that will serve the request
+
+        Returns:
+            Multiplier x observed p99 clamped to [AI_TIMEOUT_MIN, AI_TIMEOUT_MAX],
+            or the static default while fewer than AI_TIMEOUT_MIN_SAMPLES exist
+        """
+        with self._lock:
+            sketch = self._sketches.get(self._key(provider, mode, model))
+        return self._timeout(sketch)
+
+    def _timeout(self, sketch: Optional[LatencySketch]) -> float:
+        if not self.enabled or sketch is None:
+            return self.default_timeout
+        with self._lock:
+            if sketch.count < self.min_samples:
+                return self.default_timeout
+            p99 = sketch.quantile(0.99)
+        return min(max(p99 * self.multiplier, self.min_timeout), self.max_timeout)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current p50/p99 and derived timeout per provider/model/mode key"""
+        with self._lock:
+            keys = list(self._sketches.items())
+        result = {}
+        for key, sketch in keys:
+            with self._lock:
+                samples, p50, p99 = int(sketch.count), sketch.quantile(0.5), sketch.quantile(0.99)
+            result[key] = {
+                "samples": samples,
+                "p50": p50,
+                "p99": p99,
+                "timeout": self._timeout(sketch)
+            }
+        return result
+
+    def _load(self):
+        """Load persisted sketches, ignoring unreadable state"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION:
+                return
+            self._sketches = {k: LatencySketch.from_dict(v) for k, v in data.get("sketches", {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Latency] Ignoring unreadable state {self.state_path}: {str(e)}")
+
+    def save(self):
+        """Persist sketches atomically"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+            if not self._unsaved:
+                return
+            data = {"version": STATE_VERSION, "sketches": {k: v.to_dict() for k, v in self._sketches.items()}}
+            self._unsaved = 0
+
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"[Latency] Failed to save {self.state_path}: {str(e)}")
@@ -0,0 +1,123 @@
+"""Processing mode definitions loaded from site/config/prompts.json"""
+
+import os
+import json
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Any
+
+
+def default_prompts_path() -> str:
+    """Path of the prompts.json shipped with the mobile site"""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(os.path.dirname(src_dir), "site", "config", "prompts.json")
+
+
+@dataclass
+class ModeConfig:
+    """A single entry of prompts.json"""
+    id: str
+    prompt: str = ""
+    stages: List[str] = field(default_factory=list)
+    fuse: bool = False
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_pipeline(self) -> bool:
+        """True when the mode chains more than one prompt"""
+        return len(self.stages) > 1
+
+
+class ModeRegistry:
+    """Resolves mode ids to prompts and multi-stage pipelines"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize registry
+
+        Args:
+            path: prompts.json location (defaults to the bundled site config)
+        """
+        self.path = path or os.getenv("AI_PROMPTS_PATH") or default_prompts_path()
+        self._modes: Optional[Dict[str, ModeConfig]] = None
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> Dict[str, ModeConfig]:
+        """Load prompts.json, reloading when the file changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            if self._modes is None:
+                print(f"[Modes] prompts.json not found: {self.path}")
+                self._modes = {}
+            return self._modes
+
+        if self._modes is not None and mtime == self._mtime:
+            return self._modes
+
+        modes: Dict[str, ModeConfig] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("prompts", [])
+
+            raw = {entry["id"]: entry for entry in entries if entry.get("id")}
+            for mode_id, entry in raw.items():
+                try:
+                    stages = self._resolve_stages(entry, raw)
+                except ValueError as e:
+                    print(f"[Modes] Skipping mode: {str(e)}")
+                    continue
+
+                modes[mode_id] = ModeConfig(
+                    id=mode_id,
+                    prompt=entry.get("prompt", ""),
+                    stages=stages,
+                    fuse=bool(entry.get("fuse", False)),
+                    extra={k: v for k, v in entry.items()
+                           if k not in ("id", "name", "description", "prompt", "stages", "fuse")}
+                )
+        except Exception as e:
+            print(f"[Modes] Failed to load {self.path}: {str(e)}")
+            modes = self._modes or {}
+
+        self._modes = modes
+        self._mtime = mtime
+        return modes
+
+    @staticmethod
+    def _resolve_stages(entry: Dict[str, Any], raw: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Turn a "stages" list into prompt strings
+
+        A stage is either the id of another (single-prompt) mode or an
+        object with an inline "prompt".
+        """
+        prompts = []
+        for stage in entry.get("stages", []):
+            if isinstance(stage, str):
+                target = raw.get(stage)
+                if not target or not target.get("prompt"):
+                    raise ValueError(f"mode '{entry['id']}' references unknown stage '{stage}'")
+                prompts.append(target["prompt"])
+            elif isinstance(stage, dict) and stage.get("prompt"):
+                prompts.append(stage["prompt"])
+            else:
+                raise ValueError(f"mode '{entry['id']}' has an invalid stage: {stage!r}")
+        return prompts
+
+    def get(self, mode: Optional[str]) -> Optional[ModeConfig]:
+        """
+        Look up a mode
+
+        Args:
+            mode: Mode id (as sent by the client)
+
+        Returns:
+            ModeConfig or None if unknown
+        """
+        if not mode:
+            return None
+        return self._load().get(mode)
+
+    def list_modes(self) -> List[str]:
+        """List known mode ids"""
+        return list(self._load().keys())
@@ -0,0 +1,156 @@
+"""Multi-stage processing pipelines with streamed hand-off between stages"""
+
+import asyncio
+from typing import Optional, List, AsyncIterator
+from .processor import AIProcessor
+
+# Punctuation that always closes a sentence, even at the end of the buffer
+HARD_BREAKS = "。！？；\n"
+# ASCII punctuation only closes a sentence when followed by whitespace
+# (avoids cutting "3.14" or "e.g." while they are still streaming in)
+SOFT_BREAKS = ".!?;"
+
+
+class PipelineError(RuntimeError):
+    """Raised when a pipeline stage produces no output"""
+
+
+def fuse_prompts(prompts: List[str]) -> str:
+    """
+    Combine stage prompts into a single prompt for one provider call
+
+    Args:
+        prompts: Stage prompts in execution order, each containing {user_input}
+
+    Returns:
+        Combined prompt containing a single {user_input} placeholder
+    """
+    steps = []
+    for index, prompt in enumerate(prompts, 1):
+        body = prompt.replace("{user_input}", "").strip()
+        steps.append(f"步骤 {index}：\n{body}")
+
+    return (
+        "请依次完成以下步骤，每一步都以上一步的结果作为输入。"
+        "只输出最后一步的结果，不要输出中间结果、步骤编号或任何解释。\n\n"
+        + "\n\n".join(steps)
+        + "\n\n{user_input}"
+    )
+
+
+def _last_sentence_boundary(text: str) -> int:
+    """Index just past the last complete sentence in text (0 if none)"""
+    for index in range(len(text) - 1, -1, -1):
+        char = text[index]
+        if char in HARD_BREAKS:
+            return index + 1
+        if char in SOFT_BREAKS and index + 1 < len(text) and text[index + 1].isspace():
+            return index + 2
+    return 0
+
+
+async def sentence_chunks(fragments: AsyncIterator[str], min_chars: int = 40) -> AsyncIterator[str]:
+    """
+    Regroup a token stream into runs of complete sentences
+
+    Args:
+        fragments: Streamed text fragments
+        min_chars: Minimum chunk length before a sentence boundary is cut
+
+    Yields:
+        Chunks ending on a sentence boundary (the last one may not)
+    """
+    buffer = ""
+    async for fragment in fragments:
+        buffer += fragment
+        cut = _last_sentence_boundary(buffer)
+        if cut and cut >= min_chars:
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+    if buffer.strip():
+        yield buffer
+
+
+def join_chunks(chunks: List[str]) -> str:
+    """Join per-chunk outputs, inserting a space only between Latin text"""
+    result = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if result and not result[-1].isspace() and ord(result[-1]) < 0x2E80 and ord(chunk[0]) < 0x2E80:
+            result += " "
+        result += chunk
+    return result.strip()
+
+
+async def _process_chunk(processor: AIProcessor, chunk: str, prompt: str, model: Optional[str]) -> str:
+    """Run one stage on one chunk, keeping paragraph breaks intact"""
+    result = await processor.process_text(chunk.strip(), prompt, model)
+    if not result:
+        raise PipelineError("stage returned no output")
+    return result + "\n" if chunk.endswith("\n") else result
+
+
+async def _chain_stage(processor: AIProcessor, upstream: AsyncIterator[str], prompt: str,
+                       model: Optional[str]) -> AsyncIterator[str]:
+    """
+    Feed each upstream chunk into the next stage as soon as it is complete
+
+    Chunks are processed concurrently; results are yielded in input order.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def feed():
+        try:
+            async for chunk in upstream:
+                if chunk.strip():
+                    await queue.put(asyncio.ensure_future(_process_chunk(processor, chunk, prompt, model)))
+        finally:
+            await queue.put(None)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            task = await queue.get()
+            if task is None:
+                break
+            yield await task
+        # Surface upstream failures
+        await feeder
+    finally:
+        feeder.cancel()
+        while not queue.empty():
+            task = queue.get_nowait()
+            if task is not None:
+                task.cancel()
+
+
+async def run_pipeline(processor: AIProcessor, text: str, prompts: List[str], min_chunk_chars: int = 40,
+                       model: Optional[str] = None) -> Optional[str]:
+    """
+    Execute chained prompts with streamed hand-off
+
+    The first stage is streamed; every later stage starts working on the
+    first completed sentences of its predecessor instead of waiting for
+    the whole output, so total latency approaches that of the slowest stage.
+
+    Args:
+        processor: Processor used for every stage
+        text: Original input text
+        prompts: Stage prompts in execution order
+        min_chunk_chars: Minimum chunk size handed to the next stage
+        model: Model override applied to every stage
+
+    Returns:
+        Output of the final stage, or None if nothing was produced
+    """
+    if not prompts:
+        return text
+
+    upstream = sentence_chunks(processor.stream_text(text, prompts[0], model), min_chunk_chars)
+    for prompt in prompts[1:]:
+        upstream = _chain_stage(processor, upstream, prompt, model)
+
+    chunks = [chunk async for chunk in upstream]
+    return join_chunks(chunks) or None
@@ -1,9 +1,24 @@
 import os
+import socket
+import time
 import asyncio
-from typing import Optional, Dict, Type
+from typing import Optional, Dict, Type, Any
+from urllib.parse import urlparse
 from .processor import AIProcessor
 from .zai_processor import ZAIProcessor
 from .anthropic_processor import AnthropicProcessor
+from .modes import ModeRegistry, ModeConfig
+from .pipeline import run_pipeline, fuse_prompts
+from .routing import RoutingPolicy, TIER_FAST, estimate_tokens
+from .latency import AdaptiveTimeouts
+from .retry import get_retry_budget
+from .shadow import ShadowRunner
+from .stats import StatsStore
+
+
+def processor_model(processor: AIProcessor) -> Optional[str]:
+    """Default model name of a processor, if it exposes one"""
+    return getattr(processor, "model", None)
 
 
 class ProcessingService:
@@ -15,6 +30,12 @@ class ProcessingService:
         self._instances: Dict[str, AIProcessor] = {}
         self.default_provider = os.getenv("AI_PROCESSOR_DEFAULT", "anthropic")
         self.timeout = int(os.getenv("AI_PROCESSING_TIMEOUT", "30"))
+        self.pipeline_chunk_chars = int(os.getenv("AI_PIPELINE_MIN_CHUNK_CHARS", "40"))
+        self.modes = ModeRegistry()
+        self.routing = RoutingPolicy()
+        self.timeouts = AdaptiveTimeouts(default_timeout=self.timeout)
+        self.stats = StatsStore()
+        self.shadow = ShadowRunner()
 
         # Register built-in processors
         self.register_processor("anthropic", AnthropicProcessor)
@@ -65,7 +86,8 @@ class ProcessingService:
             print(f"[ProcessingService] Failed to initialize {provider}: {str(e)}")
             return None
 
-    async def process(self, text: str, prompt: str, provider: Optional[str] = None, mode: Optional[str] = None) -> Optional[str]:
+    async def process(self, text: str, prompt: str, provider: Optional[str] = None, mode: Optional[str] = None,
+                      latency_budget_ms: Optional[float] = None, tier: Optional[str] = None) -> Optional[str]:
         """
         Process text with AI
 
@@ -73,7 +95,9 @@ class ProcessingService:
             text: Input text
             prompt: Processing prompt
             provider: AI provider (uses default if None)
-            mode: Processing mode (for logging)
+            mode: Processing mode (multi-stage modes are resolved from prompts.json)
+            latency_budget_ms: Optional client latency budget used for model routing
+            tier: Optional explicit model tier ("fast" or "large")
 
         Returns:
             Processed text or None if failed
@@ -85,8 +109,11 @@ class ProcessingService:
         # Use default provider if not specified
         provider = provider or self.default_provider
 
+        mode_config = self.modes.get(mode)
+        pipeline = mode_config if mode_config and mode_config.is_pipeline else None
+
         # If no prompt, return text as-is
-        if not prompt or not prompt.strip():
+        if not pipeline and (not prompt or not prompt.strip()):
             print("[AI Processing] No prompt provided, returning original text")
             return text
 
@@ -101,19 +128,160 @@ class ProcessingService:
             print(f"[AI Processing] Provider {provider} not configured")
             return None
 
+        model = None
+        timeout = self.timeouts.default_timeout
+        started = time.monotonic()
+        result = None
         try:
-            # Process with timeout
-            result = await asyncio.wait_for(
-                processor.process_text(text, prompt),
-                timeout=self.timeout
+            # Route short or latency-sensitive requests to the fast model
+            route = self.routing.decide(
+                text,
+                mode_routing=mode_config.extra.get("routing") if mode_config else None,
+                latency_budget_ms=latency_budget_ms,
+                tier=tier
             )
+            if route.tier == TIER_FAST and processor.fast_model:
+                model = processor.fast_model
+            print(f"[AI Processing] Model tier: {route.tier} ({route.reason}) -> {model or 'default model'}")
+
+            if pipeline and pipeline.fuse:
+                print(f"[AI Processing] Running {len(pipeline.stages)} stages as one fused call")
+            elif pipeline:
+                handoff = "streamed" if processor.supports_streaming else "whole output"
+                print(f"[AI Processing] Running {len(pipeline.stages)}-stage pipeline ({handoff} hand-off)")
+            work = self._build_work(processor, text, prompt, pipeline, model)
+
+            # Timeout learned from this provider/model/mode's latency distribution
+            timeout = self.timeouts.timeout_for(provider, mode, model or processor_model(processor))
+
+            # Process with timeout
+            result = await asyncio.wait_for(work, timeout=timeout)
+            if result is not None:
+                self.timeouts.record(provider, mode, time.monotonic() - started,
+                                     model or processor_model(processor))
             return result
         except asyncio.TimeoutError:
-            print(f"[AI Processing] Processing timed out after {self.timeout} seconds")
+            print(f"[AI Processing] Processing timed out after {timeout:.1f} seconds")
+            self.timeouts.record_timeout(provider, mode, timeout, model or processor_model(processor))
             return None
         except Exception as e:
             print(f"[AI Processing] Error during processing: {str(e)}")
             return None
+        finally:
+            primary = self._request_metrics(provider, model or processor_model(processor), text, result, started)
+            self.stats.record_request(mode=mode, **primary)
+
+            # Mirror a sample of successful requests to the candidate provider/model
+            if result is not None and self.shadow.should_sample():
+                self.shadow.submit(self._run_shadow(text, prompt, pipeline, mode, timeout, primary))
+
+    def _build_work(self, processor: AIProcessor, text: str, prompt: str,
+                    pipeline: Optional[ModeConfig], model: Optional[str]):
+        """
+        Create the processing coroutine for a single prompt or a pipeline
+
+        The submission counts as one request for the shared retry budget,
+        however many provider calls a pipeline makes for it.
+        """
+        get_retry_budget().record_request()
+        if pipeline and pipeline.fuse:
+            return processor.process_text(text, fuse_prompts(pipeline.stages), model)
+        if pipeline:
+            return run_pipeline(processor, text, pipeline.stages, self.pipeline_chunk_chars, model)
+        return processor.process_text(text, prompt, model)
+
+    @staticmethod
+    def _request_metrics(provider: str, model: Optional[str], text: str, result: Optional[str],
+                         started: float) -> Dict[str, Any]:
+        """Latency, estimated tokens and output length of one request"""
+        return {
+            "provider": provider,
+            "model": model,
+            "latency": time.monotonic() - started,
+            "input_tokens": estimate_tokens(text),
+            "output_tokens": estimate_tokens(result) if result else 0,
+            "output_length": len(result) if result else 0,
+            "success": result is not None
+        }
+
+    async def _run_shadow(self, text: str, prompt: str, pipeline: Optional[ModeConfig], mode: Optional[str],
+                          timeout: float, primary: Dict[str, Any]):
+        """Run the candidate request and record it next to the primary's metrics"""
+        provider = self.shadow.provider or primary["provider"]
+        processor = self.get_processor(provider)
+        if not processor or not processor.is_configured():
+            print(f"[AI Shadow] Candidate provider {provider} unavailable")
+            return
+
+        model = self.shadow.model
+        started = time.monotonic()
+        result = None
+        try:
+            result = await asyncio.wait_for(
+                self._build_work(processor, text, prompt, pipeline, model),
+                timeout=timeout
+            )
+        except Exception as e:
+            print(f"[AI Shadow] Candidate {provider}/{model or 'default'} failed: {str(e) or type(e).__name__}")
+
+        candidate = self._request_metrics(provider, model or processor_model(processor), text, result, started)
+        self.stats.record_shadow(mode, primary, candidate)
+
+    def is_pipeline_mode(self, mode: Optional[str]) -> bool:
+        """
+        Check if a mode is a multi-stage pipeline
+
+        Pipeline modes carry no single prompt, so callers use this to decide
+        whether a request without a prompt still needs AI processing.
+
+        Args:
+            mode: Mode id
+
+        Returns:
+            True if the mode declares more than one stage
+        """
+        mode_config = self.modes.get(mode)
+        return bool(mode_config and mode_config.is_pipeline)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Processing statistics for monitoring
+
+        Returns:
+            Dict with retry budget counters, learned timeouts and shadow
+            comparisons (candidate minus primary)
+        """
+        return {
+            "retry_budget": get_retry_budget().stats(),
+            "timeouts": self.timeouts.snapshot(),
+            "shadow": {
+                "enabled": self.shadow.enabled,
+                "dropped": self.shadow.dropped,
+                "summary": self.stats.shadow_summary()
+            }
+        }
+
+    def prewarm(self) -> Dict[str, bool]:
+        """
+        Create configured processors and resolve their API hosts ahead of the first request
+
+        Returns:
+            Dict of provider name -> whether it is configured
+        """
+        configured = {}
+        for provider in self.processors:
+            processor = self.get_processor(provider)
+            configured[provider] = bool(processor and processor.is_configured())
+            if not configured[provider]:
+                continue
+            host = urlparse(getattr(processor, "base_url", "") or "").hostname
+            if host:
+                try:
+                    # Prime the resolver cache (systemd-resolved / nscd) so the first request skips a cold lookup
+                    socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+                except OSError as e:
+                    print(f"[ProcessingService] Could not resolve {host}: {e}")
+        return configured
 
     def list_providers(self) -> list:
         """List available providers"""
@@ -1,24 +1,71 @@
+import json
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
+import aiohttp
+from .retry import get_retry_budget
 
 
 class AIProcessor(ABC):
     """Abstract base class for AI text processors"""
 
+    # Whether stream_text yields output as it is generated
+    supports_streaming = False
+
+    # Model used for the fast tier; None disables tiering for this processor
+    fast_model: Optional[str] = None
+
     @abstractmethod
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    async def process_text(self, text: str, prompt: str, model: Optional[str] = None) -> Optional[str]:
         """
         Process text using AI with given prompt
 
         Args:
             text: The input text to process
             prompt: The prompt to guide processing
+            model: Model override for this request (processor default if None)
 
         Returns:
             Processed text or None if processing fails
         """
         pass
 
+    async def stream_text(self, text: str, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Process text and yield the output incrementally
+
+        Processors without a streaming API (supports_streaming is False)
+        yield the complete result of process_text as a single chunk.
+
+        Args:
+            text: The input text to process
+            prompt: The prompt to guide processing
+            model: Model override for this request (processor default if None)
+
+        Yields:
+            Text fragments in output order
+        """
+        result = await self.process_text(text, prompt, model)
+        if result:
+            yield result
+
+    async def _wait_before_retry(self, attempt: int) -> bool:
+        """
+        Consult the shared retry budget and back off before a retry
+
+        Args:
+            attempt: Zero-based attempt that just failed
+
+        Returns:
+            True if the caller may retry, False if the budget is exhausted
+        """
+        budget = get_retry_budget()
+        if not budget.try_acquire():
+            print(f"[AI Retry] Retry budget exhausted, not retrying {type(self).__name__}")
+            return False
+        await asyncio.sleep(budget.backoff_delay(attempt))
+        return True
+
     @abstractmethod
     def is_configured(self) -> bool:
         """
@@ -27,4 +74,146 @@ class AIProcessor(ABC):
         Returns:
             True if processor has valid configuration
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class StreamingProcessor(AIProcessor):
+    """
+    Base class for processors with a server-sent event streaming API
+
+    Subclasses supply the endpoint, headers, payload and the function that
+    extracts a text delta from a stream event; the SSE loop and the
+    fallback to a regular request live here.
+    """
+
+    supports_streaming = True
+
+    # Name used in log messages
+    log_name = "AI"
+
+    # Request timeout in seconds
+    timeout = 30
+
+    async def stream_text(self, text: str, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Process text using the streaming API
+
+        Falls back to a regular (retried) request when the stream cannot
+        be opened, so callers always get the complete output.
+
+        Args:
+            text: Input text to process
+            prompt: Processing prompt
+            model: Model override for this request (processor default if None)
+
+        Yields:
+            Text fragments as they are generated
+        """
+        if prompt and self.is_configured():
+            payload = dict(self._request_payload(text, prompt, model), stream=True)
+            streamed = False
+            try:
+                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+                    async with session.post(self._stream_endpoint(), json=payload,
+                                            headers=self._request_headers()) as response:
+                        if response.status == 200:
+                            async for event in iter_sse_events(response):
+                                fragment = self._stream_delta(event)
+                                if fragment:
+                                    streamed = True
+                                    yield fragment
+                            if streamed:
+                                return
+                        else:
+                            print(f"[{self.log_name} Error] Streaming HTTP {response.status}, falling back to regular request")
+            except asyncio.TimeoutError:
+                print(f"[{self.log_name} Error] Streaming request timed out")
+                if streamed:
+                    raise
+            except Exception as e:
+                if streamed:
+                    raise
+                print(f"[{self.log_name} Error] Streaming failed: {str(e)}, falling back to regular request")
+
+        result = await self.process_text(text, prompt, model)
+        if result:
+            yield result
+
+    @abstractmethod
+    def _stream_endpoint(self) -> str:
+        """URL of the streaming API"""
+        pass
+
+    @abstractmethod
+    def _request_headers(self) -> Dict[str, str]:
+        """HTTP headers for an API request"""
+        pass
+
+    @abstractmethod
+    def _request_payload(self, text: str, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Request body for the given input (stream_text adds "stream": true)"""
+        pass
+
+    @abstractmethod
+    def _stream_delta(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Text delta carried by one stream event
+
+        Args:
+            event: Parsed JSON of an SSE data line
+
+        Returns:
+            New output text, or None for events without text
+        """
+        pass
+
+
+async def iter_sse_events(response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the JSON events of a server-sent event stream
+
+    Args:
+        response: aiohttp response with a text/event-stream body
+
+    Yields:
+        Parsed "data:" payloads until the stream ends or sends [DONE]
+    """
+    async for raw_line in response.content:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            yield event
+
+
+def anthropic_stream_delta(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Text delta of an Anthropic messages stream event
+
+    Args:
+        event: Parsed stream event
+
+    Returns:
+        The text of a content_block_delta event, None for other events
+
+    Raises:
+        RuntimeError: If the event reports a stream error
+    """
+    event_type = event.get("type")
+    if event_type == "content_block_delta":
+        delta = event.get("delta", {})
+        if delta.get("type") == "text_delta":
+            return delta.get("text")
+    elif event_type == "error":
+        message = event.get("error", {}).get("message", "Unknown error")
+        raise RuntimeError(f"Stream error: {message}")
+    return None
@@ -0,0 +1,132 @@
+"""Process-wide retry budget with full-jitter backoff"""
+
+import os
+import time
+import random
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, Callable
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent requests across all processors
+
+    Without a shared budget every request retries independently, so a
+    provider brown-out multiplies traffic exactly when it hurts most. The
+    budget allows retries only while retries in the sliding window stay
+    below ratio x requests (plus a small floor for low-traffic periods).
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 3, window: float = 60.0,
+                 base_delay: float = 0.5, max_delay: float = 8.0,
+                 on_retry: Optional[Callable[[], None]] = None,
+                 on_exhausted: Optional[Callable[[], None]] = None):
+        """
+        Initialize retry budget
+
+        Args:
+            ratio: Allowed retries per request within the window
+            min_retries: Retries always allowed per window
+            window: Sliding window length in seconds
+            base_delay: Backoff base in seconds
+            max_delay: Backoff cap in seconds
+            on_retry: Called after a retry is granted (e.g. a metrics counter)
+            on_exhausted: Called after a retry is refused
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_retry = on_retry
+        self.on_exhausted = on_exhausted
+
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_retries = 0
+        self.total_exhausted = 0
+
+    def _prune(self, now: float):
+        cutoff = now - self.window
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self):
+        """Count a first attempt"""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            self._requests.append(now)
+            self.total_requests += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Ask permission for one retry
+
+        Returns:
+            True if the retry fits in the budget (and is counted), False if
+            the budget is exhausted
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            allowed = max(self.min_retries, self.ratio * len(self._requests))
+            if len(self._retries) >= allowed:
+                self.total_exhausted += 1
+                granted = False
+            else:
+                self._retries.append(now)
+                self.total_retries += 1
+                granted = True
+        callback = self.on_retry if granted else self.on_exhausted
+        if callback is not None:
+            callback()
+        return granted
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Full-jitter backoff delay
+
+        Args:
+            attempt: Zero-based attempt that just failed
+
+        Returns:
+            Uniformly random delay in [0, min(max_delay, base_delay * 2^attempt)]
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                "requests_total": self.total_requests,
+                "retries_total": self.total_retries,
+                "exhausted_total": self.total_exhausted,
+                "window_requests": len(self._requests),
+                "window_retries": len(self._retries)
+            }
+
+
+_shared_budget: Optional[RetryBudget] = None
+_shared_lock = threading.Lock()
+
+
+def get_retry_budget() -> RetryBudget:
+    """Return the process-wide retry budget shared by all processors"""
+    global _shared_budget
+    with _shared_lock:
+        if _shared_budget is None:
+            _shared_budget = RetryBudget(
+                ratio=float(os.getenv("AI_RETRY_BUDGET_RATIO", "0.1")),
+                min_retries=int(os.getenv("AI_RETRY_BUDGET_MIN", "3")),
+                window=float(os.getenv("AI_RETRY_BUDGET_WINDOW", "60")),
+                base_delay=float(os.getenv("AI_RETRY_BASE_DELAY", "0.5")),
+                max_delay=float(os.getenv("AI_RETRY_MAX_DELAY", "8"))
+            )
+        return _shared_budget
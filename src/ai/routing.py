@@ -0,0 +1,109 @@
+"""Model tier routing by input size and latency budget"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+TIER_FAST = "fast"
+TIER_LARGE = "large"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate without a tokenizer
+
+    CJK characters are roughly one token each; other text averages about
+    four characters per token.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+    """
+    cjk = sum(1 for char in text if ord(char) >= 0x2E80)
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _int_setting(value: Any, default: int, name: str) -> int:
+    """
+    Coerce a configured integer, falling back to the default
+
+    Args:
+        value: Value from the environment or prompts.json
+        default: Value used when it is not an integer
+        name: Setting name for the warning
+
+    Returns:
+        The value as int, or default
+    """
+    try:
+        if isinstance(value, bool):
+            raise TypeError("boolean")
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        print(f"[AI Routing] Invalid {name} {value!r}, using {default}")
+        return default
+
+
+@dataclass
+class RouteDecision:
+    """Result of routing a single request"""
+    tier: str
+    estimated_tokens: int
+    reason: str
+
+
+class RoutingPolicy:
+    """Chooses between the fast and the large model for a request"""
+
+    def __init__(self):
+        """Initialize policy defaults from environment"""
+        self.enabled = os.getenv("AI_MODEL_TIERING", "true").lower() == "true"
+        self.fast_max_tokens = _int_setting(os.getenv("AI_FAST_MAX_TOKENS", "60"), 60, "AI_FAST_MAX_TOKENS")
+        self.fast_latency_budget_ms = _int_setting(os.getenv("AI_FAST_LATENCY_BUDGET_MS", "3000"), 3000,
+                                                   "AI_FAST_LATENCY_BUDGET_MS")
+
+    def decide(self, text: str, mode_routing: Optional[Dict[str, Any]] = None,
+               latency_budget_ms: Optional[float] = None, tier: Optional[str] = None) -> RouteDecision:
+        """
+        Pick a model tier
+
+        Args:
+            text: Input text
+            mode_routing: "routing" object of the mode in prompts.json, may
+                set "tier", "fast_max_tokens" or "fast_latency_budget_ms"
+            latency_budget_ms: Client supplied latency budget
+            tier: Client supplied tier ("fast" or "large")
+
+        Returns:
+            RouteDecision
+        """
+        if not isinstance(mode_routing, dict):
+            mode_routing = {}
+        tokens = estimate_tokens(text)
+
+        if not self.enabled:
+            return RouteDecision(TIER_LARGE, tokens, "tiering disabled")
+
+        if tier in (TIER_FAST, TIER_LARGE):
+            return RouteDecision(tier, tokens, "requested by client")
+
+        pinned = mode_routing.get("tier")
+        if pinned in (TIER_FAST, TIER_LARGE):
+            return RouteDecision(pinned, tokens, "pinned by mode")
+
+        budget_threshold = self.fast_latency_budget_ms
+        if "fast_latency_budget_ms" in mode_routing:
+            budget_threshold = _int_setting(mode_routing["fast_latency_budget_ms"], budget_threshold,
+                                            "fast_latency_budget_ms")
+        if latency_budget_ms is not None and float(latency_budget_ms) <= budget_threshold:
+            return RouteDecision(TIER_FAST, tokens, f"latency budget {latency_budget_ms}ms")
+
+        max_tokens = self.fast_max_tokens
+        if "fast_max_tokens" in mode_routing:
+            max_tokens = _int_setting(mode_routing["fast_max_tokens"], max_tokens, "fast_max_tokens")
+        if tokens <= max_tokens:
+            return RouteDecision(TIER_FAST, tokens, f"~{tokens} tokens <= {max_tokens}")
+
+        return RouteDecision(TIER_LARGE, tokens, f"~{tokens} tokens > {max_tokens}")
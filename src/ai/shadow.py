@@ -0,0 +1,74 @@
+"""Shadow traffic: mirror sampled live requests to a candidate provider/model"""
+
+import os
+import random
+import asyncio
+import threading
+from typing import Optional, Coroutine
+
+
+class ShadowRunner:
+    """
+    Runs candidate requests fire-and-forget on a private event loop
+
+    Live requests run on the scheduler's persistent AI loop, where the AI
+    stage's concurrency limit applies. Mirrored calls go to a separate
+    loop thread so they never take an AI-stage slot, delay the request
+    being answered, or alter the response injected for the user; their
+    own in-flight cap (AI_SHADOW_MAX_IN_FLIGHT) drops excess samples.
+    """
+
+    def __init__(self):
+        """Initialize shadow configuration from environment"""
+        self.provider = os.getenv("AI_SHADOW_PROVIDER") or None
+        self.model = os.getenv("AI_SHADOW_MODEL") or None
+        self.sample_percent = float(os.getenv("AI_SHADOW_SAMPLE_PERCENT", "0"))
+        self.max_in_flight = int(os.getenv("AI_SHADOW_MAX_IN_FLIGHT", "4"))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True when a candidate is configured and sampling is non-zero"""
+        return bool(self.provider or self.model) and self.sample_percent > 0
+
+    def should_sample(self) -> bool:
+        """Decide whether the current request is mirrored"""
+        return self.enabled and random.uniform(0, 100) < self.sample_percent
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ai-shadow", daemon=True).start()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> bool:
+        """
+        Schedule a shadow coroutine without waiting for it
+
+        Args:
+            coro: Coroutine performing and recording the candidate request
+
+        Returns:
+            True if scheduled, False if dropped because too many are in flight
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.dropped += 1
+                coro.close()
+                return False
+            self._in_flight += 1
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        future.add_done_callback(self._on_done)
+        return True
+
+    def _on_done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+        if not future.cancelled() and future.exception():
+            print(f"[AI Shadow] Candidate request failed: {future.exception()}")
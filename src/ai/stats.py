@@ -0,0 +1,100 @@
+"""In-memory statistics store for AI processing"""
+
+import time
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List
+
+
+class StatsStore:
+    """Keeps recent request records and running aggregates per key"""
+
+    def __init__(self, max_records: int = 500):
+        """
+        Initialize stats store
+
+        Args:
+            max_records: Number of recent records kept per category
+        """
+        self._lock = threading.Lock()
+        self._requests: deque = deque(maxlen=max_records)
+        self._shadow: deque = deque(maxlen=max_records)
+        self._shadow_summary: Dict[str, Dict[str, float]] = {}
+
+    def record_request(self, provider: str, model: Optional[str], mode: Optional[str], latency: float,
+                       input_tokens: int, output_tokens: int, output_length: int, success: bool):
+        """Record a live (primary) request"""
+        with self._lock:
+            self._requests.append({
+                "time": time.time(),
+                "provider": provider,
+                "model": model,
+                "mode": mode,
+                "latency": latency,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "output_length": output_length,
+                "success": success
+            })
+
+    def record_shadow(self, mode: Optional[str], primary: Dict[str, Any], candidate: Dict[str, Any]):
+        """
+        Record a shadow comparison
+
+        Args:
+            mode: Processing mode
+            primary: Metrics of the live request (provider, model, latency,
+                output_tokens, output_length)
+            candidate: Same metrics for the mirrored candidate request, with
+                success=False if it failed
+        """
+        key = f"{candidate.get('provider')}/{candidate.get('model') or 'default'}"
+        record = {
+            "time": time.time(),
+            "mode": mode,
+            "primary": primary,
+            "candidate": candidate,
+        }
+        if candidate.get("success"):
+            record["latency_delta"] = candidate["latency"] - primary["latency"]
+            record["output_tokens_delta"] = candidate["output_tokens"] - primary["output_tokens"]
+            record["output_length_delta"] = candidate["output_length"] - primary["output_length"]
+
+        with self._lock:
+            self._shadow.append(record)
+            summary = self._shadow_summary.setdefault(key, {
+                "samples": 0, "failures": 0,
+                "latency_delta_sum": 0.0, "output_tokens_delta_sum": 0.0, "output_length_delta_sum": 0.0
+            })
+            summary["samples"] += 1
+            if candidate.get("success"):
+                summary["latency_delta_sum"] += record["latency_delta"]
+                summary["output_tokens_delta_sum"] += record["output_tokens_delta"]
+                summary["output_length_delta_sum"] += record["output_length_delta"]
+            else:
+                summary["failures"] += 1
+
+    def recent_requests(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent live request records"""
+        with self._lock:
+            return list(self._requests)[-limit:]
+
+    def recent_shadow(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent shadow comparisons"""
+        with self._lock:
+            return list(self._shadow)[-limit:]
+
+    def shadow_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean deltas (candidate - primary) per candidate provider/model"""
+        with self._lock:
+            result = {}
+            for key, summary in self._shadow_summary.items():
+                succeeded = summary["samples"] - summary["failures"]
+                result[key] = {
+                    "samples": summary["samples"],
+                    "failures": summary["failures"],
+                    "mean_latency_delta": summary["latency_delta_sum"] / succeeded if succeeded else None,
+                    "mean_output_tokens_delta": summary["output_tokens_delta_sum"] / succeeded if succeeded else None,
+                    "mean_output_length_delta": summary["output_length_delta_sum"] / succeeded if succeeded else None,
+                }
+            return result
@@ -1,14 +1,16 @@
 import os
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Optional
 import aiohttp
 import json
-from .processor import AIProcessor
+from .processor import StreamingProcessor, anthropic_stream_delta
 
 
-class ZAIProcessor(AIProcessor):
+class ZAIProcessor(StreamingProcessor):
     """ZAI (智谱AI) processor implementation using Anthropic-compatible protocol"""
 
+    log_name = "ZAI"
+
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize ZAI processor
@@ -20,6 +22,8 @@ class ZAIProcessor(AIProcessor):
         """
         self.api_key = api_key or os.getenv("ZAI_API_KEY")
         self.model = model or os.getenv("ZAI_MODEL", "glm-4")
+        # Smaller, quicker model for short inputs (see ai/routing.py); only used when configured
+        self.fast_model = os.getenv("ZAI_FAST_MODEL") or None
         # Get base URL and ensure it ends with /v1/messages
         base = base_url or os.getenv("ZAI_API_BASE_URL", "https://open.bigmodel.cn/api/anthropic")
         # Auto-append /v1/messages if not already present
@@ -33,13 +37,14 @@ class ZAIProcessor(AIProcessor):
         """Check if processor has valid API key"""
         return bool(self.api_key)
 
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    async def process_text(self, text: str, prompt: str, model: Optional[str] = None) -> Optional[str]:
         """
         Process text using ZAI API with Anthropic-compatible protocol
 
         Args:
             text: Input text to process
             prompt: Processing prompt
+            model: Model override for this request (defaults to self.model)
 
         Returns:
             Processed text or None if failed
@@ -52,29 +57,10 @@ class ZAIProcessor(AIProcessor):
             return text
 
         try:
-            # Prepare the full message
-            user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
-
-            # Prepare request payload using Anthropic-compatible format
-            payload = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                "temperature": 0.7
-            }
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01"
-            }
-
-            # Make async request with retries
+            payload = self._request_payload(text, prompt, model)
+            headers = self._request_headers()
+
+            # Make async request with retries (limited by the shared retry budget)
             max_retries = 2
             for attempt in range(max_retries + 1):
                 # Debug: log request info (only first attempt to avoid spam)
@@ -83,7 +69,7 @@ class ZAIProcessor(AIProcessor):
                     if debug_request:
                         print(f"\n[ZAI Debug] ===== REQUEST DEBUG =====")
                         print(f"URL: {self.base_url}")
-                        print(f"Model: {self.model}")
+                        print(f"Model: {payload['model']}")
                         print(f"Headers: {{'Authorization': 'Bearer ***', 'Content-Type': 'application/json'}}")
                         print(f"Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
                         print("=" * 40)
@@ -138,8 +124,7 @@ class ZAIProcessor(AIProcessor):
                                 return None
                             elif response.status == 429:
                                 # Rate limited, wait and retry
-                                if attempt < max_retries:
-                                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                                if attempt < max_retries and await self._wait_before_retry(attempt):
                                     continue
                                 print("[ZAI Error] Rate limit exceeded")
                                 return None
@@ -169,15 +154,13 @@ class ZAIProcessor(AIProcessor):
                                 except:
                                     print(error_text)
                                 print("=" * 50)
-                                if attempt < max_retries:
-                                    await asyncio.sleep(1)
+                                if attempt < max_retries and await self._wait_before_retry(attempt):
                                     continue
                                 return None
 
                 except asyncio.TimeoutError:
-                    if attempt < max_retries:
+                    if attempt < max_retries and await self._wait_before_retry(attempt):
                         print(f"[ZAI Error] Request timed out, retrying... (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(1)
                         continue
                     print("[ZAI Error] Request timed out after retries")
                     return None
@@ -192,6 +175,36 @@ class ZAIProcessor(AIProcessor):
             traceback.print_exc()
             return None
 
+    def _stream_endpoint(self) -> str:
+        return self.base_url
+
+    def _request_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+
+    def _request_payload(self, text: str, prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
+        return {
+            "model": model or self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ],
+            "temperature": 0.7
+        }
+
+    def _stream_delta(self, event: Dict[str, Any]) -> Optional[str]:
+        # Some deployments send OpenAI-style chunks on the Anthropic-compatible endpoint
+        if event.get("choices"):
+            return event["choices"][0].get("delta", {}).get("content")
+        return anthropic_stream_delta(event)
+
     async def __aenter__(self):
         return self
 
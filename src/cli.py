@@ -0,0 +1,189 @@
+"""
+AIPut command line entry point.
+
+    python src/cli.py          start the desktop GUI (same as `cli.py gui`)
+    python src/cli.py serve    start the HTTP server without any GUI
+    python src/cli.py core     serving core controlled by the GUI process (internal)
+
+`serve` prints the phone URL and an ASCII QR code to the terminal and
+never imports tkinter, PIL or the GUI module, so it runs on headless
+machines and under systemd without a display for the server itself.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from typing import List, Optional
+
+# 将 src 目录添加到模块搜索路径（从其他目录以脚本路径启动时需要）
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+DEFAULT_PORT = 37856
+
+
+def print_qr(url: str, out=None) -> bool:
+    """Print `url` as an ASCII QR code.
+
+    Returns:
+        False if the qrcode package is not installed.
+    """
+    out = out or sys.stdout
+    try:
+        # 只用到 qrcode 的文本输出，不会导入 PIL
+        from qrcode.main import QRCode
+    except ImportError:
+        return False
+    qr = QRCode(border=1)
+    qr.add_data(url)
+    qr.make(fit=True)
+    qr.print_ascii(out=out, invert=True)
+    return True
+
+
+def serve(host: str, port: int, qr_ip: Optional[str] = None, show_qr: bool = True,
+          idle_timeout: float = 0) -> int:
+    """Run the HTTP server in the foreground until SIGINT/SIGTERM or idle timeout.
+
+    Under systemd socket activation the inherited listening socket is used
+    and host/port are ignored.
+
+    Args:
+        host: Listen address.
+        port: Listen port.
+        qr_ip: Address encoded in the QR code (default: the primary LAN address).
+        show_qr: Print the ASCII QR code.
+        idle_timeout: Exit after this many seconds without requests (0 = never).
+
+    Returns:
+        Process exit code.
+    """
+    from server.bootstrap import prepare_display_environment
+    prepare_display_environment()
+
+    from server.service import CoreService
+    from server.network import get_host_ip, get_qr_ips, order_ips
+    from server.activation import listen_fds, socket_address, wait_until_idle
+
+    # systemd 套接字激活：端口已由 systemd 绑定，首个连接已在队列中等待
+    sockets = listen_fds()
+    sock = sockets[0] if sockets else None
+    if sock is not None:
+        host, port = socket_address(sock)
+        print(f"✓ 使用 systemd 传入的监听套接字 ({host}:{port})")
+
+    core = CoreService()
+    try:
+        core.start_http(host, port, sock=sock)
+    except OSError as e:
+        print(f"✗ 服务启动失败: {e}")
+        core.shutdown()
+        return 1
+
+    print(f"\n✓ 服务已启动在 http://{host}:{port}")
+    if host in ('0.0.0.0', '', '::'):
+        urls = [f"http://{ip}:{port}" for ip in get_qr_ips()]
+        print("  可用地址: " + ", ".join(urls))
+    url = f"http://{qr_ip or (get_host_ip() if host in ('0.0.0.0', '', '::') else host)}:{port}"
+    print(f"\n手机访问: {url}")
+    if show_qr and not print_qr(url):
+        print("（未安装 qrcode，跳过二维码显示）")
+    sys.stdout.flush()
+
+    # 监听所有网卡时，网络地址变化后打印新的访问地址
+    address_watcher = None
+    if host in ('0.0.0.0', '', '::') and not qr_ip:
+        from server.netwatch import AddressWatcher
+
+        def on_addresses_changed(events, addresses):
+            for event in events:
+                action = "新增" if event.added else "移除"
+                print(f"\n网络地址{action}: {event.address} {event.interface}".rstrip())
+            if events:
+                qr_ips = get_qr_ips(order_ips(addresses))
+                new_url = f"http://{qr_ips[0]}:{port}"
+                print("  可用地址: " + ", ".join(f"http://{ip}:{port}" for ip in qr_ips))
+                print(f"手机访问: {new_url}")
+                if show_qr:
+                    print_qr(new_url)
+                sys.stdout.flush()
+
+        address_watcher = AddressWatcher(on_addresses_changed).start()
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print("\n收到退出信号，正在退出...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    if idle_timeout:
+        print(f"空闲 {idle_timeout:g} 秒后自动退出")
+    # 定时唤醒，保证信号处理器能在主线程中及时运行
+    if wait_until_idle(core.http_server.activity, idle_timeout, stop,
+                       busy=lambda: core.type_handler.scheduler.busy):
+        print(f"\n已空闲 {idle_timeout:g} 秒，正在退出...")
+
+    if address_watcher:
+        address_watcher.stop()
+    # 优雅关闭 HTTP 服务（等待进行中的请求完成）
+    core.shutdown()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='aiput', description='通过手机端语音输入实现电脑端远程输入')
+    commands = parser.add_subparsers(dest='command')
+
+    commands.add_parser('gui', help='启动图形界面（默认）')
+
+    serve_parser = commands.add_parser('serve', help='无界面运行 HTTP 服务')
+    serve_parser.add_argument('--host', default=os.environ.get('AIPUT_HOST', '0.0.0.0'),
+                              help='监听地址 (默认: AIPUT_HOST 或 0.0.0.0)')
+    serve_parser.add_argument('--port', type=int, default=int(os.environ.get('AIPUT_PORT', DEFAULT_PORT)),
+                              help=f'监听端口 (默认: AIPUT_PORT 或 {DEFAULT_PORT})')
+    serve_parser.add_argument('--qr-ip', help='二维码中使用的地址 (默认: 本机主要 IP)')
+    serve_parser.add_argument('--no-qr', action='store_true', help='不打印二维码')
+    serve_parser.add_argument('--idle-timeout', type=float,
+                              help='无请求多少秒后自动退出，0 表示不退出 (默认: AIPUT_IDLE_TIMEOUT 或 0)')
+
+    # 由图形界面启动的服务进程（内部使用）
+    core_parser = commands.add_parser('core', help='图形界面使用的服务进程（内部）')
+    core_parser.add_argument('--control', required=True)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # 加载配置文件（命令行参数的默认值来自环境变量）
+    try:
+        from config import load_env
+        load_env()
+    except ImportError:
+        pass
+
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'serve':
+        idle_timeout = args.idle_timeout
+        if idle_timeout is None:
+            from server.activation import get_idle_timeout
+            idle_timeout = get_idle_timeout()
+        return serve(args.host, args.port, qr_ip=args.qr_ip, show_qr=not args.no_qr,
+                     idle_timeout=idle_timeout)
+
+    if args.command == 'core':
+        from server.control import CONTROL_KEY_ENV, run_core
+        authkey = bytes.fromhex(os.environ.pop(CONTROL_KEY_ENV))
+        return run_core(args.control, authkey)
+
+    from remote_server import main as gui_main
+    gui_main()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
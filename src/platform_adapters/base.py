@@ -247,7 +247,7 @@ class NotificationAdapter(ABC):
         pass
 
     @abstractmethod
-    def play_notification_sound(self, sound_type: str = SOUND_NOTIFICATION) -> bool:
+    async def play_notification_sound(self, sound_type: str = SOUND_NOTIFICATION) -> bool:
         """Play a system notification sound.
 
         Args:
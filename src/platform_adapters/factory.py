@@ -2,18 +2,18 @@
 Factory for creating platform-specific adapters.
 """
 
+import importlib
 import os
+import shutil
 import subprocess
-from typing import Dict, Type, Optional, Any
+from typing import Dict, Type, Optional, Any, Tuple
 from platform_detection.detector import PlatformDetector, PlatformInfo
 from platform_detection.capabilities import PlatformCapabilities
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
     ResourceAdapter, NotificationAdapter
 )
-from platform_adapters.linux.adapter import LinuxAdapter
-from platform_adapters.windows.adapter import WindowsAdapter
-from platform_adapters.macos.adapter import MacOSAdapter
+from platform_adapters.optional import pyautogui, pyperclip
 
 
 class GenericAdapter:
@@ -37,27 +37,18 @@ class GenericKeyboardAdapter(KeyboardAdapter):
 
     def __init__(self, platform_info: PlatformInfo):
         self.platform_info = platform_info
-        try:
-            import pyautogui
-            pyautogui.PAUSE = 0.1
-            pyautogui.FAILSAFE = False
-            self._pyautogui = pyautogui
-            self._available = True
-        except (ImportError, Exception) as e:
-            # 捕获 ImportError 和 X11 连接错误
-            self._pyautogui = None
-            self._available = False
 
     async def send_paste_command(self) -> bool:
         """Send paste command using generic method."""
-        if self._available and self._pyautogui:
+        gui = pyautogui.load()
+        if gui:
             try:
                 # Try both Shift+Insert and Ctrl+V
-                self._pyautogui.hotkey('shift', 'insert')
+                gui.hotkey('shift', 'insert')
                 return True
             except:
                 try:
-                    self._pyautogui.hotkey('ctrl', 'v')
+                    gui.hotkey('ctrl', 'v')
                     return True
                 except:
                     pass
@@ -65,11 +56,11 @@ class GenericKeyboardAdapter(KeyboardAdapter):
 
     def is_available(self) -> bool:
         """Check if keyboard simulation is available."""
-        return self._available
+        return pyautogui.installed
 
     def get_available_methods(self) -> list:
         """Get available methods."""
-        return ['pyautogui'] if self._available else []
+        return ['pyautogui'] if pyautogui.installed else []
 
 
 class GenericClipboardAdapter(ClipboardAdapter):
@@ -77,12 +68,6 @@ class GenericClipboardAdapter(ClipboardAdapter):
 
     def __init__(self, platform_info: PlatformInfo):
         self.platform_info = platform_info
-        self._pyperclip = None
-        try:
-            import pyperclip
-            self._pyperclip = pyperclip
-        except ImportError:
-            pass
 
     def setup(self) -> None:
         """Initialize clipboard support."""
@@ -90,9 +75,9 @@ class GenericClipboardAdapter(ClipboardAdapter):
 
     async def copy_text(self, text: str) -> bool:
         """Copy text to clipboard."""
-        if self._pyperclip:
+        if pyperclip.available:
             try:
-                self._pyperclip.copy(text)
+                pyperclip.load().copy(text)
                 return True
             except:
                 pass
@@ -100,11 +85,11 @@ class GenericClipboardAdapter(ClipboardAdapter):
 
     def is_available(self) -> bool:
         """Check if clipboard is available."""
-        return self._pyperclip is not None
+        return pyperclip.installed
 
     def get_preferred_tool(self) -> Optional[str]:
         """Get preferred tool."""
-        return 'pyperclip' if self._pyperclip else None
+        return 'pyperclip' if pyperclip.installed else None
 
 
 class GenericSystemTrayAdapter(SystemTrayAdapter):
@@ -202,7 +187,7 @@ class GenericNotificationAdapter(NotificationAdapter):
         """Check if notifications are supported."""
         return False
 
-    def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
+    async def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
         """Play a custom notification sound."""
         print(f"[DEBUG] Trying to play custom sound: {os.path.basename(self._custom_sound)}")
 
@@ -222,7 +207,8 @@ class GenericNotificationAdapter(NotificationAdapter):
         for player in players:
             try:
                 # Check if player is available
-                subprocess.run(['which', player], capture_output=True, check=True)
+                if not shutil.which(player):
+                    continue
                 print(f"[DEBUG] Playing custom sound with {player}...")
                 subprocess.Popen([player, self._custom_sound],
                                stdout=subprocess.DEVNULL,
@@ -242,14 +228,35 @@ class GenericNotificationAdapter(NotificationAdapter):
 class AdapterFactory:
     """Factory for creating platform-specific adapters."""
 
-    _adapter_map: Dict[str, Type] = {
-        'Linux': LinuxAdapter,
-        'Windows': WindowsAdapter,
-        'Darwin': MacOSAdapter,  # macOS reports as Darwin
+    # os_name -> (module, class); only the module of the platform in use is imported
+    _adapter_map: Dict[str, Tuple[str, str]] = {
+        'Linux': ('platform_adapters.linux.adapter', 'LinuxAdapter'),
+        'Windows': ('platform_adapters.windows.adapter', 'WindowsAdapter'),
+        'Darwin': ('platform_adapters.macos.adapter', 'MacOSAdapter'),  # macOS reports as Darwin
     }
 
     _instances: Dict[str, Any] = {}
 
+    @classmethod
+    def register_adapter(cls, os_name: str, module_name: str, class_name: str):
+        """Register the adapter class for a platform without importing it.
+
+        Args:
+            os_name: platform.system() value the adapter serves.
+            module_name: Module that defines the adapter.
+            class_name: Adapter class name in that module.
+        """
+        cls._adapter_map[os_name] = (module_name, class_name)
+
+    @classmethod
+    def get_adapter_class(cls, os_name: str) -> Type:
+        """Import and return the adapter class for a platform (GenericAdapter if unsupported)."""
+        entry = cls._adapter_map.get(os_name)
+        if entry is None:
+            return GenericAdapter
+        module_name, class_name = entry
+        return getattr(importlib.import_module(module_name), class_name)
+
     @classmethod
     def create_adapters(cls, platform_info: Optional[PlatformInfo] = None):
         """Create appropriate adapters for the current platform.
@@ -271,8 +278,8 @@ class AdapterFactory:
         if cache_key in cls._instances:
             return cls._instances[cache_key]
 
-        # Get adapter class for platform
-        adapter_class = cls._adapter_map.get(platform_info.os_name, GenericAdapter)
+        # Get adapter class for platform (imports only this platform's module)
+        adapter_class = cls.get_adapter_class(platform_info.os_name)
 
         # Create and cache instance
         adapter = adapter_class(platform_info)
@@ -5,36 +5,21 @@ Linux-specific platform adapter implementation.
 import asyncio
 import os
 import sys
+import shutil
 import subprocess
-import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception) as e:
-    # 捕获 ImportError 和 X11 连接错误
-    # 在某些环境下，pyautogui 导入时会尝试连接 X11 display
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
-try:
-    import pyperclip
-    PIPERCLIP_AVAILABLE = True
-except (ImportError, Exception):
-    PIPERCLIP_AVAILABLE = False
-    pyperclip = None
-
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
     ResourceAdapter, NotificationAdapter, MenuItem
 )
 from platform_detection.detector import PlatformInfo
+from platform_adapters.linux.commands import run_command
 from platform_adapters.linux.wayland import WaylandKeyboardAdapter
 from platform_adapters.linux.x11 import X11KeyboardAdapter
+# pyautogui 导入时可能会连接 X11 display，只在回退路径真正用到时才导入
+from platform_adapters.optional import pyautogui, pyperclip, pystray
 
 
 class LinuxKeyboardAdapter(KeyboardAdapter):
@@ -61,9 +46,9 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
             return await self._specific_adapter.send_paste_command()
 
         # Fallback to pyautogui if available
-        if PYAUTOGUI_AVAILABLE:
+        if pyautogui.available:
             try:
-                pyautogui.hotkey('shift', 'insert')
+                pyautogui.load().hotkey('shift', 'insert')
                 return True
             except Exception:
                 pass
@@ -76,9 +61,9 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
             return await self._specific_adapter.send_ctrl_enter()
 
         # Fallback to pyautogui if available
-        if PYAUTOGUI_AVAILABLE:
+        if pyautogui.available:
             try:
-                pyautogui.hotkey('ctrl', 'enter')
+                pyautogui.load().hotkey('ctrl', 'enter')
                 return True
             except Exception:
                 pass
@@ -89,7 +74,7 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
         """Check if keyboard simulation is available."""
         if self._specific_adapter:
             return self._specific_adapter.is_available()
-        return PYAUTOGUI_AVAILABLE
+        return pyautogui.installed
 
     def get_available_methods(self) -> List[str]:
         """Get list of available keyboard simulation methods."""
@@ -98,7 +83,7 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
         if self._specific_adapter:
             methods.extend(self._specific_adapter.get_available_methods())
 
-        if PYAUTOGUI_AVAILABLE:
+        if pyautogui.installed:
             methods.append('pyautogui')
 
         return methods
@@ -128,6 +113,7 @@ class LinuxClipboardAdapter(ClipboardAdapter):
         self._is_wayland = platform_info.display_protocol == 'Wayland'
         self._is_x11 = platform_info.display_protocol == 'X11'
         self._preferred_tool = None
+        self._copy_command = None
         self._available_tools = platform_info.additional_info.get('clipboard_tools', [])
 
     def setup(self) -> None:
@@ -147,31 +133,30 @@ class LinuxClipboardAdapter(ClipboardAdapter):
                     self._preferred_tool = tool
                     break
 
+        # Resolve the copy command once instead of searching PATH on every copy
+        copy_args = {
+            'wl-copy': [],
+            'xclip': ['-selection', 'clipboard'],
+            'xsel': ['--clipboard', '--input'],
+        }
+        if self._preferred_tool in copy_args:
+            executable = shutil.which(self._preferred_tool) or self._preferred_tool
+            self._copy_command = [executable] + copy_args[self._preferred_tool]
+
     async def copy_text(self, text: str) -> bool:
         """Copy text to clipboard."""
         # Try tool-specific method first
-        if self._preferred_tool:
+        if self._copy_command:
             try:
-                if self._preferred_tool == 'wl-copy':
-                    subprocess.run(['wl-copy'], input=text.encode(), check=True)
+                if await run_command(self._copy_command, input=text.encode(), timeout=5) == 0:
                     return True
-                elif self._preferred_tool == 'xclip':
-                    proc = subprocess.Popen(['xclip', '-selection', 'clipboard'],
-                                         stdin=subprocess.PIPE)
-                    proc.communicate(text.encode())
-                    return proc.returncode == 0
-                elif self._preferred_tool == 'xsel':
-                    proc = subprocess.Popen(['xsel', '--clipboard', '--input'],
-                                         stdin=subprocess.PIPE)
-                    proc.communicate(text.encode())
-                    return proc.returncode == 0
             except Exception:
                 pass
 
         # Fallback to pyperclip
-        if PIPERCLIP_AVAILABLE:
+        if pyperclip.available:
             try:
-                pyperclip.copy(text)
+                pyperclip.load().copy(text)
                 # Give it a moment to take effect
                 await asyncio.sleep(0.1)
                 return True
@@ -182,11 +167,11 @@ class LinuxClipboardAdapter(ClipboardAdapter):
 
     def is_available(self) -> bool:
         """Check if clipboard operations are available."""
-        return bool(self._available_tools) or PIPERCLIP_AVAILABLE
+        return bool(self._available_tools) or pyperclip.installed
 
     def get_preferred_tool(self) -> Optional[str]:
         """Get the preferred clipboard tool being used."""
-        return self._preferred_tool or ('pyperclip' if PIPERCLIP_AVAILABLE else None)
+        return self._preferred_tool or ('pyperclip' if pyperclip.installed else None)
 
 
 class LinuxSystemTrayAdapter(SystemTrayAdapter):
@@ -195,15 +180,11 @@ class LinuxSystemTrayAdapter(SystemTrayAdapter):
     def __init__(self, platform_info: PlatformInfo):
         self.platform_info = platform_info
         self.tray_icon = None
-        self.pystray = None
 
-        # Try to import pystray
-        try:
-            import pystray
-            self.pystray = pystray
-        except (ImportError, Exception):
-            # pystray 在导入时会尝试连接 X11，可能失败
-            pass
+    @property
+    def pystray(self):
+        # pystray 在导入时会尝试连接 X11，可能失败；首次使用时才导入
+        return pystray.load()
 
     def create_tray_icon(self, menu_items: List[MenuItem]) -> bool:
         """Create system tray icon."""
@@ -359,6 +340,8 @@ class LinuxNotificationAdapter(NotificationAdapter):
         self._aplay_available = self._check_command('aplay')
         self._canberra_available = self._check_command('canberra-gtk-play')
         self._speaker_test_available = self._check_command('speaker-test')
+        # Players still running in the background
+        self._players = set()
 
         # Use custom sound file
         self._custom_sound = '/home/newbe36524/repos/newbe36524/qaa-airtype/src/assets/029_Decline_09.wav'
@@ -379,7 +362,35 @@ class LinuxNotificationAdapter(NotificationAdapter):
         """Check if notifications are supported."""
         return True  # Linux supports sound notifications
 
-    def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
+    async def _start_player(self, player: str) -> bool:
+        """Start a sound player without blocking the injection loop.
+
+        Returns:
+            True if the player is still running after a moment (it keeps
+            playing in the background), False if it exited early.
+        """
+        proc = await asyncio.create_subprocess_exec(player, self._custom_sound,
+                                                    stdout=subprocess.DEVNULL,
+                                                    stderr=subprocess.PIPE)
+        try:
+            # Give it a moment to start
+            _, stderr = await asyncio.wait_for(asyncio.shield(self._reap(proc)), 0.1)
+        except asyncio.TimeoutError:
+            return True
+        if stderr:
+            print(f"[DEBUG] ✗ {player} error: {stderr.decode()}")
+        return False
+
+    async def _reap(self, proc):
+        """Wait for a player to exit; kept referenced until then."""
+        task = asyncio.current_task()
+        self._players.add(task)
+        try:
+            return await proc.communicate()
+        finally:
+            self._players.discard(task)
+
+    async def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
         """Play a custom notification sound."""
         print(f"[DEBUG] Audio tools - aplay: {self._aplay_available}, paplay: {self._paplay_available}")
         print(f"[DEBUG] Trying to play custom sound: {os.path.basename(self._custom_sound)}")
@@ -395,44 +406,17 @@ class LinuxNotificationAdapter(NotificationAdapter):
                 return False
 
         # Try to play the custom sound file with available players
-        # Priority 1: Use aplay (ALSA)
-        if self._aplay_available:
-            try:
-                print(f"[DEBUG] Playing custom sound with aplay...")
-                proc = subprocess.Popen(['aplay', self._custom_sound],
-                                       stdout=subprocess.DEVNULL,
-                                       stderr=subprocess.PIPE)
-                # Give it a moment to start
-                import time
-                time.sleep(0.1)
-                if proc.poll() is None:
-                    print("[DEBUG] ✓ aplay started successfully")
-                    # Let it run in background
-                    return True
-                else:
-                    _, stderr = proc.communicate()
-                    if stderr:
-                        print(f"[DEBUG] ✗ aplay error: {stderr.decode()}")
-            except Exception as e:
-                print(f"[DEBUG] aplay exception: {e}")
-
-        # Priority 2: Use paplay (PulseAudio)
-        if self._paplay_available:
+        # Priority 1: Use aplay (ALSA), priority 2: paplay (PulseAudio)
+        for player, available in (('aplay', self._aplay_available), ('paplay', self._paplay_available)):
+            if not available:
+                continue
             try:
-                print(f"[DEBUG] Playing custom sound with paplay...")
-                proc = subprocess.Popen(['paplay', self._custom_sound],
-                                       stdout=subprocess.DEVNULL,
-                                       stderr=subprocess.PIPE)
-                time.sleep(0.1)
-                if proc.poll() is None:
-                    print("[DEBUG] ✓ paplay started successfully")
+                print(f"[DEBUG] Playing custom sound with {player}...")
+                if await self._start_player(player):
+                    print(f"[DEBUG] ✓ {player} started successfully")
                     return True
-                else:
-                    _, stderr = proc.communicate()
-                    if stderr:
-                        print(f"[DEBUG] ✗ paplay error: {stderr.decode()}")
             except Exception as e:
-                print(f"[DEBUG] paplay exception: {e}")
+                print(f"[DEBUG] {player} exception: {e}")
 
         # Fallback to terminal bell
         print("[DEBUG] Using terminal bell fallback")
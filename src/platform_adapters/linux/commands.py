@@ -0,0 +1,38 @@
+"""
+Non-blocking execution of the command line tools behind the Linux adapters.
+
+Clipboard and keyboard tools (wl-copy, xclip, xdotool, wtype, ...) are
+short-lived processes. They are started with asyncio subprocesses so
+waiting for them never blocks the shared injection loop, which also
+runs keep-alive and every other adapter call.
+"""
+
+import asyncio
+import subprocess
+from typing import List, Optional
+
+
+async def run_command(args: List[str], input: Optional[bytes] = None, timeout: float = 1) -> int:
+    """Run a tool to completion without blocking the event loop.
+
+    Args:
+        args: Command line (executable first).
+        input: Bytes written to the tool's stdin (stdin is not piped if None).
+        timeout: Seconds to wait before the tool is killed.
+
+    Returns:
+        The tool's exit code.
+
+    Raises:
+        subprocess.TimeoutExpired: If the tool did not finish in time.
+        OSError: If the tool could not be started.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL)
+    try:
+        await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    return proc.returncode
@@ -4,10 +4,12 @@ Wayland-specific keyboard adapter implementation.
 
 import asyncio
 import os
+import shutil
 import subprocess
 from typing import List
 from platform_detection.detector import PlatformInfo
 from platform_adapters.base import KeyboardAdapter
+from platform_adapters.linux.commands import run_command
 
 
 class WaylandKeyboardAdapter(KeyboardAdapter):
@@ -17,6 +19,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         self.platform_info = platform_info
         self._is_kde = platform_info.desktop_environment == 'KDE'
         self._available_methods = []
+        self._tool_paths = {}
         self._detect_methods()
 
     def _detect_methods(self):
@@ -33,13 +36,19 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if self._is_kde and 'xdotool' in tools:
             self._available_methods.append('xdotool (KDE Wayland)')
 
+    def _tool(self, name: str) -> str:
+        """Absolute path of a tool, resolved once and reused for every keystroke."""
+        path = self._tool_paths.get(name)
+        if path is None:
+            path = self._tool_paths[name] = shutil.which(name) or name
+        return path
+
     async def send_paste_command(self) -> bool:
         """Send paste command using Wayland-compatible methods."""
         # Try xdotool first on KDE Wayland (最可靠的方法)
         if 'xdotool (KDE Wayland)' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'shift+Insert'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'shift+Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -49,8 +58,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
             try:
                 # wtype: -M shift -P Insert
                 # wtype 会自动处理按键释放，不需要额外的命令
-                subprocess.run(['wtype', '-M', 'shift', '-P', 'Insert'],
-                             check=False, timeout=1)
+                await run_command([self._tool('wtype'), '-M', 'shift', '-P', 'Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -59,8 +67,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'ydotool' in self._available_methods:
             try:
                 # ydotool key codes: 42=Shift, 118=Insert
-                subprocess.run(['ydotool', 'key', '42:1', '118:1', '118:0', '42:0'],
-                             check=False, timeout=1)
+                await run_command([self._tool('ydotool'), 'key', '42:1', '118:1', '118:0', '42:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -72,8 +79,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         # Try xdotool first on KDE Wayland (最可靠的方法)
         if 'xdotool (KDE Wayland)' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'Ctrl+Return'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Ctrl+Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -82,8 +88,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'wtype' in self._available_methods:
             try:
                 # wtype: -M ctrl -P Return
-                subprocess.run(['wtype', '-M', 'ctrl', '-P', 'Return'],
-                             check=False, timeout=1)
+                await run_command([self._tool('wtype'), '-M', 'ctrl', '-P', 'Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -92,8 +97,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'ydotool' in self._available_methods:
             try:
                 # ydotool key codes: 29=Ctrl, 28=Return
-                subprocess.run(['ydotool', 'key', '29:1', '28:1', '28:0', '29:0'],
-                             check=False, timeout=1)
+                await run_command([self._tool('ydotool'), 'key', '29:1', '28:1', '28:0', '29:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -113,8 +117,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'wtype' in self._available_methods:
             try:
                 # wtype can type text directly
-                subprocess.run(['wtype', text],
-                             check=False, timeout=5)
+                await run_command([self._tool('wtype'), text], timeout=5)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -129,11 +132,9 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         # Try xdotool on KDE Wayland (via Xwayland)
         if 'xdotool (KDE Wayland)' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -142,11 +143,9 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'wtype' in self._available_methods:
             try:
                 # wtype -P Scroll_Lock (press and release)
-                subprocess.run(['wtype', '-P', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('wtype'), '-P', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['wtype', '-P', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('wtype'), '-P', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -155,11 +154,9 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'ydotool' in self._available_methods:
             try:
                 # ydotool key code for Scroll Lock is 70
-                subprocess.run(['ydotool', 'key', '70:1', '70:0'],
-                             check=False, timeout=1)
+                await run_command([self._tool('ydotool'), 'key', '70:1', '70:0'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['ydotool', 'key', '70:1', '70:0'],
-                             check=False, timeout=1)
+                await run_command([self._tool('ydotool'), 'key', '70:1', '70:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
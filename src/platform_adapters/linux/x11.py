@@ -4,10 +4,12 @@ X11-specific keyboard adapter implementation.
 
 import asyncio
 import os
+import shutil
 import subprocess
 from typing import List
 from platform_detection.detector import PlatformInfo
 from platform_adapters.base import KeyboardAdapter
+from platform_adapters.linux.commands import run_command
 
 
 class X11KeyboardAdapter(KeyboardAdapter):
@@ -16,6 +18,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
     def __init__(self, platform_info: PlatformInfo):
         self.platform_info = platform_info
         self._available_methods = []
+        self._tool_paths = {}
         self._detect_methods()
 
     def _detect_methods(self):
@@ -31,13 +34,19 @@ class X11KeyboardAdapter(KeyboardAdapter):
         if 'xvkbd' in tools:
             self._available_methods.append('xvkbd')
 
+    def _tool(self, name: str) -> str:
+        """Absolute path of a tool, resolved once and reused for every keystroke."""
+        path = self._tool_paths.get(name)
+        if path is None:
+            path = self._tool_paths[name] = shutil.which(name) or name
+        return path
+
     async def send_paste_command(self) -> bool:
         """Send paste command using X11-compatible methods."""
         # Try xdotool first (most reliable)
         if 'xdotool' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'Shift+Insert'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Shift+Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -45,8 +54,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte (xautomation package)
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Shift_L Insert'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xte'), 'key Shift_L Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -54,8 +62,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', r'\[Shift]\[Insert]'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xvkbd'), '-text', r'\[Shift]\[Insert]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -67,8 +74,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xdotool first (most reliable)
         if 'xdotool' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'Ctrl+Return'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Ctrl+Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -76,8 +82,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte (xautomation package)
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Control_L Return'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xte'), 'key Control_L Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -85,8 +90,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', r'\[Control]\[Return]'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xvkbd'), '-text', r'\[Control]\[Return]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -107,8 +111,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         if 'xdotool' in self._available_methods:
             try:
                 # xdotool type --delay 50 "text"
-                subprocess.run(['xdotool', 'type', '--delay', '50', text],
-                             check=False, timeout=5)
+                await run_command([self._tool('xdotool'), 'type', '--delay', '50', text], timeout=5)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -117,8 +120,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         if 'xte' in self._available_methods:
             try:
                 # xte types with built-in delay
-                subprocess.run(['xte', f'type {text}'],
-                             check=False, timeout=5)
+                await run_command([self._tool('xte'), f'type {text}'], timeout=5)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -134,11 +136,9 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xdotool
         if 'xdotool' in self._available_methods:
             try:
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xdotool'), 'key', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -146,11 +146,9 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xte'), 'key Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xte', 'key Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xte'), 'key Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -158,11 +156,9 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', '\\[Scroll_Lock]'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xvkbd'), '-text', '\\[Scroll_Lock]'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xvkbd', '-text', '\\[Scroll_Lock]'],
-                             check=False, timeout=1)
+                await run_command([self._tool('xvkbd'), '-text', '\\[Scroll_Lock]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -93,38 +93,13 @@ kVK_ANSI_Comma = 0x2B
 kVK_ANSI_Period = 0x2F
 kVK_ANSI_Slash = 0x2C
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception):
-    # 捕获 ImportError 和其他异常（例如 X11 连接错误）
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
-try:
-    import pyperclip
-    PIPERCLIP_AVAILABLE = True
-except (ImportError, Exception):
-    PIPERCLIP_AVAILABLE = False
-    pyperclip = None
-
-try:
-    import pystray
-    from PIL import Image
-    PYSTRAY_AVAILABLE = True
-except (ImportError, Exception):
-    # pystray 在导入时会尝试连接 X11，在 Linux 上可能失败
-    PYSTRAY_AVAILABLE = False
-    pystray = None
-    Image = None
-
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
     ResourceAdapter, NotificationAdapter, MenuItem
 )
 from platform_detection.detector import PlatformInfo
+# pyautogui / pystray 导入较慢且可能连接显示服务，首次使用时才导入
+from platform_adapters.optional import pyautogui, pyperclip, pystray, pil_image
 
 
 class MacOSKeyboardAdapter(KeyboardAdapter):
@@ -150,14 +125,8 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
                 pass
 
         # Priority 2: pyautogui (跨平台，经过良好测试)
-        if PYAUTOGUI_AVAILABLE:
-            try:
-                # 快速测试确保它工作正常
-                pyautogui.PAUSE = 0.1
-                pyautogui.FAILSAFE = False
-                self._methods.append('pyautogui')
-            except Exception:
-                pass
+        if pyautogui.installed:
+            self._methods.append('pyautogui')
 
         # Priority 3: AppKit/NSEvent (原生 API)
         if capabilities.get('appkit_available'):
@@ -218,7 +187,7 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
         # 方法 2: pyautogui (优先级 2)
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.hotkey('command', 'v')
+                pyautogui.load().hotkey('command', 'v')
                 return True
             except Exception as e:
                 print(f"[DEBUG] pyautogui 粘贴失败: {e}")
@@ -296,7 +265,7 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
         # 方法 2: pyautogui
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.hotkey('ctrl', 'enter')
+                pyautogui.load().hotkey('ctrl', 'enter')
                 return True
             except Exception as e:
                 print(f"[DEBUG] pyautogui Ctrl+Enter 失败: {e}")
@@ -357,7 +326,7 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
         # 方法 2: pyautogui
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.typewrite(text, interval=0.01)
+                pyautogui.load().typewrite(text, interval=0.01)
                 return True
             except Exception as e:
                 print(f"[DEBUG] pyautogui send_text 失败: {e}")
@@ -426,9 +395,9 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
         # 方法 2: pyautogui 使用 F15
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.press('f15')
+                pyautogui.load().press('f15')
                 await asyncio.sleep(0.1)
-                pyautogui.press('f15')
+                pyautogui.load().press('f15')
                 return True
             except Exception as e:
                 print(f"[DEBUG] pyautogui keep-alive 失败: {e}")
@@ -478,9 +447,9 @@ class MacOSClipboardAdapter(ClipboardAdapter):
     async def copy_text(self, text: str) -> bool:
         """复制文本到剪贴板，带回退链和超时保护。"""
         # 方法 1: pyperclip
-        if PIPERCLIP_AVAILABLE:
+        if pyperclip.available:
             try:
-                pyperclip.copy(text)
+                pyperclip.load().copy(text)
                 await asyncio.sleep(0.1)
                 return True
             except Exception:
@@ -510,7 +479,7 @@ class MacOSClipboardAdapter(ClipboardAdapter):
 
     def get_preferred_tool(self) -> Optional[str]:
         """Get preferred tool."""
-        if PIPERCLIP_AVAILABLE:
+        if pyperclip.installed:
             return 'pyperclip'
         if self._has_pbcopy:
             return 'pbcopy'
@@ -531,20 +500,21 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
 
         try:
             # Create menu items
+            tray = pystray.load()
             pystray_items = []
             for item in menu_items:
                 pystray_items.append(
-                    pystray.MenuItem(item.label, item.action)
+                    tray.MenuItem(item.label, item.action)
                 )
 
             # Create icon
             image = self._create_icon_image()
 
             # Create menu
-            menu = pystray.Menu(*pystray_items)
+            menu = tray.Menu(*pystray_items)
 
             # Create tray icon
-            self.tray_icon = pystray.Icon(
+            self.tray_icon = tray.Icon(
                 "AIPut",
                 image,
                 "AIPut - Remote Input",
@@ -561,7 +531,7 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
 
     def is_supported(self) -> bool:
         """Check if system tray is supported."""
-        return PYSTRAY_AVAILABLE
+        return pystray.available
 
     def hide_window(self) -> None:
         """Hide the main window."""
@@ -579,6 +549,7 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
 
     def _create_icon_image(self):
         """Create macOS-style icon."""
+        Image = pil_image.load()
         if Image:
             # Create a macOS-style icon
             image = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
@@ -634,6 +605,7 @@ class MacOSResourceAdapter(ResourceAdapter):
 
     def load_image(self, path: str) -> Any:
         """Load an image file."""
+        Image = pil_image.load()
         if Image:
             try:
                 return Image.open(path)
@@ -669,7 +641,7 @@ class MacOSNotificationAdapter(NotificationAdapter):
         """Check if notifications are supported."""
         return True  # macOS 支持声音通知
 
-    def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
+    async def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
         """播放自定义通知声音，带回退链。"""
         # 检查声音文件是否存在
         if not os.path.exists(self._custom_sound):
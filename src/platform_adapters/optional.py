@@ -0,0 +1,74 @@
+"""
+Optional third-party dependencies imported on first use.
+
+pyautogui, pyperclip and pystray are slow to import and may probe the
+display while doing so. Adapters only need them as fallbacks, so they
+are resolved when a fallback actually runs instead of at module load.
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any, Callable, Optional
+
+
+class OptionalModule:
+    """A module that is imported the first time it is needed."""
+
+    def __init__(self, name: str, configure: Optional[Callable[[Any], None]] = None):
+        """Initialize optional module.
+
+        Args:
+            name: Importable module name.
+            configure: Called once with the module after a successful import.
+        """
+        self.name = name
+        self._configure = configure
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._module = None
+        self._installed: Optional[bool] = None
+
+    @property
+    def installed(self) -> bool:
+        """Whether the module can be found (cheap, does not import it)."""
+        if self._loaded:
+            return self._module is not None
+        if self._installed is None:
+            try:
+                self._installed = importlib.util.find_spec(self.name) is not None
+            except (ImportError, ValueError):
+                self._installed = False
+        return self._installed
+
+    def load(self):
+        """Import the module once; None if it is missing or fails to import."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        module = importlib.import_module(self.name)
+                        if self._configure:
+                            self._configure(module)
+                        self._module = module
+                    except Exception:
+                        # 捕获 ImportError 和导入时的 X11 连接错误
+                        self._module = None
+                    self._loaded = True
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        """Whether the module imports successfully (imports it)."""
+        return self.load() is not None
+
+
+def _configure_pyautogui(module):
+    module.PAUSE = 0.1
+    module.FAILSAFE = False
+
+
+pyautogui = OptionalModule('pyautogui', configure=_configure_pyautogui)
+pyperclip = OptionalModule('pyperclip')
+pystray = OptionalModule('pystray')
+pil_image = OptionalModule('PIL.Image')
@@ -10,38 +10,13 @@ import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception):
-    # 捕获 ImportError 和其他异常（例如 X11 连接错误）
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
-try:
-    import pyperclip
-    PIPERCLIP_AVAILABLE = True
-except (ImportError, Exception):
-    PIPERCLIP_AVAILABLE = False
-    pyperclip = None
-
-try:
-    import pystray
-    from PIL import Image
-    PYSTRAY_AVAILABLE = True
-except (ImportError, Exception):
-    # pystray 在导入时会尝试连接 X11，在 Linux 上可能失败
-    PYSTRAY_AVAILABLE = False
-    pystray = None
-    Image = None
-
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
     ResourceAdapter, NotificationAdapter, MenuItem
 )
 from platform_detection.detector import PlatformInfo
+# pyautogui / pystray 导入较慢且可能连接显示服务，首次使用时才导入
+from platform_adapters.optional import pyautogui, pyperclip, pystray, pil_image
 
 
 class WindowsKeyboardAdapter(KeyboardAdapter):
@@ -54,7 +29,7 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
 
     def _detect_methods(self):
         """Detect available keyboard input methods."""
-        if PYAUTOGUI_AVAILABLE:
+        if pyautogui.installed:
             self._methods.append('pyautogui')
 
         # Check for win32api
@@ -77,7 +52,7 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
         # Try pyautogui first
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.hotkey('shift', 'insert')
+                pyautogui.load().hotkey('shift', 'insert')
                 return True
             except Exception:
                 pass
@@ -108,7 +83,7 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
         # Try pyautogui first
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.hotkey('ctrl', 'enter')
+                pyautogui.load().hotkey('ctrl', 'enter')
                 return True
             except Exception:
                 pass
@@ -146,7 +121,7 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
         """Send text directly."""
         if 'pyautogui' in self._methods:
             try:
-                pyautogui.typewrite(text)
+                pyautogui.load().typewrite(text)
                 return True
             except Exception:
                 pass
@@ -181,9 +156,9 @@ class WindowsClipboardAdapter(ClipboardAdapter):
     async def copy_text(self, text: str) -> bool:
         """Copy text to clipboard."""
         # Try pyperclip first (cross-platform)
-        if PIPERCLIP_AVAILABLE:
+        if pyperclip.available:
             try:
-                pyperclip.copy(text)
+                pyperclip.load().copy(text)
                 await asyncio.sleep(0.1)
                 return True
             except Exception:
@@ -215,7 +190,7 @@ class WindowsClipboardAdapter(ClipboardAdapter):
 
     def get_preferred_tool(self) -> Optional[str]:
         """Get preferred tool."""
-        if PIPERCLIP_AVAILABLE:
+        if pyperclip.installed:
             return 'pyperclip'
         return 'win32api'
 
@@ -234,20 +209,21 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
 
         try:
             # Create menu items
+            tray = pystray.load()
             pystray_items = []
             for item in menu_items:
                 pystray_items.append(
-                    pystray.MenuItem(item.label, item.action)
+                    tray.MenuItem(item.label, item.action)
                 )
 
             # Create icon
             image = self._create_icon_image()
 
             # Create menu
-            menu = pystray.Menu(*pystray_items)
+            menu = tray.Menu(*pystray_items)
 
             # Create tray icon
-            self.tray_icon = pystray.Icon(
+            self.tray_icon = tray.Icon(
                 "AIPut",
                 image,
                 "AIPut - Remote Input",
@@ -264,7 +240,7 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
 
     def is_supported(self) -> bool:
         """Check if system tray is supported."""
-        return PYSTRAY_AVAILABLE
+        return pystray.available
 
     def hide_window(self) -> None:
         """Hide the main window."""
@@ -284,6 +260,7 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
 
     def _create_icon_image(self):
         """Create icon image."""
+        Image = pil_image.load()
         if Image:
             # Create a Windows-style icon
             image = Image.new('RGB', (64, 64), color='#007AFF')
@@ -335,6 +312,7 @@ class WindowsResourceAdapter(ResourceAdapter):
 
     def load_image(self, path: str) -> Any:
         """Load an image file."""
+        Image = pil_image.load()
         if Image:
             try:
                 return Image.open(path)
@@ -381,7 +359,7 @@ class WindowsNotificationAdapter(NotificationAdapter):
         """Check if notifications are supported."""
         return True  # Windows supports sound notifications
 
-    def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
+    async def play_notification_sound(self, sound_type: str = NotificationAdapter.SOUND_NOTIFICATION) -> bool:
         """Play a custom notification sound."""
         print(f"[DEBUG] Trying to play custom sound: {os.path.basename(self._custom_sound)}")
 
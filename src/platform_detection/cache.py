@@ -0,0 +1,92 @@
+"""
+On-disk cache of detected platform capabilities.
+
+Tool and module probing results only change when PATH, the Python
+environment, the session type or the desktop change, so they are stored
+under a key built from those values and reused on the next launch.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 缓存格式变化时递增，使旧文件失效
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> Optional[Path]:
+    """Cache file from AIPUT_CAPABILITY_CACHE (None when set to 'off')."""
+    configured = os.environ.get('AIPUT_CAPABILITY_CACHE', '')
+    if configured.lower() in ('off', '0', 'false', 'no'):
+        return None
+    if configured:
+        return Path(configured).expanduser()
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'aiput' / 'capabilities.json'
+
+
+def capability_cache_key(os_name: str, display_protocol: Optional[str],
+                         desktop_environment: Optional[str]) -> str:
+    """Key that changes whenever the probed environment may have changed."""
+    parts = [
+        str(CACHE_VERSION),
+        os_name,
+        display_protocol or '',
+        desktop_environment or '',
+        os.environ.get('XDG_SESSION_TYPE', ''),
+        os.environ.get('PATH', ''),
+        sys.executable,
+        sys.prefix,
+    ]
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+
+class CapabilityCache:
+    """Single-entry JSON cache; any read or write error is treated as a miss."""
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None):
+        """Initialize cache.
+
+        Args:
+            path: Cache file (default: default_cache_path()); None disables caching.
+            ttl: Seconds an entry stays valid (default: AIPUT_CAPABILITY_CACHE_TTL or 86400).
+        """
+        self.path = path
+        self.ttl = ttl if ttl is not None else float(os.environ.get('AIPUT_CAPABILITY_CACHE_TTL', '86400'))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached capabilities for `key`, or None."""
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('key') != key:
+            return None
+        if time.time() - entry.get('created', 0) > self.ttl:
+            return None
+        capabilities = entry.get('capabilities')
+        return capabilities if isinstance(capabilities, dict) else None
+
+    def put(self, key: str, capabilities: Dict[str, Any]):
+        """Store capabilities for `key` (atomic replace)."""
+        if self.path is None:
+            return
+        entry = {'key': key, 'created': time.time(), 'capabilities': capabilities}
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
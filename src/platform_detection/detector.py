@@ -4,8 +4,16 @@ Platform detection module for identifying OS, display environment, and desktop e
 
 import platform
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from platform_detection.cache import CapabilityCache, capability_cache_key, default_cache_path
+
+LINUX_CLIPBOARD_TOOLS = ['xclip', 'wl-copy', 'xsel', 'wl-paste']
+LINUX_KEYBOARD_TOOLS = ['wtype', 'ydotool', 'xdotool', 'xte', 'xvkbd']
+MACOS_CLI_TOOLS = ['osascript', 'afplay', 'pbcopy', 'pbpaste']
 
 
 @dataclass
@@ -27,8 +35,13 @@ class PlatformDetector:
     """Detects platform information from environment variables and system calls."""
 
     @staticmethod
-    def detect() -> PlatformInfo:
-        """Detect the current platform."""
+    def detect(use_cache: bool = True) -> PlatformInfo:
+        """Detect the current platform.
+
+        Args:
+            use_cache: Reuse tool/module probing results from the capability
+                cache file when PATH, session and desktop are unchanged.
+        """
         os_name = platform.system()
         os_version = platform.release()
 
@@ -40,14 +53,23 @@ class PlatformDetector:
 
         if os_name == 'Linux':
             display_protocol, desktop_env, is_wsl = PlatformDetector._detect_linux_env()
-            additional_info = PlatformDetector._detect_linux_capabilities()
+            probe = PlatformDetector._detect_linux_capabilities
         elif os_name == 'Windows':
             desktop_env = 'Windows'
-            additional_info = PlatformDetector._detect_windows_capabilities()
+            probe = PlatformDetector._detect_windows_capabilities
         elif os_name == 'Darwin':
             desktop_env = 'Aqua'
             display_protocol = 'Cocoa'
-            additional_info = PlatformDetector._detect_macos_capabilities()
+            probe = PlatformDetector._detect_macos_capabilities
+        else:
+            probe = None
+
+        if probe is not None:
+            additional_info = PlatformDetector._cached_capabilities(
+                os_name, display_protocol, desktop_env, probe, use_cache)
+            if os_name == 'Darwin':
+                # 权限可能随时变化，不缓存
+                additional_info['accessibility_enabled'] = PlatformDetector._check_accessibility()
 
         return PlatformInfo(
             os_name=os_name,
@@ -93,95 +115,88 @@ class PlatformDetector:
 
         return display_protocol, desktop_env, False
 
+    @staticmethod
+    def _cached_capabilities(os_name: str, display_protocol: Optional[str], desktop_env: Optional[str],
+                             probe, use_cache: bool) -> Dict[str, Any]:
+        """Run `probe` unless the capability cache holds a result for this environment."""
+        cache = CapabilityCache(default_cache_path() if use_cache else None)
+        key = capability_cache_key(os_name, display_protocol, desktop_env)
+        capabilities = cache.get(key)
+        if capabilities is None:
+            capabilities = probe()
+            cache.put(key, capabilities)
+        return capabilities
+
+    @staticmethod
+    def _probe(tools: List[str], modules: List[str]) -> Tuple[List[str], Dict[str, bool]]:
+        """Look up executables on PATH and installed modules concurrently.
+
+        Returns:
+            (tools found, in the given order; module name -> installed).
+        """
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tool_paths = pool.map(shutil.which, tools)
+            module_found = pool.map(PlatformDetector._check_python_module, modules)
+            found_tools = [tool for tool, path in zip(tools, tool_paths) if path]
+            return found_tools, dict(zip(modules, module_found))
+
     @staticmethod
     def _detect_linux_capabilities() -> Dict[str, Any]:
         """Detect Linux-specific capabilities."""
-        capabilities = {}
-
-        # Check for clipboard tools
-        clipboard_tools = []
-        for tool in ['xclip', 'wl-copy', 'xsel', 'wl-paste']:
-            try:
-                result = os.system(f'which {tool} > /dev/null 2>&1')
-                if result == 0:
-                    clipboard_tools.append(tool)
-            except:
-                pass
-        capabilities['clipboard_tools'] = clipboard_tools
-
-        # Check for keyboard simulation tools
-        keyboard_tools = []
-        for tool in ['wtype', 'ydotool', 'xdotool', 'xte', 'xvkbd']:
-            try:
-                result = os.system(f'which {tool} > /dev/null 2>&1')
-                if result == 0:
-                    keyboard_tools.append(tool)
-            except:
-                pass
-        capabilities['keyboard_tools'] = keyboard_tools
-
-        # Check for Python packages
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
-        capabilities['pynput_available'] = PlatformDetector._check_python_module('pynput')
+        tools, modules = PlatformDetector._probe(
+            LINUX_CLIPBOARD_TOOLS + LINUX_KEYBOARD_TOOLS, ['pyautogui', 'pystray', 'pynput'])
 
-        return capabilities
+        return {
+            'clipboard_tools': [tool for tool in tools if tool in LINUX_CLIPBOARD_TOOLS],
+            'keyboard_tools': [tool for tool in tools if tool in LINUX_KEYBOARD_TOOLS],
+            'pyautogui_available': modules['pyautogui'],
+            'pystray_available': modules['pystray'],
+            'pynput_available': modules['pynput'],
+        }
 
     @staticmethod
     def _detect_windows_capabilities() -> Dict[str, Any]:
         """Detect Windows-specific capabilities."""
-        capabilities = {}
+        _, modules = PlatformDetector._probe([], ['win32api', 'win32gui', 'pyautogui', 'pystray'])
 
-        # Check for Windows-specific features
-        capabilities['win32api_available'] = PlatformDetector._check_python_module('win32api')
-        capabilities['win32gui_available'] = PlatformDetector._check_python_module('win32gui')
-        capabilities['pywin32_available'] = PlatformDetector._check_python_module('win32gui') or \
-                                         PlatformDetector._check_python_module('win32api')
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
-
-        return capabilities
+        return {
+            'win32api_available': modules['win32api'],
+            'win32gui_available': modules['win32gui'],
+            'pywin32_available': modules['win32gui'] or modules['win32api'],
+            'pyautogui_available': modules['pyautogui'],
+            'pystray_available': modules['pystray'],
+        }
 
     @staticmethod
     def _detect_macos_capabilities() -> Dict[str, Any]:
-        """Detect macOS-specific capabilities."""
-        capabilities = {}
-
-        # Check for Python modules
-        capabilities['appkit_available'] = PlatformDetector._check_python_module('AppKit')
-        capabilities['quartz_available'] = PlatformDetector._check_python_module('Quartz')
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
-        capabilities['pynput_available'] = PlatformDetector._check_python_module('pynput')
-
-        # Check for CLI tools
-        cli_tools = []
-        for tool in ['osascript', 'afplay', 'pbcopy', 'pbpaste']:
-            try:
-                result = os.system(f'which {tool} > /dev/null 2>&1')
-                if result == 0:
-                    cli_tools.append(tool)
-            except:
-                pass
-        capabilities['cli_tools'] = cli_tools
-
-        # Check accessibility permissions
+        """Detect macOS-specific capabilities (except accessibility, see _check_accessibility)."""
+        tools, modules = PlatformDetector._probe(
+            MACOS_CLI_TOOLS, ['AppKit', 'Quartz', 'pyautogui', 'pystray', 'pynput'])
+
+        return {
+            'appkit_available': modules['AppKit'],
+            'quartz_available': modules['Quartz'],
+            'pyautogui_available': modules['pyautogui'],
+            'pystray_available': modules['pystray'],
+            'pynput_available': modules['pynput'],
+            'cli_tools': tools,
+        }
+
+    @staticmethod
+    def _check_accessibility() -> bool:
+        """Check macOS accessibility permissions."""
         try:
             from ApplicationServices import AXIsProcessTrusted
-            capabilities['accessibility_enabled'] = AXIsProcessTrusted()
+            return bool(AXIsProcessTrusted())
         except Exception as e:
             print(f"[DEBUG] 检查辅助功能权限失败: {e}")
-            capabilities['accessibility_enabled'] = False
-
-        return capabilities
+            return False
 
     @staticmethod
     def _check_python_module(module_name: str) -> bool:
-        """Check if a Python module is available."""
+        """Check if a Python module is installed (without importing it)."""
         try:
-            import importlib
-            importlib.import_module(module_name)
-            return True
-        except (ImportError, Exception):
-            # 捕获所有异常，包括模块导入时的 X11 连接错误
+            import importlib.util
+            return importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
             return False
\ No newline at end of file
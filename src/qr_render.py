@@ -0,0 +1,119 @@
+"""
+Background QR code rendering for the GUI.
+
+Building a QR code and resizing it with LANCZOS takes long enough to
+stall the Tk event loop when it happens on every keystroke in the port
+field. QRRenderer renders on a single worker thread, keeps the most
+recent images per (ip, port), and only ever renders the latest request:
+intermediate values typed while a render is running are skipped.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+# 二维码图片边长（像素）
+QR_SIZE = 250
+
+# Callback(ip, port, image, url); image and url are None if rendering failed
+RenderCallback = Callable[[str, int, Any, Optional[str]], None]
+
+
+def generate_qr_code(ip, port):
+    """生成二维码图片"""
+    try:
+        # 在渲染线程中首次使用时才导入
+        import qrcode
+        from PIL import Image
+
+        # 构建URL
+        url = f"http://{ip}:{port}"
+
+        # 创建二维码
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(url)
+        qr.make(fit=True)
+
+        # 生成图片
+        img = qr.make_image(fill_color="black", back_color="white")
+
+        # 调整大小（可选）
+        img = img.resize((QR_SIZE, QR_SIZE), Image.Resampling.LANCZOS)
+
+        return img, url
+    except Exception as e:
+        print(f"生成二维码失败: {e}")
+        return None, None
+
+
+class QRRenderer:
+    """Renders QR codes on a worker thread with a small (ip, port) memo."""
+
+    def __init__(self, render: Callable[[str, int], Tuple[Any, Optional[str]]] = generate_qr_code,
+                 max_entries: int = 16):
+        """Initialize renderer.
+
+        Args:
+            render: Function returning (image, url) for (ip, port).
+            max_entries: Rendered images kept.
+        """
+        self._render = render
+        self._max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[str, int], Tuple[Any, Optional[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._request: Optional[Tuple[str, int, RenderCallback]] = None
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.renders = 0
+
+    def request(self, ip: str, port: int, callback: RenderCallback):
+        """Ask for the QR code of (ip, port).
+
+        A cached image is passed to `callback` at once on the calling
+        thread; otherwise `callback` runs on the worker thread after
+        rendering. A newer request replaces one that has not started yet.
+        """
+        key = (ip, port)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            else:
+                self._request = (ip, port, callback)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='aiput-qr', daemon=True)
+                    self._thread.start()
+                self._wakeup.notify()
+        if cached is not None:
+            callback(ip, port, *cached)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._request is None and not self._stopped:
+                    self._wakeup.wait()
+                if self._stopped:
+                    return
+                ip, port, callback = self._request
+                self._request = None
+
+            image, url = self._render(ip, port)
+            with self._lock:
+                self.renders += 1
+                if image is not None:
+                    self._cache[(ip, port)] = (image, url)
+                    while len(self._cache) > self._max_entries:
+                        self._cache.popitem(last=False)
+            callback(ip, port, image, url)
+
+    def stop(self):
+        """Stop the worker thread."""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify()
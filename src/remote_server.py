@@ -6,24 +6,14 @@
 import os
 import sys
 
-# 设置 DISPLAY 环境变量（如果需要）
-if os.environ.get('WAYLAND_DISPLAY') and not os.environ.get('DISPLAY'):
-    # 在 Wayland 环境下尝试使用 Xwayland
-    os.environ['DISPLAY'] = ':0'
-
-# 修复 sudo 环境下的 X11 授权问题
-# 如果在 sudo 环境下运行，需要保留原用户的 XAUTHORITY
-if os.geteuid() == 0:  # 检测是否为 root 用户
-    # 尝试获取原始用户
-    sudo_user = os.environ.get('SUDO_USER')
-    if sudo_user and not os.environ.get('XAUTHORITY'):
-        # 设置 XAUTHORITY 指向原用户的授权文件
-        xauth_path = f'/home/{sudo_user}/.Xauthority'
-        if os.path.exists(xauth_path):
-            os.environ['XAUTHORITY'] = xauth_path
-
-# 修复 pyautogui 的导入问题
-# 在 Wayland 环境下不强制设置 DISPLAY，让适配器自行处理
+# 将 src 目录添加到模块搜索路径
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+# 设置 DISPLAY / XAUTHORITY（Wayland 下的 Xwayland、sudo 下的 X11 授权）
+from server.bootstrap import prepare_display_environment
+prepare_display_environment()
 
 # 加载配置文件（在导入其他模块之前）
 try:
@@ -32,427 +22,34 @@ try:
 except ImportError:
     pass
 
+# 打包后的程序以 `<程序> core --control ...` 重新启动自身作为服务进程（见 server/control.py），
+# 此时直接进入命令行入口，不加载图形界面
+if __name__ == '__main__' and sys.argv[1:2] == ['core']:
+    from cli import main as cli_main
+    sys.exit(cli_main())
+
 # 现在可以安全地导入其他模块
-import socket
-import threading
 import tkinter as tk
 from tkinter import messagebox, ttk
-from flask import Flask, request, send_from_directory
-import time
-import logging
-import qrcode
-from PIL import Image, ImageTk
-import asyncio
-from typing import Optional
-
-# 延迟导入平台相关模块
-def init_platform_adapters():
-    """延迟初始化平台适配器"""
-    try:
-        # 将 src 目录添加到模块搜索路径
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        if script_dir not in sys.path:
-            sys.path.insert(0, script_dir)
-        
-        # 导入平台检测和适配器
-        print("正在导入平台检测模块...")
-        from platform_detection.detector import PlatformDetector
-
-        print("正在导入适配器工厂...")
-        from platform_adapters.factory import AdapterFactory
-
-        # 检测平台
-        print("正在检测平台...")
-        platform_info = PlatformDetector.detect()
-        print(f"\n=== 平台信息 ===")
-        print(f"操作系统: {platform_info.os_name}")
-        print(f"显示环境: {platform_info.display_protocol or '未知'}")
-        print(f"桌面环境: {platform_info.desktop_environment or '未知'}")
-        print(f"===============")
-
-        # 检测到的工具
-        if platform_info.additional_info:
-            print("\n=== 可用工具 ===")
-            kb_tools = platform_info.additional_info.get('keyboard_tools', [])
-            cb_tools = platform_info.additional_info.get('clipboard_tools', [])
-            if kb_tools:
-                print(f"键盘模拟工具: {', '.join(kb_tools)}")
-            if cb_tools:
-                print(f"剪贴板工具: {', '.join(cb_tools)}")
-            print("===============")
-
-        # 创建适配器
-        print("\n正在创建平台适配器...")
-        adapters = AdapterFactory.create_adapters(platform_info)
-        print("✓ 平台适配器创建成功！")
-
-        return adapters, platform_info
-
-    except ImportError as e:
-        print(f"\n✗ 导入错误: {e}")
-        print("⚠ 将使用兼容模式...")
-        return None, None
-    except Exception as e:
-        print(f"\n✗ 平台适配器初始化失败: {e}")
-        print("⚠ 将使用兼容模式...")
-        return None, None
-
-# Flask 应用配置
-# 获取项目根目录
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir)
-app = Flask(__name__, static_folder=os.path.join(project_root, 'site'), static_url_path='/static')
-log = logging.getLogger('werkzeug')
-log.setLevel(logging.ERROR)
-
-# 全局变量
-platform_adapters = None
-platform_info = None
-processing_service = None
-keep_alive_thread = None
-
-# 在创建路由之前初始化平台适配器
-print("正在初始化平台适配器...")
-platform_adapters, platform_info = init_platform_adapters()
-
-# 初始化AI处理服务
-print("正在初始化AI处理服务...")
-try:
-    from ai.processing_service import ProcessingService
-    processing_service = ProcessingService()
-    print("  AI处理服务初始化成功")
-except Exception as e:
-    print(f"  AI处理服务初始化失败: {e}")
-    processing_service = None
-
-
-class KeepAliveThread(threading.Thread):
-    """Background thread that calls keep_alive() periodically."""
-
-    def __init__(self, keyboard_adapter, interval=300):
-        """Initialize keep-alive thread.
-
-        Args:
-            keyboard_adapter: Platform keyboard adapter for keep-alive.
-            interval: Trigger interval in seconds (default: 300 = 5 minutes).
-        """
-        super().__init__(daemon=True)
-        self._keyboard_adapter = keyboard_adapter
-        self._interval = interval
-        self._stop_event = threading.Event()
-        self._loop = None
-
-    def run(self):
-        """Run the keep-alive loop."""
-        import asyncio
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        try:
-            self._loop.run_until_complete(self._keep_alive_loop())
-        finally:
-            self._loop.close()
-
-    async def _keep_alive_loop(self):
-        """Keep-alive loop that triggers keep_alive() periodically."""
-        # Immediate trigger on startup
-        await self._trigger_keep_alive()
-
-        while not self._stop_event.is_set():
-            # Wait for interval or stop event
-            self._stop_event.wait(self._interval)
-            if self._stop_event.is_set():
-                break
-            await self._trigger_keep_alive()
-
-    async def _trigger_keep_alive(self):
-        """Trigger keep-alive action."""
-        try:
-            result = await self._keyboard_adapter.keep_alive()
-            if result:
-                logging.debug("Keep-alive triggered successfully")
-            else:
-                logging.debug("Keep-alive not supported or not needed on this platform")
-        except Exception as e:
-            logging.warning(f"Keep-alive trigger failed: {e}")
+from PIL import ImageTk
 
-    def stop(self):
-        """Stop the keep-alive thread gracefully."""
-        self._stop_event.set()
-        self.join(timeout=5)
+# HTTP 服务、AI 处理和文本注入运行在独立的服务进程中，界面通过控制通道与其通信
+from server.control import CoreProcess
+from server.netwatch import AddressWatcher
+from server.network import order_ips, get_qr_ips
+# 二维码在后台线程中生成，并按 (IP, 端口) 缓存
+from qr_render import QRRenderer
 
+# 输入端口/IP 时，停止输入多少毫秒后才更新二维码
+QR_DEBOUNCE_MS = 250
 
-def get_keep_alive_interval():
-    """Get keep-alive interval from environment variable.
-
-    Returns:
-        int: Interval in seconds (default: 300, minimum: 60).
-    """
-    try:
-        interval_str = os.environ.get('AIPUT_KEEP_ALIVE_INTERVAL', '300')
-        interval = int(interval_str)
-        # Minimum 1 minute to prevent too frequent triggers
-        return max(interval, 60)
-    except ValueError:
-        return 300
-
-@app.route('/')
-def index():
-    # Get the directory containing this script (src directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to project root, then to site directory
-    site_dir = os.path.join(script_dir, '..', 'site')
-    return send_from_directory(site_dir, 'index.html')
-
-@app.route('/type', methods=['POST'])
-async def type_text():
-    """处理文本输入请求，支持AI处理"""
-    global platform_adapters, processing_service
-
-    try:
-        # 获取客户端IP地址
-        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
-
-        # 记录接收到的请求
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        print(f"\n[{timestamp}] 收到来自 {client_ip} 的请求")
-
-        data = request.get_json()
-        text = data.get('text', '')
-        auto_submit = data.get('auto_submit', False)  # 获取自动提交参数
-
-        # AI处理相关参数
-        prompt = data.get('prompt', '')
-        mode = data.get('mode', '')
-        provider = data.get('provider', 'zai')
-
-        # 输出要发送的文本（只显示前50个字符）
-        display_text = text[:50] + "..." if len(text) > 50 else text
-        print(f"  要输入的文本: {display_text}")
-        print(f"  文本长度: {len(text)} 字符")
-        if auto_submit:
-            print("  勇敢模式: 开启 (将自动发送 Ctrl+Enter)")
-        if mode:
-            print(f"  AI处理模式: {mode}")
-
-        # AI处理逻辑
-        processed_text = text
-        if prompt and processing_service:
-            print(f"  正在使用AI处理文本...")
-            try:
-                result = await processing_service.process(
-                    text=text,
-                    prompt=prompt,
-                    provider=provider,
-                    mode=mode
-                )
-                if result is not None:
-                    processed_text = result
-                    # 显示处理后的文本（只显示前50个字符）
-                    display_processed = processed_text[:50] + "..." if len(processed_text) > 50 else processed_text
-                    print(f"  ✓ AI处理成功: {display_processed}")
-                else:
-                    print("  ⚠ AI处理失败，使用原始文本")
-            except Exception as e:
-                print(f"  ✗ AI处理出错: {e}")
-                print("  继续使用原始文本")
-
-        if processed_text and platform_adapters:
-            print("  正在执行剪贴板操作...")
-            # 使用平台适配器复制到剪贴板
-            success = await platform_adapters.clipboard.copy_text(processed_text)
-            if not success:
-                print("  ✗ 剪贴板操作失败")
-                error_msg = '剪贴板操作失败'
-                if prompt:
-                    error_msg += ' (AI处理已完成)'
-                return {'success': False, 'error': error_msg}
-
-            print("  ✓ 剪贴板操作成功")
-            print("  正在发送粘贴命令...")
-            # 等待剪贴板操作完成
-            await asyncio.sleep(0.1)
-
-            # 使用平台适配器发送粘贴命令
-            success = await platform_adapters.keyboard.send_paste_command()
-
-            if success:
-                print("  ✓ 键盘模拟成功")
-
-                # 播放提示音（如果启用）
-                try:
-                    # 检查是否禁用了声音提示
-                    from config import get_config
-                    sound_enabled = get_config('SOUND_NOTIFICATIONS', 'true').lower() == 'true'
-
-                    if sound_enabled:
-                        print("  声音提示已启用，正在播放...")
-                        if hasattr(platform_adapters, 'notifications') and platform_adapters.notifications:
-                            success = platform_adapters.notifications.play_notification_sound()
-                            if success:
-                                print("  ✓ 提示音播放成功")
-                            else:
-                                print("  ⚠ 提示音播放失败")
-                        else:
-                            print("  ⚠ 通知适配器未初始化")
-                    else:
-                        print("  声音提示已禁用")
-                except Exception as e:
-                    print(f"  ✗ 播放提示音异常: {e}")
-
-                # 如果开启勇敢模式，发送 Ctrl+Enter
-                if auto_submit:
-                    print("  正在发送 Ctrl+Enter...")
-                    # 等待粘贴完成
-                    await asyncio.sleep(0.1)
-                    # 发送 Ctrl+Enter
-                    ctrl_enter_success = await platform_adapters.keyboard.send_ctrl_enter()
-                    if ctrl_enter_success:
-                        print("  ✓ Ctrl+Enter 发送成功")
-                    else:
-                        print("  ⚠ Ctrl+Enter 发送失败，文本已粘贴")
-
-                response = {'success': True}
-                # 如果进行了AI处理，添加相关信息
-                if prompt and processed_text != text:
-                    response['ai_processed'] = True
-                    response['original_length'] = len(text)
-                    response['processed_length'] = len(processed_text)
-
-                return response
-            else:
-                # 如果键盘模拟失败，返回警告
-                print("  ⚠ 键盘模拟失败，需要手动粘贴")
-                response = {'success': True, 'warning': '已复制到剪贴板，请手动粘贴'}
-                if prompt:
-                    response['warning'] += ' (AI处理已完成)'
-                return response
-        else:
-            if not processed_text:
-                print("  ⚠ 警告: 接收到空文本")
-                return {'success': False, 'error': '接收到空文本'}
-            else:
-                print("  ✗ 错误: 平台适配器未初始化")
-                return {'success': False, 'error': '平台适配器未初始化'}
-
-    except Exception as e:
-        print(f"  ✗ 处理请求时发生错误: {e}")
-        import traceback
-        traceback.print_exc()
-        return {'success': False}
-
-def get_host_ip():
-    """获取主要的本机 IP 地址"""
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(('8.8.8.8', 80))
-        ip = s.getsockname()[0]
-    except Exception:
-        ip = '127.0.0.1'
-    finally:
-        s.close()
-    return ip
-
-def get_all_ips():
-    """获取所有可用的本机 IP 地址"""
-    ips = []
-    try:
-        hostname = socket.gethostname()
-        addrs = socket.getaddrinfo(hostname, None)
-        for addr in addrs:
-            ip = addr[4][0]
-            if ':' not in ip and ip != '127.0.0.1':
-                if ip not in ips:
-                    ips.append(ip)
-    except Exception:
-        pass
-
-    if not ips:
-        ips.append('127.0.0.1')
-
-    # 排序逻辑
-    priority_192 = []
-    priority_10 = []
-    other_ips = []
-    virtual_ips = []
-
-    for ip in ips:
-        if ip.startswith('192.168.'):
-            priority_192.append(ip)
-        elif ip.startswith('10.'):
-            priority_10.append(ip)
-        elif ip.startswith('172.'):
-            parts = ip.split('.')
-            if len(parts) >= 2:
-                second = int(parts[1])
-                if 16 <= second <= 31:
-                    virtual_ips.append(ip)
-                else:
-                    other_ips.append(ip)
-        elif ip.startswith('198.18.'):
-            virtual_ips.append(ip)
-        else:
-            other_ips.append(ip)
-
-    ips = priority_192 + priority_10 + other_ips + virtual_ips
-
-    main_ip = get_host_ip()
-    if main_ip in ips:
-        ips.remove(main_ip)
-        if main_ip.startswith('192.168.'):
-            insert_pos = 0
-        elif main_ip.startswith('10.'):
-            insert_pos = len(priority_192)
-        else:
-            insert_pos = len(priority_192) + len(priority_10)
-        ips.insert(insert_pos, main_ip)
-
-    ips.insert(0, '0.0.0.0 (所有网卡)')
-    return ips
-
-def get_qr_ips():
-    """获取用于二维码的 IP 地址（排除 0.0.0.0）"""
-    all_ips = get_all_ips()
-    # 移除 0.0.0.0 选项
-    qr_ips = [ip for ip in all_ips if not ip.startswith('0.0.0.0')]
-    return qr_ips
-
-def generate_qr_code(ip, port):
-    """生成二维码图片"""
-    try:
-        # 构建URL
-        url = f"http://{ip}:{port}"
-
-        # 创建二维码
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(url)
-        qr.make(fit=True)
-
-        # 生成图片
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # 调整大小（可选）
-        img = img.resize((250, 250), Image.Resampling.LANCZOS)
-
-        return img, url
-    except Exception as e:
-        print(f"生成二维码失败: {e}")
-        return None, None
 
 # GUI 主程序
 class ServerApp:
-    def __init__(self, root):
+    def __init__(self, root, core):
         self.root = root
-
-        # 确保平台适配器已初始化（可能已经在 Flask 启动时初始化了）
-        global platform_adapters, platform_info
-        if platform_adapters is None:
-            print("正在初始化平台适配器...")
-            platform_adapters, platform_info = init_platform_adapters()
+        # 服务进程（HTTP、AI、注入），状态通过事件回传
+        self.core = core
 
         # 设置窗口标题
         title = "AIPut (跨平台版)"
@@ -470,34 +67,30 @@ class ServerApp:
         y = (screen_height - 945) // 2
         self.root.geometry(f"380x945+{x}+{y}")
 
-        self.all_ips = get_all_ips()
+        # IP 列表在后台枚举完成后填入
+        self.all_ips = ['0.0.0.0 (所有网卡)']
         self.ip_var = tk.StringVar(value=self.all_ips[0])
         self.port_var = tk.StringVar(value="37856")
         self.is_running = False
         self.auto_start_enabled = True  # 默认启用自动启动
-
-        # Keep-alive thread reference
-        self.keep_alive_thread = None
+        # 等待服务进程回复的启动请求：'auto'、'manual' 或 'rebind'
+        self._pending_start = None
+        self._quitting = False
 
         # QR code 相关变量
-        self.qr_ips = get_qr_ips()
+        self.qr_ips = ['127.0.0.1']
         self.qr_ip_var = tk.StringVar(value=self.qr_ips[0] if self.qr_ips else "127.0.0.1")
         self.qr_photo = None
+        self.qr_renderer = QRRenderer()
+        self._qr_after_id = None
 
         # 主容器
         main_frame = tk.Frame(root, padx=20, pady=20)
         main_frame.pack(expand=True, fill='both')
 
-        # 显示环境信息
-        if platform_info:
-            env_text = f"操作系统: {platform_info.os_name}"
-            if platform_info.display_protocol:
-                env_text += f" | 显示: {platform_info.display_protocol}"
-            if platform_info.desktop_environment:
-                env_text += f" | 桌面: {platform_info.desktop_environment}"
-
-            env_label = tk.Label(main_frame, text=env_text, fg="#888", font=("Arial", 9))
-            env_label.pack(anchor='w', pady=(0, 10))
+        # 显示环境信息（平台检测完成后更新）
+        self.env_label = tk.Label(main_frame, text="正在检测平台...", fg="#888", font=("Arial", 9))
+        self.env_label.pack(anchor='w', pady=(0, 10))
 
         # 其余UI代码...（简化版本）
         tk.Label(main_frame, text="本机 IP:", font=("Arial", 10, "bold")).pack(anchor='w')
@@ -539,17 +132,117 @@ class ServerApp:
         self.qr_ip_var.trace_add('write', self.on_qr_ip_change)
         self.port_var.trace_add('write', self.on_port_change)
 
-        # 显示初始二维码
-        self.root.after(200, self.update_qr_code)
+        # 服务进程的事件（平台信息、服务状态）转交 Tk 线程处理
+        self.core.set_listener(self.on_core_message)
+
+        # IP 列表由地址监视器首次读取后填入，网卡地址变化时更新 IP 列表和二维码
+        # （Linux 上由内核 netlink 通知，空闲时不占用资源）
+        self.rebind_on_change = os.environ.get('AIPUT_REBIND_ON_ADDRESS_CHANGE', 'false').lower() == 'true'
+        self.address_watcher = AddressWatcher(self.on_addresses_changed).start()
 
         # 自动启动服务
         if self.auto_start_enabled:
             # 延迟执行以确保UI完全加载
             self.root.after(100, self.auto_start_service)
 
+    def on_core_message(self, message):
+        """服务进程发来的事件（在控制通道线程中调用），转交 Tk 线程处理"""
+        try:
+            self.root.after(0, self.apply_core_message, message)
+        except RuntimeError:
+            pass  # 窗口已关闭
+
+    def apply_core_message(self, message):
+        """在 Tk 线程中处理服务进程的事件"""
+        event = message.get('event')
+        if event == 'platform':
+            if message.get('os_name'):
+                env_text = f"操作系统: {message['os_name']}"
+                if message.get('display_protocol'):
+                    env_text += f" | 显示: {message['display_protocol']}"
+                if message.get('desktop_environment'):
+                    env_text += f" | 桌面: {message['desktop_environment']}"
+                self.env_label.config(text=env_text)
+            else:
+                self.env_label.config(text="平台检测失败，使用兼容模式")
+        elif event == 'server':
+            self.on_server_state(message)
+        elif event == 'exited' and not self._quitting:
+            self.set_running(False)
+            messagebox.showerror("服务进程已退出", f"服务进程意外退出（退出码 {message.get('returncode')}）")
+
+    def on_server_state(self, message):
+        """服务进程回复启动请求后更新按钮状态并提示用户"""
+        origin, self._pending_start = self._pending_start, None
+        self.set_running(message['running'])
+        if message.get('error'):
+            if origin == 'rebind':
+                print(f"✗ 重新绑定失败: {message['error']}")
+            elif origin == 'auto':
+                messagebox.showerror("自动启动失败", f"服务自动启动失败：{message['error']}\n请检查配置后手动启动")
+            else:
+                messagebox.showerror("错误", f"服务启动失败：{message['error']}")
+            return
+        url = f"http://{message['host']}:{message['port']}"
+        if origin == 'rebind':
+            self.ip_var.set(message['host'])
+        elif origin == 'manual':
+            messagebox.showinfo("服务已启动", f"服务已启动在 {url}")
+        elif origin == 'auto':
+            # 自动启动时不显示弹窗，避免打扰用户
+            print(f"✓ 服务已自动启动在 {url}")
+
+    def set_running(self, running):
+        self.is_running = running
+        if running:
+            self.btn_start.config(text="停止服务", bg="#ff3b30")
+            self.port_entry.config(state='disabled')
+            self.ip_combo.config(state='disabled')
+        else:
+            self.btn_start.config(text="启动服务", bg="#007AFF")
+            self.port_entry.config(state='normal')
+            self.ip_combo.config(state='normal')
+
+    def on_addresses_changed(self, events, addresses):
+        """网卡地址变化（在监视线程中调用），排好序后转交 Tk 线程处理"""
+        for event in events:
+            action = "新增" if event.added else "移除"
+            print(f"网络地址{action}: {event.address} {event.interface}".rstrip())
+        # order_ips 会探测默认路由（UDP connect），不能在 Tk 线程中执行
+        all_ips = order_ips(addresses)
+        try:
+            self.root.after(0, self.apply_addresses, addresses, all_ips, get_qr_ips(all_ips))
+        except RuntimeError:
+            pass  # 窗口已关闭
+
+    def apply_addresses(self, addresses, all_ips, qr_ips):
+        """用排好序的地址更新 IP 列表、二维码，必要时重新绑定监听地址"""
+        previous_qr_ips = self.qr_ips
+        self.all_ips = all_ips
+        self.qr_ips = qr_ips
+        self.ip_combo.config(values=self.all_ips)
+        self.qr_ip_combo.config(values=self.qr_ips)
+
+        # 只替换自动选择且已失效的地址，保留用户手动输入的地址
+        qr_ip = self.qr_ip_var.get().strip()
+        if qr_ip not in self.qr_ips and (qr_ip in previous_qr_ips or qr_ip == '127.0.0.1'):
+            self.qr_ip_var.set(self.qr_ips[0])
+        else:
+            self.schedule_qr_update()
+
+        listen_host = self.ip_var.get()
+        if (self.rebind_on_change and self.is_running and not listen_host.startswith('0.0.0.0')
+                and listen_host not in addresses and addresses):
+            self.rebind_http_server(self.qr_ips[0])
+
+    def rebind_http_server(self, host):
+        """监听地址失效后，在新的地址上重新启动 HTTP 服务"""
+        port = int(self.port_var.get())
+        print(f"监听地址 {self.ip_var.get()} 已失效，重新绑定到 {host}:{port}")
+        self.start_http_server(host, port, origin='rebind')
+
     def auto_start_service(self):
         """自动启动服务"""
-        global platform_adapters
         try:
             # 验证端口配置
             port_str = self.port_var.get()
@@ -571,37 +264,13 @@ class ServerApp:
             else:
                 listen_host = host_ip
 
-            # 启动 Flask
-            t = threading.Thread(target=lambda: app.run(host=listen_host, port=port, debug=False, use_reloader=False), daemon=True)
-            t.start()
-
-            self.is_running = True
-            self.btn_start.config(text="停止服务", bg="#ff3b30")
-            self.port_entry.config(state='disabled')
-            self.ip_combo.config(state='disabled')
-
-            # Start keep-alive thread
-            if platform_adapters and hasattr(platform_adapters, 'keyboard'):
-                try:
-                    interval = get_keep_alive_interval()
-                    self.keep_alive_thread = KeepAliveThread(
-                        platform_adapters.keyboard,
-                        interval=interval
-                    )
-                    self.keep_alive_thread.start()
-                    print(f"✓ Keep-alive 线程已启动 (间隔: {interval}秒)")
-                except Exception as e:
-                    print(f"⚠ Keep-alive 线程启动失败: {e}")
-
-            # 自动启动时不显示弹窗，避免打扰用户
-            print(f"✓ 服务已自动启动在 http://{listen_host}:{port}")
+            self.start_http_server(listen_host, port, origin='auto')
 
         except Exception as e:
             messagebox.showerror("自动启动失败", f"服务自动启动失败：{str(e)}\n请检查配置后手动启动")
 
     def toggle_server(self):
         """切换服务器状态"""
-        global platform_adapters
         if not self.is_running:
             port_str = self.port_var.get()
             if not port_str.isdigit():
@@ -616,55 +285,51 @@ class ServerApp:
             else:
                 listen_host = host_ip
 
-            # 启动 Flask
-            t = threading.Thread(target=lambda: app.run(host=listen_host, port=port, debug=False, use_reloader=False), daemon=True)
-            t.start()
-
-            self.is_running = True
-            self.btn_start.config(text="停止服务", bg="#ff3b30")
-            self.port_entry.config(state='disabled')
-            self.ip_combo.config(state='disabled')
-
-            # Start keep-alive thread
-            if platform_adapters and hasattr(platform_adapters, 'keyboard'):
-                try:
-                    interval = get_keep_alive_interval()
-                    self.keep_alive_thread = KeepAliveThread(
-                        platform_adapters.keyboard,
-                        interval=interval
-                    )
-                    self.keep_alive_thread.start()
-                    print(f"✓ Keep-alive 线程已启动 (间隔: {interval}秒)")
-                except Exception as e:
-                    print(f"⚠ Keep-alive 线程启动失败: {e}")
-
-            messagebox.showinfo("服务已启动", f"服务已启动在 http://{listen_host}:{port}")
+            # 结果由服务进程的 server 事件返回（on_server_state）
+            self.start_http_server(listen_host, port, origin='manual')
         else:
-            # Stop keep-alive thread
-            if self.keep_alive_thread:
-                try:
-                    self.keep_alive_thread.stop()
-                    print("✓ Keep-alive 线程已停止")
-                except Exception as e:
-                    print(f"⚠ Keep-alive 线程停止失败: {e}")
-                self.keep_alive_thread = None
             self.quit_app()
 
+    def start_http_server(self, listen_host, port, origin='manual'):
+        """请求服务进程在指定地址启动 HTTP 服务（keep-alive 由服务进程管理）"""
+        self._pending_start = origin
+        self.core.send({'cmd': 'start', 'host': listen_host, 'port': port})
+
+    def schedule_qr_update(self):
+        """输入停止 QR_DEBOUNCE_MS 毫秒后再更新二维码"""
+        if self._qr_after_id is not None:
+            self.root.after_cancel(self._qr_after_id)
+        self._qr_after_id = self.root.after(QR_DEBOUNCE_MS, self.update_qr_code)
+
     def update_qr_code(self):
-        """更新二维码显示"""
+        """请求当前 IP/端口的二维码（在后台线程生成）"""
+        self._qr_after_id = None
+        # 验证端口
+        port = self.port_var.get()
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            return
+
+        # 获取当前选中的 IP
+        qr_ip = self.qr_ip_var.get().strip()
+        if not qr_ip:
+            return
+        self.qr_renderer.request(qr_ip, int(port), self.on_qr_rendered)
+
+    def on_qr_rendered(self, ip, port, img, url):
+        """二维码生成完成（可能在渲染线程中调用），转交 Tk 线程显示"""
         try:
-            # 验证端口
-            port = self.port_var.get()
-            if not port.isdigit():
-                return
-
-            # 获取当前选中的 IP
-            qr_ip = self.qr_ip_var.get()
+            self.root.after(0, self.show_qr_code, ip, port, img, url)
+        except RuntimeError:
+            pass  # 窗口已关闭
 
-            # 生成二维码
-            img, url = generate_qr_code(qr_ip, int(port))
+    def show_qr_code(self, ip, port, img, url):
+        """在 Tk 线程中显示二维码"""
+        try:
             if img is None:
                 return
+            # 生成期间 IP 或端口已改变：等待新的结果
+            if (ip, str(port)) != (self.qr_ip_var.get().strip(), self.port_var.get()):
+                return
 
             # 转换图片为 tkinter 可用的格式
             self.qr_photo = ImageTk.PhotoImage(img)
@@ -686,25 +351,19 @@ class ServerApp:
 
     def on_qr_ip_change(self, *_, **__):
         """当 QR IP 选择变化时更新二维码"""
-        self.update_qr_code()
+        self.schedule_qr_update()
 
     def on_port_change(self, *_, **__):
         """当端口变化时更新二维码"""
-        self.update_qr_code()
+        self.schedule_qr_update()
 
     def quit_app(self):
         """退出应用"""
-        global platform_adapters
-        # Stop keep-alive thread
-        if self.keep_alive_thread:
-            try:
-                self.keep_alive_thread.stop()
-                print("✓ Keep-alive 线程已停止")
-            except Exception as e:
-                print(f"⚠ Keep-alive 线程停止失败: {e}")
-            self.keep_alive_thread = None
-        if platform_adapters and hasattr(platform_adapters, 'system_tray'):
-            platform_adapters.system_tray.stop()
+        self._quitting = True
+        # 服务进程优雅关闭 HTTP 服务（等待进行中的请求完成）、keep-alive 和注入循环
+        self.core.stop()
+        self.qr_renderer.stop()
+        self.address_watcher.stop()
         self.root.quit()
 
 def signal_handler(signum, frame):
@@ -712,13 +371,26 @@ def signal_handler(signum, frame):
     print("\n收到退出信号，正在退出...")
     sys.exit(0)
 
-if __name__ == '__main__':
+def main():
+    """启动图形界面"""
     # 注册信号处理器
     import signal
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
+    # 服务进程在独立的解释器中初始化平台适配器和 AI 服务，窗口立即显示
+    core = CoreProcess().start()
+
     # 创建并运行 GUI
     root = tk.Tk()
-    app_gui = ServerApp(root)
-    root.mainloop()
\ No newline at end of file
+    app_gui = ServerApp(root, core)
+    try:
+        root.mainloop()
+    finally:
+        # 异常退出时也不留下孤立的服务进程
+        if core.process.poll() is None:
+            core.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+HTTP serving core shared by the GUI and headless entry points.
+"""
+
+import os
+from typing import Optional
+
+from .core import TypeHandler, default_site_dir
+from .injection_loop import InjectionLoop, get_injection_loop
+from .keep_alive import KeepAliveTask, get_keep_alive_interval
+
+__all__ = [
+    'TypeHandler', 'default_site_dir', 'create_http_server',
+    'InjectionLoop', 'get_injection_loop', 'KeepAliveTask', 'get_keep_alive_interval',
+]
+
+
+def create_http_server(handler: TypeHandler, site_dir: Optional[str] = None, mode: Optional[str] = None):
+    """Create the HTTP server selected by AIPUT_SERVER_MODE.
+
+    Args:
+        handler: Shared request handler.
+        site_dir: Mobile site directory (defaults to the project's site/).
+        mode: 'production' (aiohttp, default) or 'dev' (Flask/Werkzeug).
+
+    Returns:
+        Server object with start(host, port) and stop().
+    """
+    site_dir = site_dir or default_site_dir()
+    mode = (mode or os.environ.get('AIPUT_SERVER_MODE', 'production')).lower()
+
+    if mode == 'dev':
+        from .flask_app import DevServer
+        return DevServer(handler, site_dir)
+
+    from .aiohttp_app import ProductionServer
+    return ProductionServer(handler, site_dir)
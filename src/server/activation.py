@@ -0,0 +1,124 @@
+"""
+systemd socket activation and idle shutdown.
+
+With a .socket unit, systemd binds the port itself and starts AIPut on
+the first connection, passing the listening socket as fd 3 with
+LISTEN_FDS/LISTEN_PID set (sd_listen_fds(3)). The server serves from
+the inherited socket and exits after AIPUT_IDLE_TIMEOUT seconds without
+requests; systemd keeps the socket open and queues new connections
+until the next start.
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# 第一个继承的文件描述符（SD_LISTEN_FDS_START）
+LISTEN_FDS_START = 3
+
+
+def listen_fds(unset_environment: bool = True) -> List[socket.socket]:
+    """Listening sockets passed by systemd, or [] when not socket-activated.
+
+    Args:
+        unset_environment: Remove LISTEN_* variables so child processes
+            do not try to use the sockets too.
+
+    Returns:
+        Sockets for fds 3 .. 3 + LISTEN_FDS - 1.
+    """
+    try:
+        pid = int(os.environ.get('LISTEN_PID', ''))
+        count = int(os.environ.get('LISTEN_FDS', ''))
+    except ValueError:
+        return []
+    finally:
+        if unset_environment:
+            for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+                os.environ.pop(name, None)
+    if pid != os.getpid() or count <= 0:
+        return []
+
+    sockets = []
+    for fd in range(LISTEN_FDS_START, LISTEN_FDS_START + count):
+        os.set_inheritable(fd, False)
+        sock = socket.socket(fileno=fd)
+        sock.setblocking(False)
+        sockets.append(sock)
+    return sockets
+
+
+def get_idle_timeout() -> float:
+    """Seconds without requests before exiting (AIPUT_IDLE_TIMEOUT, 0 = never)."""
+    value = os.environ.get('AIPUT_IDLE_TIMEOUT', '0')
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        print(f"⚠ AIPUT_IDLE_TIMEOUT 无效 ({value!r})，不会空闲退出")
+        return 0.0
+
+
+class ActivityTracker:
+    """Tracks in-flight requests and the time of the last one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+        self._last = time.monotonic()
+
+    def begin(self):
+        """A request (or long-lived connection) started."""
+        with self._lock:
+            self._active += 1
+            self._last = time.monotonic()
+
+    def end(self):
+        """A request finished."""
+        with self._lock:
+            self._active = max(0, self._active - 1)
+            self._last = time.monotonic()
+
+    def touch(self):
+        """Work not tied to a connection (e.g. a /jobs injection) is still running."""
+        with self._lock:
+            self._last = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        """Seconds since the last request ended; 0 while any request is in flight."""
+        with self._lock:
+            if self._active:
+                return 0.0
+            return time.monotonic() - self._last
+
+
+def wait_until_idle(activity: ActivityTracker, idle_timeout: float, stop: threading.Event,
+                    poll_interval: float = 1.0, busy: Optional[Callable[[], bool]] = None) -> bool:
+    """Block until `stop` is set or the server has been idle for `idle_timeout` seconds.
+
+    Args:
+        activity: Server activity tracker.
+        idle_timeout: Idle seconds before returning; 0 waits for `stop` only.
+        stop: Event set by the signal handlers.
+        poll_interval: Seconds between checks (also lets signal handlers run).
+        busy: Returns True while requests are still queued or running without
+            an open connection (the scheduler's work); counted as activity.
+
+    Returns:
+        True if the idle timeout expired, False if `stop` was set.
+    """
+    while not stop.wait(poll_interval):
+        if busy is not None and busy():
+            activity.touch()
+        if idle_timeout and activity.idle_seconds() >= idle_timeout:
+            return True
+    return False
+
+
+def socket_address(sock: socket.socket) -> Tuple[str, int]:
+    """(host, port) a listening socket is bound to (port 0 for Unix sockets)."""
+    address = sock.getsockname()
+    if isinstance(address, tuple):
+        return address[0], address[1]
+    return address, 0
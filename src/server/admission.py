@@ -0,0 +1,113 @@
+"""
+Admission control and load shedding.
+
+Requests are checked before they take an injection ticket:
+
+* more than AIPUT_MAX_PENDING_INJECTIONS requests waiting to be pasted
+  → rejected (503 with Retry-After);
+* more than AIPUT_MAX_AI_BACKLOG requests waiting for an AI slot
+  → rejected, or with AIPUT_OVERLOAD_POLICY=degrade pasted without AI.
+
+Retry-After is estimated from EWMAs of the AI and injection service
+times, i.e. from the throughput the server is currently achieving.
+"""
+
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+ADMIT = 'admit'
+DEGRADE = 'degrade'
+REJECT = 'reject'
+
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of an admission check."""
+    action: str
+    retry_after: int = 0
+    reason: str = ''
+
+
+class AdmissionController:
+    """Decides whether to admit, degrade or reject a new request."""
+
+    def __init__(self, scheduler, max_pending: Optional[int] = None,
+                 max_ai_backlog: Optional[int] = None, policy: Optional[str] = None,
+                 alpha: float = 0.2):
+        """Initialize controller.
+
+        Args:
+            scheduler: RequestScheduler whose stages are watched.
+            max_pending: Pending injections allowed (default: AIPUT_MAX_PENDING_INJECTIONS or 16).
+            max_ai_backlog: Requests allowed to wait for an AI slot (default: AIPUT_MAX_AI_BACKLOG or 8).
+            policy: 'reject' or 'degrade' for AI overload (default: AIPUT_OVERLOAD_POLICY or reject).
+            alpha: EWMA smoothing factor for service times.
+        """
+        self.scheduler = scheduler
+        self.max_pending = max_pending or int(os.environ.get('AIPUT_MAX_PENDING_INJECTIONS', '16'))
+        self.max_ai_backlog = max_ai_backlog or int(os.environ.get('AIPUT_MAX_AI_BACKLOG', '8'))
+        self.policy = (policy or os.environ.get('AIPUT_OVERLOAD_POLICY', REJECT)).lower()
+        self.alpha = alpha
+
+        self._lock = threading.Lock()
+        # 初始估计：注入约 0.3 秒，AI 约 3 秒
+        self._injection_seconds = 0.3
+        self._ai_seconds = 3.0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+
+    def check(self, ai_requested: bool) -> AdmissionDecision:
+        """Decide for a newly arrived request."""
+        pending = self.scheduler.injection_queue.depth
+        ai_backlog = self.scheduler.ai_waiting
+
+        with self._lock:
+            if pending >= self.max_pending:
+                self.rejected += 1
+                return AdmissionDecision(REJECT, self._retry_after(pending, ai_backlog), 'injection backlog')
+
+            if ai_requested and ai_backlog >= self.max_ai_backlog:
+                if self.policy == DEGRADE:
+                    self.degraded += 1
+                    return AdmissionDecision(DEGRADE, reason='ai backlog')
+                self.rejected += 1
+                return AdmissionDecision(REJECT, self._retry_after(pending, ai_backlog), 'ai backlog')
+
+            self.admitted += 1
+            return AdmissionDecision(ADMIT)
+
+    def _retry_after(self, pending: int, ai_backlog: int) -> int:
+        # 注入串行执行；AI 阶段按并发度分摊
+        injection_drain = pending * self._injection_seconds
+        ai_drain = ai_backlog * self._ai_seconds / max(1, self.scheduler.max_ai_concurrency)
+        return min(120, max(1, math.ceil(max(injection_drain, ai_drain))))
+
+    def record_ai(self, seconds: float):
+        """Feed one AI stage duration into the EWMA."""
+        with self._lock:
+            self._ai_seconds += self.alpha * (seconds - self._ai_seconds)
+
+    def record_injection(self, seconds: float):
+        """Feed one injection stage duration into the EWMA."""
+        with self._lock:
+            self._injection_seconds += self.alpha * (seconds - self._injection_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Admission counters, reject rate and service-time estimates."""
+        with self._lock:
+            total = self.admitted + self.degraded + self.rejected
+            return {
+                'policy': self.policy,
+                'max_pending_injections': self.max_pending,
+                'max_ai_backlog': self.max_ai_backlog,
+                'admitted': self.admitted,
+                'degraded': self.degraded,
+                'rejected': self.rejected,
+                'reject_rate': round(self.rejected / total, 4) if total else 0.0,
+                'ewma_ai_seconds': round(self._ai_seconds, 3),
+                'ewma_injection_seconds': round(self._injection_seconds, 3),
+            }
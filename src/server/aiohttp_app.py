@@ -0,0 +1,225 @@
+"""
+Production HTTP server built on aiohttp.web.
+
+All requests are served from one persistent asyncio loop running in a
+background thread: HTTP/1.1 keep-alive, a bound on concurrently handled
+requests, and a graceful drain of in-flight requests on shutdown.
+"""
+
+import asyncio
+import os
+import socket
+import threading
+from typing import Optional
+
+from aiohttp import web
+
+from server import metrics
+from server.activation import ActivityTracker
+from server.assets import AssetBundle
+from server.core import TypeHandler, http_status
+from server.jobs import JobStore, create_job, job_status, job_events
+from server.sync import sync_batch
+from server.websocket import type_websocket
+
+
+def create_app(type_handler: TypeHandler, site_dir: str, max_concurrency: int = 32,
+               activity: Optional[ActivityTracker] = None) -> web.Application:
+    """Create the aiohttp application exposing the same routes as the Flask app.
+
+    Args:
+        type_handler: Shared request handler.
+        site_dir: Directory containing index.html, app.js, style.css and config/.
+        max_concurrency: Maximum number of requests handled at once; further
+            requests wait for a free slot. Long-lived WebSocket and SSE
+            connections are not counted.
+        activity: Records request activity for idle shutdown (open
+            WebSocket and SSE connections count as activity).
+
+    Returns:
+        aiohttp Application.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    jobs = JobStore(type_handler)
+    activity = activity or ActivityTracker()
+    assets = AssetBundle(site_dir)
+
+    @web.middleware
+    async def track_activity(request, handler):
+        activity.begin()
+        try:
+            return await handler(request)
+        finally:
+            activity.end()
+
+    @web.middleware
+    async def limit_concurrency(request, handler):
+        if request.path == '/ws' or request.path.endswith('/events'):
+            return await handler(request)
+        async with semaphore:
+            return await handler(request)
+
+    def serve_asset(request, path):
+        result = assets.respond(path, request.headers.get('Accept-Encoding'),
+                                request.headers.get('If-None-Match'))
+        if result is None:
+            raise web.HTTPNotFound()
+        status, headers, body = result
+        return web.Response(status=status, headers=headers, body=body)
+
+    async def index(request):
+        return serve_asset(request, 'index.html')
+
+    async def static(request):
+        return serve_asset(request, request.match_info['path'])
+
+    async def service_worker(request):
+        # 从根路径提供，使 Service Worker 的作用域覆盖整个页面
+        return serve_asset(request, 'sw.js')
+
+    async def type_text(request):
+        """处理文本输入请求，支持AI处理"""
+        # 获取客户端IP地址
+        client_ip = request.headers.get('X-Forwarded-For', request.remote or 'unknown')
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        idempotency_key = request.headers.get('Idempotency-Key')
+        response = await type_handler.handle(data, client_ip, idempotency_key=idempotency_key,
+                                             trace_id=request.headers.get('X-Request-ID'))
+        status, headers = http_status(response)
+        return web.json_response(response, status=status, headers=headers)
+
+    async def sync(request):
+        """批量处理手机端离线发件箱"""
+        client_ip = request.headers.get('X-Forwarded-For', request.remote or 'unknown')
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        status, response = await sync_batch(type_handler, data, client_ip)
+        return web.json_response(response, status=status)
+
+    async def websocket(request):
+        return await type_websocket(request, type_handler)
+
+    async def post_job(request):
+        return await create_job(request, jobs)
+
+    async def get_job(request):
+        return await job_status(request, jobs)
+
+    async def get_job_events(request):
+        return await job_events(request, jobs)
+
+    async def metrics_endpoint(request):
+        return web.Response(body=metrics.REGISTRY.render().encode(),
+                            headers={'Content-Type': metrics.CONTENT_TYPE})
+
+    async def stats(request):
+        stats = type_handler.get_stats()
+        stats['jobs'] = len(jobs)
+        return web.json_response(stats)
+
+    app = web.Application(middlewares=[track_activity, limit_concurrency])
+    app.router.add_get('/', index)
+    app.router.add_post('/type', type_text)
+    app.router.add_post('/sync', sync)
+    app.router.add_get('/stats', stats)
+    app.router.add_get('/metrics', metrics_endpoint)
+    app.router.add_get('/ws', websocket)
+    app.router.add_post('/jobs', post_job)
+    app.router.add_get('/jobs/{job_id}', get_job)
+    app.router.add_get('/jobs/{job_id}/events', get_job_events)
+    app.router.add_get('/sw.js', service_worker)
+    app.router.add_get('/static/{path:.+}', static)
+    return app
+
+
+class ProductionServer:
+    """Runs the aiohttp app on a dedicated, persistent event loop thread."""
+
+    def __init__(self, handler: TypeHandler, site_dir: str):
+        """Initialize server.
+
+        Args:
+            handler: Shared request handler.
+            site_dir: Directory with the mobile site.
+        """
+        self.handler = handler
+        self.site_dir = site_dir
+        self.max_concurrency = int(os.environ.get('AIPUT_MAX_CONCURRENCY', '32'))
+        self.keepalive_timeout = float(os.environ.get('AIPUT_KEEPALIVE_TIMEOUT', '75'))
+        self.shutdown_timeout = float(os.environ.get('AIPUT_SHUTDOWN_TIMEOUT', '10'))
+        # 最近请求时间，用于空闲退出
+        self.activity = ActivityTracker()
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, host: str, port: int, timeout: float = 10, sock: Optional[socket.socket] = None):
+        """Start serving and wait until the socket is bound.
+
+        Args:
+            host: Listen address.
+            port: Listen port.
+            timeout: Seconds to wait for startup.
+            sock: Already-bound listening socket (socket activation); host
+                and port are ignored when given.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        started = threading.Event()
+        error = []
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self._start_site(host, port, sock))
+            except Exception as e:
+                error.append(e)
+                started.set()
+                self.loop.close()
+                return
+            started.set()
+            try:
+                self.loop.run_forever()
+            finally:
+                self.loop.close()
+
+        self._thread = threading.Thread(target=run, name='aiput-http', daemon=True)
+        self._thread.start()
+        if not started.wait(timeout):
+            raise TimeoutError('HTTP server did not start in time')
+        if error:
+            raise error[0]
+
+    async def _start_site(self, host: str, port: int, sock: Optional[socket.socket] = None):
+        app = create_app(self.handler, self.site_dir, self.max_concurrency, self.activity)
+        self._runner = web.AppRunner(app, access_log=None, keepalive_timeout=self.keepalive_timeout,
+                                     shutdown_timeout=self.shutdown_timeout)
+        await self._runner.setup()
+        if sock is not None:
+            site = web.SockSite(self._runner, sock)
+        else:
+            site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+    def stop(self):
+        """Stop accepting connections, drain in-flight requests and stop the loop."""
+        if not self.loop or not self._runner or self.loop.is_closed():
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop)
+        try:
+            future.result(self.shutdown_timeout + 5)
+        except Exception as e:
+            print(f"⚠ HTTP 服务关闭异常: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._runner = None
@@ -0,0 +1,227 @@
+"""
+Precompressed, fingerprinted static assets for the mobile site.
+
+At server start every file under site/ is read once, compressed with
+gzip (and brotli when the `brotli` package is installed) and given a
+strong ETag. The scripts and the stylesheet (FINGERPRINTED) are also
+served under content-hashed names (app.<hash>.js) that index.html is
+rewritten to reference, so they
+can be cached forever; index.html and everything else is revalidated
+with If-None-Match and costs a 304 when unchanged.
+
+AssetBundle.respond() is framework-independent; the aiohttp and Flask
+front-ends only translate its (status, headers, body) result.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 以内容哈希命名、可永久缓存的文件（index.html 中的引用会被改写）
+FINGERPRINTED = ('app.js', 'outbox.js', 'style.css')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# 小于该字节数的文件不压缩（压缩收益小于额外的头部开销）
+MIN_COMPRESS_SIZE = 256
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+TEXT_TYPES = ('text/', 'application/javascript', 'application/json')
+
+
+@dataclass
+class Asset:
+    """One file with its precomputed encodings."""
+    path: str
+    content_type: str
+    digest: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    immutable: bool = False
+
+    def etag(self, encoding: str) -> str:
+        """Strong ETag of one representation (each encoding is a different entity)."""
+        if encoding == 'identity':
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(asset: Asset, accept_encoding: Optional[str]) -> str:
+    """Best available encoding the client accepts: br, then gzip, then identity."""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    for encoding in ('br', 'gzip'):
+        if encoding in asset.encodings and accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return 'identity'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # If-None-Match 使用弱比较：W/"x" 与 "x" 视为相同
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def _content_type(path: str) -> str:
+    if path.endswith('.js'):
+        content_type = 'application/javascript'
+    else:
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith(TEXT_TYPES):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def _compress(body: bytes, content_type: str) -> Dict[str, bytes]:
+    encodings = {'identity': body}
+    if len(body) < MIN_COMPRESS_SIZE or not content_type.startswith(COMPRESSIBLE_TYPES):
+        return encodings
+    # mtime=0：同样的内容得到同样的字节，ETag 在重启后保持稳定
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gzipped) < len(body):
+        encodings['gzip'] = gzipped
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        if len(compressed) < len(body):
+            encodings['br'] = compressed
+    return encodings
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    """app.js -> app.<digest>.js"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{digest}{ext}'
+
+
+class AssetBundle:
+    """In-memory, precompressed copy of the site directory."""
+
+    def __init__(self, site_dir: str, auto_reload: bool = False):
+        """Initialize bundle.
+
+        Args:
+            site_dir: Directory containing index.html, app.js, style.css and config/.
+            auto_reload: Rebuild when a file changes on disk (development server).
+        """
+        self.site_dir = site_dir
+        self.auto_reload = auto_reload
+        self._lock = threading.Lock()
+        self._assets: Dict[str, Asset] = {}
+        self._mtimes: Dict[str, float] = {}
+        self.build()
+
+    def _scan(self) -> Dict[str, float]:
+        mtimes = {}
+        for root, dirs, files in os.walk(self.site_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                if name.startswith('.'):
+                    continue
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.site_dir).replace(os.sep, '/')
+                mtimes[path] = os.stat(full_path).st_mtime
+        return mtimes
+
+    def build(self):
+        """Read, fingerprint and compress every file in the site directory."""
+        mtimes = self._scan()
+        bodies = {}
+        for path in mtimes:
+            with open(os.path.join(self.site_dir, path), 'rb') as f:
+                bodies[path] = f.read()
+
+        assets = {}
+        renames = {}
+        for path, body in bodies.items():
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            if path == 'index.html':
+                continue
+            asset = Asset(path, _content_type(path), digest, _compress(body, _content_type(path)))
+            assets[path] = asset
+            if path in FINGERPRINTED:
+                hashed = fingerprinted_name(path, digest)
+                assets[hashed] = Asset(hashed, asset.content_type, digest, asset.encodings, immutable=True)
+                renames[path] = hashed
+
+        if 'index.html' in bodies:
+            html = bodies['index.html'].decode('utf-8')
+            for path, hashed in renames.items():
+                html = html.replace(f'/static/{path}"', f'/static/{hashed}"')
+            body = html.encode('utf-8')
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            assets['index.html'] = Asset('index.html', _content_type('index.html'), digest,
+                                         _compress(body, _content_type('index.html')))
+
+        with self._lock:
+            self._assets = assets
+            self._mtimes = mtimes
+
+    def get(self, path: str) -> Optional[Asset]:
+        """Asset for a path relative to the site directory."""
+        if self.auto_reload and self._scan() != self._mtimes:
+            self.build()
+        with self._lock:
+            return self._assets.get(path)
+
+    def respond(self, path: str, accept_encoding: Optional[str] = None,
+                if_none_match: Optional[str] = None) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Build the response for a static path.
+
+        Args:
+            path: Path relative to the site directory ('index.html', 'app.<hash>.js', ...).
+            accept_encoding: Request Accept-Encoding header.
+            if_none_match: Request If-None-Match header.
+
+        Returns:
+            (status, headers, body), or None if there is no such asset.
+        """
+        asset = self.get(path)
+        if asset is None:
+            return None
+        encoding = choose_encoding(asset, accept_encoding)
+        etag = asset.etag(encoding)
+        headers = {
+            'ETag': etag,
+            'Cache-Control': IMMUTABLE if asset.immutable else REVALIDATE,
+            'Vary': 'Accept-Encoding',
+        }
+        if _etag_matches(if_none_match, etag):
+            return 304, headers, b''
+        headers['Content-Type'] = asset.content_type
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return 200, headers, asset.encodings[encoding]
@@ -0,0 +1,86 @@
+"""
+Process setup shared by the GUI and the headless entry point.
+
+Nothing here imports GUI toolkits; platform adapters and the AI service
+are imported only when their init function is called.
+"""
+
+import os
+
+
+def prepare_display_environment():
+    """Set DISPLAY / XAUTHORITY before any adapter touches the display."""
+    # 设置 DISPLAY 环境变量（如果需要）
+    if os.environ.get('WAYLAND_DISPLAY') and not os.environ.get('DISPLAY'):
+        # 在 Wayland 环境下尝试使用 Xwayland
+        os.environ['DISPLAY'] = ':0'
+
+    # 修复 sudo 环境下的 X11 授权问题
+    # 如果在 sudo 环境下运行，需要保留原用户的 XAUTHORITY
+    if os.geteuid() == 0:  # 检测是否为 root 用户
+        # 尝试获取原始用户
+        sudo_user = os.environ.get('SUDO_USER')
+        if sudo_user and not os.environ.get('XAUTHORITY'):
+            # 设置 XAUTHORITY 指向原用户的授权文件
+            xauth_path = f'/home/{sudo_user}/.Xauthority'
+            if os.path.exists(xauth_path):
+                os.environ['XAUTHORITY'] = xauth_path
+
+
+def detect_platform():
+    """检测平台并打印平台信息"""
+    # 导入平台检测
+    print("正在导入平台检测模块...")
+    from platform_detection.detector import PlatformDetector
+
+    # 检测平台
+    print("正在检测平台...")
+    platform_info = PlatformDetector.detect()
+    print(f"\n=== 平台信息 ===")
+    print(f"操作系统: {platform_info.os_name}")
+    print(f"显示环境: {platform_info.display_protocol or '未知'}")
+    print(f"桌面环境: {platform_info.desktop_environment or '未知'}")
+    print(f"===============")
+
+    # 检测到的工具
+    if platform_info.additional_info:
+        print("\n=== 可用工具 ===")
+        kb_tools = platform_info.additional_info.get('keyboard_tools', [])
+        cb_tools = platform_info.additional_info.get('clipboard_tools', [])
+        if kb_tools:
+            print(f"键盘模拟工具: {', '.join(kb_tools)}")
+        if cb_tools:
+            print(f"剪贴板工具: {', '.join(cb_tools)}")
+        print("===============")
+    return platform_info
+
+
+def create_platform_adapters(platform_info):
+    """为检测到的平台创建适配器"""
+    print("正在导入适配器工厂...")
+    from platform_adapters.factory import AdapterFactory
+
+    # 创建适配器
+    print("\n正在创建平台适配器...")
+    adapters = AdapterFactory.create_adapters(platform_info)
+    print("✓ 平台适配器创建成功！")
+    return adapters
+
+
+def init_processing_service():
+    """初始化AI处理服务（失败时返回 None）"""
+    print("正在初始化AI处理服务...")
+    try:
+        from ai.processing_service import ProcessingService
+        from ai.retry import get_retry_budget
+        from server import metrics
+        # 重试预算的计数导出到 /metrics
+        budget = get_retry_budget()
+        budget.on_retry = metrics.RETRIES.inc
+        budget.on_exhausted = metrics.RETRY_BUDGET_EXHAUSTED.inc
+        processing_service = ProcessingService()
+        print("  AI处理服务初始化成功")
+        return processing_service
+    except Exception as e:
+        print(f"  AI处理服务初始化失败: {e}")
+        return None
@@ -0,0 +1,224 @@
+"""
+GUI ↔ core process control channel.
+
+The GUI runs the serving core (HTTP, AI, injection) in a child process so
+Tk redraws and image work never compete with request handling for the
+same GIL. The two sides talk over an authenticated
+multiprocessing.connection channel (a Unix socket, or a named pipe on
+Windows): the GUI listens on a random address, passes the address on the
+command line and the key through AIPUT_CONTROL_KEY, and the core
+connects back.
+
+Commands (GUI → core) and events (core → GUI) are small dicts:
+
+    {'cmd': 'start', 'host': ..., 'port': ...}  → {'event': 'server', 'running', 'host', 'port', 'error'}
+    {'cmd': 'stop'}                             → {'event': 'server', 'running': False, ...}
+    {'cmd': 'stats'}                            → {'event': 'stats', 'stats': {...}}
+    {'cmd': 'shutdown'}
+
+The core also sends {'event': 'platform', ...} once platform detection is
+done. The GUI side reports {'event': 'exited', 'returncode': ...} when the
+core process ends; the core shuts down when the GUI connection closes.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional
+
+# 认证密钥通过环境变量传给核心进程（不出现在命令行中）
+CONTROL_KEY_ENV = 'AIPUT_CONTROL_KEY'
+
+_CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cli.py')
+
+
+def core_command(address: str) -> List[str]:
+    """Command line that starts the core process.
+
+    A PyInstaller build has no cli.py next to the interpreter; there
+    sys.executable is the app itself, and its entry point (remote_server.py)
+    hands a leading `core` argument to the CLI.
+    """
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, 'core', '--control', address]
+    return [sys.executable, _CLI, 'core', '--control', address]
+
+MessageCallback = Callable[[Dict[str, Any]], None]
+
+
+class CoreProcess:
+    """GUI-side handle on the core process."""
+
+    def __init__(self, on_message: Optional[MessageCallback] = None):
+        """Initialize handle.
+
+        Args:
+            on_message: Called with every event from the core, on a
+                background thread. Events arriving before a callback is
+                set (see set_listener) are kept and delivered then.
+        """
+        self._on_message = on_message
+        self._backlog: List[Dict[str, Any]] = []
+        self.process: Optional[subprocess.Popen] = None
+        self._authkey = os.urandom(32)
+        self._listener: Optional[Listener] = None
+        self._conn: Optional[Connection] = None
+        self._queued: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> 'CoreProcess':
+        """Spawn the core process and start waiting for it to connect."""
+        self._listener = Listener(authkey=self._authkey)
+        env = dict(os.environ, **{CONTROL_KEY_ENV: self._authkey.hex()})
+        self.process = subprocess.Popen(core_command(str(self._listener.address)), env=env)
+        threading.Thread(target=self._read, name='aiput-control', daemon=True).start()
+        threading.Thread(target=self._watch, name='aiput-core-watch', daemon=True).start()
+        return self
+
+    def set_listener(self, on_message: MessageCallback):
+        """Set the event callback and deliver events received so far."""
+        with self._lock:
+            self._on_message = on_message
+            backlog, self._backlog = self._backlog, []
+        for message in backlog:
+            self._deliver(message)
+
+    def _deliver(self, message: Dict[str, Any]):
+        with self._lock:
+            on_message = self._on_message
+            if on_message is None:
+                self._backlog.append(message)
+                return
+        try:
+            on_message(message)
+        except Exception as e:
+            print(f"⚠ 处理服务进程消息失败: {e}")
+
+    def send(self, command: Dict[str, Any]):
+        """Send a command; commands sent before the core connects are queued."""
+        with self._lock:
+            if self._conn is None:
+                self._queued.append(command)
+                return
+            try:
+                self._conn.send(command)
+            except OSError as e:
+                print(f"⚠ 无法发送命令到服务进程: {e}")
+
+    def stop(self, timeout: float = 10) -> Optional[int]:
+        """Ask the core to shut down and wait for it to exit.
+
+        Returns:
+            The core's exit code, or None if it had to be killed.
+        """
+        if self.process is None:
+            return None
+        self.send({'cmd': 'shutdown'})
+        try:
+            return self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            print("⚠ 服务进程未能及时退出，强制结束")
+            self.process.kill()
+            return None
+
+    def _read(self):
+        try:
+            conn = self._listener.accept()
+        except OSError:
+            return  # 核心进程未连接就退出了
+        with self._lock:
+            self._conn = conn
+            queued, self._queued = self._queued, []
+            for command in queued:
+                conn.send(command)
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            self._deliver(message)
+
+    def _watch(self):
+        returncode = self.process.wait()
+        # 关闭监听端，让仍在等待连接的读取线程退出
+        self._listener.close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+        self._deliver({'event': 'exited', 'returncode': returncode})
+
+
+def run_core(address: str, authkey: bytes) -> int:
+    """Core process main loop: serve commands until shutdown or the GUI goes away.
+
+    Args:
+        address: Listener address of the GUI process.
+        authkey: Shared authentication key.
+
+    Returns:
+        Process exit code.
+    """
+    from server.bootstrap import prepare_display_environment
+    prepare_display_environment()
+
+    from server.service import CoreService
+
+    conn = Client(address, authkey=authkey)
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except OSError:
+                pass  # GUI 已退出
+
+    service = CoreService()
+
+    def on_platform(future):
+        platform_info = None if future.exception() else future.result()
+        send({
+            'event': 'platform',
+            'os_name': getattr(platform_info, 'os_name', None),
+            'display_protocol': getattr(platform_info, 'display_protocol', None),
+            'desktop_environment': getattr(platform_info, 'desktop_environment', None),
+        })
+
+    service.startup.future('platform').add_done_callback(on_platform)
+
+    def server_event(error=None):
+        return {'event': 'server', 'running': service.running,
+                'host': service.host, 'port': service.port, 'error': error}
+
+    try:
+        while True:
+            try:
+                command = conn.recv()
+            except (EOFError, OSError):
+                print("控制连接已断开，服务进程退出")
+                break
+            name = command.get('cmd')
+            if name == 'start':
+                try:
+                    service.start_http(command['host'], command['port'])
+                    send(server_event())
+                except OSError as e:
+                    print(f"✗ 服务启动失败: {e}")
+                    send(server_event(str(e)))
+            elif name == 'stop':
+                service.stop_http()
+                send(server_event())
+            elif name == 'stats':
+                send({'event': 'stats', 'stats': service.type_handler.get_stats()})
+            elif name == 'shutdown':
+                break
+            else:
+                print(f"⚠ 未知的控制命令: {name}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+        conn.close()
+    return 0
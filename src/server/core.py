@@ -0,0 +1,505 @@
+"""
+Framework-independent handling of /type requests.
+
+Both the Flask development server and the aiohttp production server
+delegate to TypeHandler, so the request flow (AI processing, clipboard,
+paste, notification, Ctrl+Enter) lives in exactly one place.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple
+
+from server.admission import AdmissionController, DEGRADE, REJECT
+from server.idempotency import IdempotencyCache
+from server.injection_loop import InjectionLoop, get_injection_loop
+from server import metrics
+from server.scheduler import RequestScheduler
+from server.tracing import RequestTrace, server_timing_header
+
+
+def _optional_number(value: Any) -> Optional[float]:
+    """A finite, non-negative number from client JSON, or None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not 0 <= value < float('inf'):
+        return None
+    return float(value)
+
+
+@dataclass
+class TypeRequest:
+    """Parsed /type payload."""
+    text: str
+    auto_submit: bool = False
+    prompt: str = ''
+    mode: str = ''
+    provider: str = 'zai'
+    latency_budget_ms: Optional[float] = None
+    tier: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict[str, Any]]) -> 'TypeRequest':
+        """Build a request from the decoded JSON body."""
+        data = data or {}
+        return cls(
+            text=data.get('text', ''),
+            auto_submit=data.get('auto_submit', False),  # 获取自动提交参数
+            # AI处理相关参数
+            prompt=data.get('prompt', ''),
+            mode=data.get('mode', ''),
+            provider=data.get('provider', 'zai'),
+            latency_budget_ms=_optional_number(data.get('latency_budget_ms')),  # 可选：延迟预算，用于选择快速模型
+            tier=data.get('tier'),  # 可选：'fast' 或 'large'
+        )
+
+
+# Progress callback: on_event(stage, fields). Stages are 'queued', 'ai_started',
+# 'ai_done', 'pasted', 'submitted' and 'error'. It may be called from the AI or
+# injection loop threads, so implementations must be thread-safe.
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def _emit(on_event: Optional[EventCallback], stage: str, **fields):
+    if on_event is None:
+        return
+    try:
+        on_event(stage, fields)
+    except Exception as e:
+        print(f"  ⚠ 进度事件发送失败: {e}")
+
+
+def http_status(response: Dict[str, Any]) -> Tuple[int, Dict[str, str]]:
+    """HTTP status and extra headers for a handler response.
+
+    Adds Server-Timing / X-Request-ID from the request trace, and 503 with
+    Retry-After when the request was shed under load.
+    """
+    headers = {}
+    if response.get('timings'):
+        headers['Server-Timing'] = server_timing_header(response['timings'])
+    if response.get('trace_id'):
+        headers['X-Request-ID'] = response['trace_id']
+    if response.get('overloaded'):
+        headers['Retry-After'] = str(response.get('retry_after', 1))
+        return 503, headers
+    return 200, headers
+
+
+def _adapter_method(adapter) -> str:
+    """Label for the tool an adapter uses (first available method)."""
+    try:
+        if hasattr(adapter, 'get_preferred_tool'):
+            return adapter.get_preferred_tool() or 'none'
+        methods = adapter.get_available_methods()
+        return methods[0] if methods else 'none'
+    except Exception:
+        return 'unknown'
+
+
+def _observe_step(trace: Optional[RequestTrace], step: str, method: str, started: float):
+    ended = time.monotonic()
+    metrics.INJECTION_STEP_SECONDS.labels(step, method).observe(ended - started)
+    if trace is not None:
+        trace.record(step, started, ended)
+
+
+def default_site_dir() -> str:
+    """Project site/ directory (src/../site)."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(os.path.dirname(src_dir), 'site')
+
+
+def _metric_label(value: Any, known: Iterable[str]) -> str:
+    """Metric label for a client-supplied value.
+
+    Labels are limited to the known values so clients cannot create
+    arbitrary time series: empty values become 'none', anything else
+    that is not known becomes 'other'.
+    """
+    if not value:
+        return 'none'
+    if isinstance(value, str) and value in known:
+        return value
+    return 'other'
+
+
+def _preview(text: str) -> str:
+    """只显示前50个字符"""
+    return text[:50] + "..." if len(text) > 50 else text
+
+
+class TypeHandler:
+    """Runs the /type flow against the platform adapters and AI service."""
+
+    def __init__(self, platform_adapters=None, processing_service=None,
+                 injection_loop: Optional[InjectionLoop] = None):
+        """Initialize handler.
+
+        Args:
+            platform_adapters: Adapter bundle from AdapterFactory (may be set later).
+            processing_service: ProcessingService instance or None.
+            injection_loop: Loop that owns all adapter work (defaults to the
+                shared injection loop).
+        """
+        self.platform_adapters = platform_adapters
+        self.processing_service = processing_service
+        # StartupOrchestrator filling in the attributes above in the background
+        self.startup = None
+        self.injection_loop = injection_loop or get_injection_loop()
+        self.scheduler = RequestScheduler(self.injection_loop)
+        self.idempotency = IdempotencyCache()
+        self.admission = AdmissionController(self.scheduler)
+
+    async def handle(self, data: Optional[Dict[str, Any]], client_ip: str = 'unknown',
+                     on_event: Optional[EventCallback] = None,
+                     idempotency_key: Optional[str] = None,
+                     trace_id: Optional[str] = None) -> Dict[str, Any]:
+        """处理文本输入请求，支持AI处理
+
+        Args:
+            data: Decoded JSON body.
+            client_ip: Remote address for logging.
+            on_event: Optional progress callback (see EventCallback).
+            idempotency_key: Idempotency-Key header value; the body's
+                idempotency_key field is used when absent.
+            trace_id: X-Request-ID header value; the body's trace_id field
+                is used when absent, a random id otherwise.
+
+        Returns:
+            JSON-serializable response dict with 'trace_id' and 'timings'
+            (milliseconds per stage). Duplicates of an earlier request get
+            its response with 'duplicate': True.
+        """
+        if isinstance(data, dict):
+            idempotency_key = idempotency_key or data.get('idempotency_key')
+            trace_id = trace_id or data.get('trace_id')
+        trace = RequestTrace(trace_id)
+        if not idempotency_key:
+            return await self._handle(data, client_ip, on_event, trace)
+
+        owner, future = self.idempotency.begin(str(idempotency_key))
+        if not owner:
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+            print(f"\n[{timestamp}] 收到来自 {client_ip} 的重复请求，返回已有结果")
+            metrics.IDEMPOTENCY_HITS.inc()
+            response = await asyncio.shield(asyncio.wrap_future(future))
+            return {**response, 'duplicate': True}
+
+        response = {'success': False}
+        try:
+            response = await self._handle(data, client_ip, on_event, trace)
+        finally:
+            self.idempotency.finish(str(idempotency_key), response)
+        return response
+
+    async def _handle(self, data: Optional[Dict[str, Any]], client_ip: str,
+                      on_event: Optional[EventCallback], trace: RequestTrace) -> Dict[str, Any]:
+        ticket = None
+        mode_label, provider_label = 'none', 'none'
+        try:
+            # 记录接收到的请求
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+            print(f"\n[{timestamp}] 收到来自 {client_ip} 的请求 (trace {trace.trace_id})")
+
+            req = TypeRequest.from_json(data)
+
+            # 输出要发送的文本（只显示前50个字符）
+            print(f"  要输入的文本: {_preview(req.text)}")
+            print(f"  文本长度: {len(req.text)} 字符")
+            if req.auto_submit:
+                print("  勇敢模式: 开启 (将自动发送 Ctrl+Enter)")
+            if req.mode:
+                print(f"  AI处理模式: {req.mode}")
+
+            if req.prompt or req.mode:
+                # 多阶段模式需要 AI 服务来判断
+                await self.wait_for_startup('ai_service')
+            ai_requested = self.wants_ai(req)
+            mode_label = self.mode_label(req)
+            provider_label = self.provider_label(req) if ai_requested else 'none'
+
+            # 准入控制：积压过多时快速拒绝或降级为直接粘贴
+            decision = self.admission.check(ai_requested)
+            if decision.action == REJECT:
+                print(f"  ✗ 服务器繁忙 ({decision.reason})，请 {decision.retry_after} 秒后重试")
+                response = {
+                    'success': False,
+                    'error': '服务器繁忙，请稍后重试',
+                    'overloaded': True,
+                    'retry_after': decision.retry_after,
+                }
+            else:
+                degraded = decision.action == DEGRADE and ai_requested
+                if degraded:
+                    print("  ⚠ AI 队列已满，跳过AI处理，直接粘贴原文")
+                    ai_requested = False
+
+                # 按到达顺序领取注入序号；AI 处理有限并发进行，注入严格按序号执行
+                ticket = self.scheduler.reserve()
+                _emit(on_event, 'queued', ticket=ticket, depth=self.scheduler.injection_queue.depth)
+
+                if ai_requested:
+                    trace.begin('ai_wait')
+                    processed_text = await self.scheduler.run_ai(self._ai_stage(req, on_event, trace))
+                else:
+                    processed_text = req.text
+                response = await self.inject(req, processed_text, ai_requested, ticket, on_event, trace)
+
+                if degraded and response.get('success'):
+                    response['degraded'] = True
+                    warning = '服务器繁忙，已跳过AI处理'
+                    response['warning'] = f"{response['warning']} ({warning})" if response.get('warning') else warning
+
+        except Exception as e:
+            print(f"  ✗ 处理请求时发生错误: {e}")
+            import traceback
+            traceback.print_exc()
+            metrics.ERRORS.labels('internal', 'none').inc()
+            response = {'success': False}
+        finally:
+            # 未进入注入阶段的请求放弃序号，避免阻塞后续请求
+            if ticket is not None:
+                self.scheduler.cancel(ticket)
+
+        if response.get('overloaded'):
+            outcome = 'rejected'
+        elif not response.get('success'):
+            outcome = 'error'
+        elif response.get('degraded'):
+            outcome = 'degraded'
+        else:
+            outcome = 'success'
+        metrics.REQUESTS.labels(mode_label, provider_label, outcome).inc()
+        metrics.REQUEST_SECONDS.labels(mode_label, provider_label).observe(time.monotonic() - trace.started)
+
+        response['trace_id'] = trace.trace_id
+        response['timings'] = trace.timings()
+
+        if not response.get('success'):
+            _emit(on_event, 'error', error=response.get('error', ''))
+        return response
+
+    async def wait_for_startup(self, stage: str):
+        """Wait for a background startup stage (no-op once it is done or without an orchestrator)."""
+        if self.startup is not None and not self.startup.done(stage):
+            print(f"  等待启动阶段 {stage} 完成...")
+            await self.startup.wait(stage)
+
+    def mode_label(self, req: TypeRequest) -> str:
+        """Metric label for the request's mode (a mode from prompts.json or 'other')."""
+        service = self.processing_service
+        return _metric_label(req.mode, service.modes.list_modes() if service else ())
+
+    def provider_label(self, req: TypeRequest) -> str:
+        """Metric label for the request's provider (a registered provider or 'other')."""
+        service = self.processing_service
+        return _metric_label(req.provider, service.processors if service else ())
+
+    def wants_ai(self, req: TypeRequest) -> bool:
+        """AI处理逻辑（多阶段模式没有单独的 prompt，由服务端根据 mode 解析）"""
+        service = self.processing_service
+        return bool(req.prompt) or bool(service and service.is_pipeline_mode(req.mode))
+
+    async def _ai_stage(self, req: TypeRequest, on_event: Optional[EventCallback],
+                        trace: Optional[RequestTrace] = None) -> str:
+        _emit(on_event, 'ai_started')
+        started = time.monotonic()
+        if trace is not None:
+            trace.end('ai_wait')
+        processed_text = await self.run_ai(req)
+        elapsed = time.monotonic() - started
+        if trace is not None:
+            trace.record('ai', started)
+        self.admission.record_ai(elapsed)
+        metrics.AI_SECONDS.labels(self.mode_label(req), self.provider_label(req)).observe(elapsed)
+        _emit(on_event, 'ai_done', processed_length=len(processed_text))
+        return processed_text
+
+    async def run_ai(self, req: TypeRequest) -> str:
+        """Run AI processing, falling back to the original text on failure."""
+        if not self.processing_service:
+            return req.text
+
+        print(f"  正在使用AI处理文本...")
+        try:
+            result = await self.processing_service.process(
+                text=req.text,
+                prompt=req.prompt,
+                provider=req.provider,
+                mode=req.mode,
+                latency_budget_ms=req.latency_budget_ms,
+                tier=req.tier
+            )
+            if result is not None:
+                # 显示处理后的文本（只显示前50个字符）
+                print(f"  ✓ AI处理成功: {_preview(result)}")
+                return result
+            print("  ⚠ AI处理失败，使用原始文本")
+        except Exception as e:
+            print(f"  ✗ AI处理出错: {e}")
+            print("  继续使用原始文本")
+        metrics.ERRORS.labels('ai', self.provider_label(req)).inc()
+        return req.text
+
+    async def inject(self, req: TypeRequest, processed_text: str, ai_requested: bool,
+                     ticket: Optional[int] = None,
+                     on_event: Optional[EventCallback] = None,
+                     trace: Optional[RequestTrace] = None) -> Dict[str, Any]:
+        """Copy to clipboard, paste, notify and optionally submit.
+
+        The adapter sequence runs on the injection loop in ticket order; it
+        is shielded so a dropped client connection cannot interrupt a
+        half-finished paste.
+
+        Args:
+            req: Parsed request.
+            processed_text: Text to inject.
+            ai_requested: Whether AI processing was requested.
+            ticket: Sequence ticket from the injection queue (reserved now if None).
+            on_event: Optional progress callback.
+            trace: Request trace receiving the step timings.
+        """
+        if ticket is None:
+            ticket = self.scheduler.reserve()
+        if trace is not None:
+            trace.begin('queue')
+        return await self.scheduler.inject(
+            ticket, self._timed_inject(req, processed_text, ai_requested, on_event, trace))
+
+    async def _timed_inject(self, req: TypeRequest, processed_text: str, ai_requested: bool,
+                            on_event: Optional[EventCallback],
+                            trace: Optional[RequestTrace]) -> Dict[str, Any]:
+        if trace is not None:
+            trace.end('queue')
+        started = time.monotonic()
+        try:
+            return await self._inject(req, processed_text, ai_requested, on_event, trace)
+        finally:
+            self.admission.record_injection(time.monotonic() - started)
+
+    async def _inject(self, req: TypeRequest, processed_text: str, ai_requested: bool,
+                      on_event: Optional[EventCallback] = None,
+                      trace: Optional[RequestTrace] = None) -> Dict[str, Any]:
+        if not processed_text:
+            print("  ⚠ 警告: 接收到空文本")
+            return {'success': False, 'error': '接收到空文本'}
+
+        await self.wait_for_startup('adapters')
+        platform_adapters = self.platform_adapters
+        if not platform_adapters:
+            print("  ✗ 错误: 平台适配器未初始化")
+            return {'success': False, 'error': '平台适配器未初始化'}
+
+        clipboard_method = _adapter_method(platform_adapters.clipboard)
+        keyboard_method = _adapter_method(platform_adapters.keyboard)
+
+        print("  正在执行剪贴板操作...")
+        # 使用平台适配器复制到剪贴板
+        started = time.monotonic()
+        success = await platform_adapters.clipboard.copy_text(processed_text)
+        _observe_step(trace, 'clipboard', clipboard_method, started)
+        if not success:
+            print("  ✗ 剪贴板操作失败")
+            metrics.ERRORS.labels('clipboard', clipboard_method).inc()
+            error_msg = '剪贴板操作失败'
+            if ai_requested:
+                error_msg += ' (AI处理已完成)'
+            return {'success': False, 'error': error_msg}
+
+        print("  ✓ 剪贴板操作成功")
+        print("  正在发送粘贴命令...")
+        # 等待剪贴板操作完成
+        started = time.monotonic()
+        await asyncio.sleep(0.1)
+        if trace is not None:
+            trace.record('clipboard_settle', started)
+
+        # 使用平台适配器发送粘贴命令
+        started = time.monotonic()
+        success = await platform_adapters.keyboard.send_paste_command()
+        _observe_step(trace, 'paste', keyboard_method, started)
+        if not success:
+            # 如果键盘模拟失败，返回警告
+            print("  ⚠ 键盘模拟失败，需要手动粘贴")
+            metrics.ERRORS.labels('paste', keyboard_method).inc()
+            response = {'success': True, 'warning': '已复制到剪贴板，请手动粘贴'}
+            if ai_requested:
+                response['warning'] += ' (AI处理已完成)'
+            return response
+
+        print("  ✓ 键盘模拟成功")
+        _emit(on_event, 'pasted')
+        started = time.monotonic()
+        if await self._play_notification() is not None:
+            _observe_step(trace, 'sound', 'notifications', started)
+
+        # 如果开启勇敢模式，发送 Ctrl+Enter
+        if req.auto_submit:
+            print("  正在发送 Ctrl+Enter...")
+            # 等待粘贴完成
+            started = time.monotonic()
+            await asyncio.sleep(0.1)
+            if trace is not None:
+                trace.record('paste_settle', started)
+            # 发送 Ctrl+Enter
+            started = time.monotonic()
+            ctrl_enter_success = await platform_adapters.keyboard.send_ctrl_enter()
+            _observe_step(trace, 'ctrl_enter', keyboard_method, started)
+            if ctrl_enter_success:
+                print("  ✓ Ctrl+Enter 发送成功")
+                _emit(on_event, 'submitted')
+            else:
+                print("  ⚠ Ctrl+Enter 发送失败，文本已粘贴")
+                metrics.ERRORS.labels('ctrl_enter', keyboard_method).inc()
+
+        response = {'success': True}
+        # 如果进行了AI处理，添加相关信息
+        if ai_requested and processed_text != req.text:
+            response['ai_processed'] = True
+            response['original_length'] = len(req.text)
+            response['processed_length'] = len(processed_text)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler (AI stage, injection queue) and AI processing statistics."""
+        stats = self.scheduler.stats()
+        stats['admission'] = self.admission.stats()
+        stats['idempotency'] = {'cached': len(self.idempotency), 'duplicates': self.idempotency.hits}
+        if self.processing_service:
+            stats['ai'] = self.processing_service.get_stats()
+        return stats
+
+    async def _play_notification(self) -> Optional[bool]:
+        """播放提示音（如果启用）
+
+        Returns:
+            Whether the sound played, or None if no sound was attempted.
+        """
+        platform_adapters = self.platform_adapters
+        try:
+            # 检查是否禁用了声音提示
+            from config import get_config
+            sound_enabled = get_config('SOUND_NOTIFICATIONS', 'true').lower() == 'true'
+
+            if sound_enabled:
+                print("  声音提示已启用，正在播放...")
+                if hasattr(platform_adapters, 'notifications') and platform_adapters.notifications:
+                    success = await platform_adapters.notifications.play_notification_sound()
+                    if success:
+                        print("  ✓ 提示音播放成功")
+                    else:
+                        print("  ⚠ 提示音播放失败")
+                        metrics.ERRORS.labels('sound', 'notifications').inc()
+                    return bool(success)
+                else:
+                    print("  ⚠ 通知适配器未初始化")
+            else:
+                print("  声音提示已禁用")
+        except Exception as e:
+            print(f"  ✗ 播放提示音异常: {e}")
+            metrics.ERRORS.labels('sound', 'notifications').inc()
+            return False
+        return None
@@ -0,0 +1,117 @@
+"""
+Flask development server front-end.
+
+Werkzeug's threaded development server starts a thread per request and
+Flask runs every async view on a fresh event loop; it is kept for
+debugging (AIPUT_SERVER_MODE=dev). Production serving uses aiohttp_app.
+"""
+
+import logging
+import socket
+import threading
+from typing import Optional
+
+from flask import Flask, Response, abort, request
+
+from server import metrics
+from server.activation import ActivityTracker
+from server.assets import AssetBundle
+from server.core import TypeHandler, http_status
+from server.sync import sync_batch
+
+
+def create_flask_app(handler: TypeHandler, site_dir: str, activity: Optional[ActivityTracker] = None) -> Flask:
+    """Create the Flask app exposing the mobile site and /type.
+
+    Args:
+        handler: Shared request handler.
+        site_dir: Directory containing index.html, app.js, style.css and config/.
+        activity: Records request activity for idle shutdown.
+
+    Returns:
+        Flask application.
+    """
+    app = Flask(__name__, static_folder=None)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    # 开发服务器：文件修改后自动重新生成
+    assets = AssetBundle(site_dir, auto_reload=True)
+
+    if activity is not None:
+        app.before_request(activity.begin)
+        app.teardown_request(lambda exc: activity.end())
+
+    def serve_asset(path):
+        result = assets.respond(path, request.headers.get('Accept-Encoding'),
+                                request.headers.get('If-None-Match'))
+        if result is None:
+            abort(404)
+        status, headers, body = result
+        return Response(body, status=status, headers=headers)
+
+    @app.route('/')
+    def index():
+        return serve_asset('index.html')
+
+    @app.route('/static/<path:path>')
+    def static(path):
+        return serve_asset(path)
+
+    @app.route('/sw.js')
+    def service_worker():
+        return serve_asset('sw.js')
+
+    @app.route('/type', methods=['POST'])
+    async def type_text():
+        """处理文本输入请求，支持AI处理"""
+        # 获取客户端IP地址
+        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
+        idempotency_key = request.headers.get('Idempotency-Key')
+        response = await handler.handle(request.get_json(silent=True), client_ip, idempotency_key=idempotency_key,
+                                        trace_id=request.headers.get('X-Request-ID'))
+        status, headers = http_status(response)
+        return response, status, headers
+
+    @app.route('/sync', methods=['POST'])
+    async def sync():
+        """批量处理手机端离线发件箱"""
+        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
+        status, response = await sync_batch(handler, request.get_json(silent=True), client_ip)
+        return response, status
+
+    @app.route('/stats')
+    def stats():
+        return handler.get_stats()
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return metrics.REGISTRY.render(), 200, {'Content-Type': metrics.CONTENT_TYPE}
+
+    return app
+
+
+class DevServer:
+    """Threaded Werkzeug development server with the same interface as ProductionServer."""
+
+    def __init__(self, handler: TypeHandler, site_dir: str):
+        self.activity = ActivityTracker()
+        self.app = create_flask_app(handler, site_dir, self.activity)
+        self._server = None
+        self._thread = None
+
+    def start(self, host: str, port: int, sock: Optional[socket.socket] = None):
+        """Bind (or use the inherited `sock`) and serve in a daemon thread.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        from werkzeug.serving import make_server
+        fd = sock.fileno() if sock is not None else None
+        self._server = make_server(host, port, self.app, threaded=True, fd=fd)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='aiput-http-dev', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving."""
+        if self._server:
+            self._server.shutdown()
+            self._server = None
@@ -0,0 +1,80 @@
+"""
+Idempotency keys for /type submissions.
+
+A client attaches a key to each logical submission and reuses it for
+retries (network errors, double taps, the "send original text?"
+fallback). The first request with a key runs; concurrent duplicates wait
+for its outcome and later duplicates get the cached response, so the
+same content is never pasted twice. Only successful outcomes are cached:
+after a failure the key is released and a retry runs again.
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class IdempotencyCache:
+    """Thread-safe LRU/TTL table of recent keys and their final responses."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """Initialize cache.
+
+        Args:
+            max_entries: Completed keys kept (default: AIPUT_IDEMPOTENCY_MAX_ENTRIES or 512).
+            ttl: Seconds a completed key is remembered (default: AIPUT_IDEMPOTENCY_TTL or 600).
+        """
+        self.max_entries = max_entries or int(os.environ.get('AIPUT_IDEMPOTENCY_MAX_ENTRIES', '512'))
+        self.ttl = ttl if ttl is not None else float(os.environ.get('AIPUT_IDEMPOTENCY_TTL', '600'))
+        self._lock = threading.Lock()
+        self._completed: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self.hits = 0
+
+    def begin(self, key: str) -> Tuple[bool, concurrent.futures.Future]:
+        """Claim a key.
+
+        Returns:
+            (owner, future). The owner runs the request and must call
+            finish(); everyone else awaits the future for the owner's
+            response.
+        """
+        with self._lock:
+            entry = self._completed.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > time.monotonic():
+                    self._completed.move_to_end(key)
+                    self.hits += 1
+                    future = concurrent.futures.Future()
+                    future.set_result(response)
+                    return False, future
+                del self._completed[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.hits += 1
+                return False, future
+
+            future = concurrent.futures.Future()
+            self._in_flight[key] = future
+            return True, future
+
+    def finish(self, key: str, response: Dict[str, Any]):
+        """Publish the owner's response and cache it if it succeeded."""
+        with self._lock:
+            future = self._in_flight.pop(key, None)
+            if response.get('success'):
+                self._completed[key] = (time.monotonic() + self.ttl, response)
+                self._completed.move_to_end(key)
+                while len(self._completed) > self.max_entries:
+                    self._completed.popitem(last=False)
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._completed)
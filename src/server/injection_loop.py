@@ -0,0 +1,135 @@
+"""
+Persistent event loop owning all platform adapter work.
+
+Clipboard, keyboard and keep-alive coroutines are submitted from any
+thread (HTTP server loop, GUI thread, ...) and run on this one
+long-lived loop, so adapters can keep asyncio resources such as locks,
+subprocess handles and sessions across requests.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+
+class InjectionLoop:
+    """A dedicated asyncio loop running in a daemon thread."""
+
+    def __init__(self, name: str = 'aiput-injection'):
+        """Initialize loop (the thread starts on first use).
+
+        Args:
+            name: Thread name.
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on demand."""
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, args=(self._loop,),
+                                                name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the injection loop thread itself."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the injection loop.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result. From
+            asyncio code, await it with asyncio.wrap_future().
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the injection loop and block for its result.
+
+        Intended for synchronous callers such as the GUI thread; must not
+        be called from the injection loop thread.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError('InjectionLoop.run() called from the injection loop thread')
+        return self.submit(coro).result(timeout)
+
+    def run_periodic(self, func: Callable[[], Awaitable[Any]], interval: float,
+                     run_immediately: bool = True) -> concurrent.futures.Future:
+        """Call an async function every `interval` seconds on the loop.
+
+        Args:
+            func: Coroutine function taking no arguments.
+            interval: Seconds between calls.
+            run_immediately: Call once right away before the first wait.
+
+        Returns:
+            Future of the periodic task; cancel() it to stop.
+        """
+        async def periodic():
+            if run_immediately:
+                await func()
+            while True:
+                await asyncio.sleep(interval)
+                await func()
+
+        return self.submit(periodic())
+
+    def stop(self, timeout: float = 5):
+        """Cancel pending tasks and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        async def cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+
+_injection_loop: Optional[InjectionLoop] = None
+_injection_loop_lock = threading.Lock()
+
+
+def get_injection_loop() -> InjectionLoop:
+    """Process-wide injection loop shared by all front-ends."""
+    global _injection_loop
+    with _injection_loop_lock:
+        if _injection_loop is None:
+            _injection_loop = InjectionLoop()
+        return _injection_loop
@@ -0,0 +1,159 @@
+"""
+Ordered single-consumer injection queue.
+
+Each /type request reserves a sequence ticket when it arrives. AI
+processing still runs concurrently, but the clipboard → paste → submit
+sequences are executed one at a time, strictly in ticket order, by a
+single consumer task on the injection loop. A request that fails before
+reaching the injection stage cancels its ticket so later ones are not
+held up.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Coroutine, Dict, Optional
+
+from server.injection_loop import InjectionLoop, get_injection_loop
+from server import metrics
+
+
+class InjectionQueue:
+    """FIFO of injection jobs keyed by arrival sequence number."""
+
+    def __init__(self, injection_loop: Optional[InjectionLoop] = None, history: int = 256):
+        """Initialize queue.
+
+        Args:
+            injection_loop: Loop the consumer runs on (defaults to the shared one).
+            history: Number of recent wait times kept for stats.
+        """
+        self.injection_loop = injection_loop or get_injection_loop()
+        self._lock = threading.Lock()
+        self._next_ticket = 0
+        self._arrivals: Dict[int, float] = {}
+
+        # Consumer state, only touched on the injection loop
+        self._serving = 0
+        self._ready: Dict[int, tuple] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+        self._order_waits = deque(maxlen=history)
+        self._queue_waits = deque(maxlen=history)
+        self.processed = 0
+        self.skipped = 0
+
+    def reserve(self) -> int:
+        """Reserve the next sequence ticket (call when the request arrives)."""
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._arrivals[ticket] = time.monotonic()
+            return ticket
+
+    async def run(self, ticket: int, coro: Coroutine) -> Any:
+        """Run `coro` on the injection loop once every earlier ticket is done.
+
+        Can be awaited from any event loop. The job is shielded: cancelling
+        the caller does not interrupt an injection that already started.
+        """
+        future = self.injection_loop.submit(self._enqueue(ticket, coro))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def cancel(self, ticket: int):
+        """Give up a ticket so the queue moves past it.
+
+        Safe to call from any thread and for tickets that were already
+        enqueued or served; those are left alone.
+        """
+        self.injection_loop.loop.call_soon_threadsafe(self._skip, ticket)
+
+    async def _enqueue(self, ticket: int, coro: Coroutine) -> Any:
+        done = asyncio.get_running_loop().create_future()
+        self._ready[ticket] = (coro, done, time.monotonic())
+        self._wake()
+        return await done
+
+    def _skip(self, ticket: int):
+        if ticket < self._serving or ticket in self._ready:
+            return
+        self._ready[ticket] = (None, None, time.monotonic())
+        self._wake()
+
+    def _wake(self):
+        if self._consumer is None or self._consumer.done():
+            # (Re)start the consumer, e.g. after the injection loop was restarted
+            self._wakeup = asyncio.Event()
+            self._consumer = asyncio.get_running_loop().create_task(self._consume())
+        self._wakeup.set()
+
+    async def _consume(self):
+        """Single consumer: run ready jobs strictly in ticket order."""
+        while True:
+            item = self._ready.pop(self._serving, None)
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            ticket = self._serving
+            self._serving += 1
+            with self._lock:
+                arrived = self._arrivals.pop(ticket, None)
+
+            coro, done, ready_at = item
+            if coro is None:
+                self.skipped += 1
+                continue
+
+            started = time.monotonic()
+            # 等待前面的请求完成注入的时间，以及从到达到开始注入的总时间
+            self._order_waits.append(started - ready_at)
+            if arrived is not None:
+                self._queue_waits.append(started - arrived)
+                metrics.QUEUE_WAIT_SECONDS.observe(started - arrived)
+
+            try:
+                result = await coro
+            except Exception as e:
+                if not done.done():
+                    done.set_exception(e)
+            else:
+                if not done.done():
+                    done.set_result(result)
+            self.processed += 1
+
+    @property
+    def pending(self) -> int:
+        """Requests that have arrived and whose injection has not finished yet."""
+        with self._lock:
+            return self._next_ticket - self.processed - self.skipped
+
+    @property
+    def depth(self) -> int:
+        """Requests that have arrived but whose injection has not started yet."""
+        with self._lock:
+            return len(self._arrivals)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time statistics (milliseconds)."""
+        order_waits = list(self._order_waits)
+        queue_waits = list(self._queue_waits)
+
+        def summary(values):
+            if not values:
+                return {'avg_ms': 0.0, 'max_ms': 0.0}
+            return {
+                'avg_ms': round(sum(values) / len(values) * 1000, 2),
+                'max_ms': round(max(values) * 1000, 2),
+            }
+
+        return {
+            'depth': self.depth,
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'order_wait': summary(order_waits),
+            'queue_wait': summary(queue_waits),
+        }
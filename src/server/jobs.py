@@ -0,0 +1,202 @@
+"""
+Asynchronous job API: POST /jobs returns at once, progress streams over SSE.
+
+Jobs live in a bounded in-memory table on the HTTP server loop. Finished
+jobs are evicted after AIPUT_JOB_TTL seconds, or earlier (oldest first)
+when the table holds AIPUT_JOB_MAX_ENTRIES jobs. Every event has a
+sequence id so a client that reconnects with Last-Event-ID resumes
+where it left off.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from server.core import TypeHandler
+
+
+class Job:
+    """One submission and the events it has produced so far."""
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.created = time.monotonic()
+        self.finished: Optional[float] = None
+        self.events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def add_event(self, name: str, data: Dict[str, Any]):
+        """Append an event (call on the owning loop)."""
+        self.events.append((len(self.events) + 1, name, data))
+        self._changed.set()
+
+    def finish(self, result: Dict[str, Any]):
+        self.result = result
+        self.finished = time.monotonic()
+        self.add_event('result', result)
+
+    async def wait_for_events(self, after: int, timeout: float) -> bool:
+        """Wait until there are events after `after` or the job is done."""
+        while len(self.events) <= after and not self.done:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        last_stage = next((data.get('stage') for _, name, data in reversed(self.events) if name == 'stage'), None)
+        return {
+            'job_id': self.id,
+            'done': self.done,
+            'stage': last_stage,
+            'result': self.result,
+        }
+
+
+class JobStore:
+    """Bounded, TTL-evicting table of jobs owned by one event loop."""
+
+    def __init__(self, type_handler: TypeHandler, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        """Initialize store.
+
+        Args:
+            type_handler: Shared request handler that runs the jobs.
+            max_entries: Maximum jobs kept (default: AIPUT_JOB_MAX_ENTRIES or 256).
+            ttl: Seconds a finished job is kept (default: AIPUT_JOB_TTL or 600).
+        """
+        self.type_handler = type_handler
+        self.max_entries = max_entries or int(os.environ.get('AIPUT_JOB_MAX_ENTRIES', '256'))
+        self.ttl = ttl if ttl is not None else float(os.environ.get('AIPUT_JOB_TTL', '600'))
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def expire(self):
+        """Drop finished jobs older than the TTL."""
+        now = time.monotonic()
+        for job_id in [j.id for j in self._jobs.values() if j.done and now - j.finished > self.ttl]:
+            del self._jobs[job_id]
+
+    def _make_room(self):
+        """Evict the oldest finished jobs until a new one fits."""
+        for job_id in [j.id for j in self._jobs.values() if j.done]:
+            if len(self._jobs) < self.max_entries:
+                break
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.expire()
+        return self._jobs.get(job_id)
+
+    def submit(self, data: Optional[Dict[str, Any]], client_ip: str,
+               idempotency_key: Optional[str] = None,
+               trace_id: Optional[str] = None) -> Optional[Job]:
+        """Create a job and start it on the running loop.
+
+        Returns:
+            The new job, or None if the table is full of unfinished jobs.
+        """
+        self.expire()
+        self._make_room()
+        if len(self._jobs) >= self.max_entries:
+            return None
+
+        loop = asyncio.get_running_loop()
+        job = Job(uuid.uuid4().hex)
+        self._jobs[job.id] = job
+
+        def on_event(stage, fields):
+            # 进度事件可能来自 AI / 注入线程
+            loop.call_soon_threadsafe(job.add_event, 'stage', {'stage': stage, **fields})
+
+        async def run():
+            try:
+                response = await self.type_handler.handle(data, client_ip, on_event=on_event,
+                                                          idempotency_key=idempotency_key,
+                                                          trace_id=trace_id)
+            except Exception as e:
+                response = {'success': False, 'error': str(e)}
+            # 排在此前投递的进度事件之后
+            loop.call_soon_threadsafe(job.finish, response)
+
+        task = loop.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+
+def _last_event_id(request: web.Request) -> int:
+    value = request.headers.get('Last-Event-ID') or request.query.get('last_event_id') or '0'
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+async def create_job(request: web.Request, store: JobStore) -> web.Response:
+    """POST /jobs: start processing and return the job id immediately."""
+    client_ip = request.headers.get('X-Forwarded-For', request.remote or 'unknown')
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+
+    job = store.submit(data, client_ip, request.headers.get('Idempotency-Key'),
+                       request.headers.get('X-Request-ID'))
+    if job is None:
+        return web.json_response({'success': False, 'error': '任务过多，请稍后重试'}, status=503)
+    return web.json_response({'job_id': job.id, 'events': f'/jobs/{job.id}/events'}, status=202)
+
+
+async def job_status(request: web.Request, store: JobStore) -> web.Response:
+    """GET /jobs/{job_id}: current stage and, once done, the result."""
+    job = store.get(request.match_info['job_id'])
+    if job is None:
+        return web.json_response({'success': False, 'error': '任务不存在或已过期'}, status=404)
+    return web.json_response(job.snapshot())
+
+
+async def job_events(request: web.Request, store: JobStore, keepalive: float = 15) -> web.StreamResponse:
+    """GET /jobs/{job_id}/events: Server-Sent Events, resumable via Last-Event-ID."""
+    job = store.get(request.match_info['job_id'])
+    if job is None:
+        return web.json_response({'success': False, 'error': '任务不存在或已过期'}, status=404)
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    await response.prepare(request)
+
+    sent = _last_event_id(request)
+    try:
+        while True:
+            if not await job.wait_for_events(sent, keepalive):
+                await response.write(b': keep-alive\n\n')
+                continue
+            for event_id, name, data in job.events[sent:]:
+                payload = json.dumps(data, ensure_ascii=False)
+                await response.write(f'id: {event_id}\nevent: {name}\ndata: {payload}\n\n'.encode())
+                sent = event_id
+            if job.done and sent >= len(job.events):
+                break
+    except ConnectionResetError:
+        pass
+    return response
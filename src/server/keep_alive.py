@@ -0,0 +1,63 @@
+"""
+Periodic keep-alive keypress running on the injection loop.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from server.injection_loop import InjectionLoop, get_injection_loop
+
+
+class KeepAliveTask:
+    """Calls keyboard_adapter.keep_alive() periodically on the injection loop."""
+
+    def __init__(self, keyboard_adapter, interval=300, injection_loop: Optional[InjectionLoop] = None):
+        """Initialize keep-alive task.
+
+        Args:
+            keyboard_adapter: Platform keyboard adapter for keep-alive.
+            interval: Trigger interval in seconds (default: 300 = 5 minutes).
+            injection_loop: Loop to run on (defaults to the shared injection loop).
+        """
+        self._keyboard_adapter = keyboard_adapter
+        self._interval = interval
+        self._injection_loop = injection_loop or get_injection_loop()
+        self._future = None
+
+    def start(self):
+        """Start triggering keep-alive (immediately, then every interval)."""
+        if self._future is None:
+            self._future = self._injection_loop.run_periodic(self._trigger_keep_alive, self._interval)
+
+    async def _trigger_keep_alive(self):
+        """Trigger keep-alive action."""
+        try:
+            result = await self._keyboard_adapter.keep_alive()
+            if result:
+                logging.debug("Keep-alive triggered successfully")
+            else:
+                logging.debug("Keep-alive not supported or not needed on this platform")
+        except Exception as e:
+            logging.warning(f"Keep-alive trigger failed: {e}")
+
+    def stop(self):
+        """Stop the keep-alive task."""
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+
+def get_keep_alive_interval():
+    """Get keep-alive interval from environment variable.
+
+    Returns:
+        int: Interval in seconds (default: 300, minimum: 60).
+    """
+    try:
+        interval_str = os.environ.get('AIPUT_KEEP_ALIVE_INTERVAL', '300')
+        interval = int(interval_str)
+        # Minimum 1 minute to prevent too frequent triggers
+        return max(interval, 60)
+    except ValueError:
+        return 300
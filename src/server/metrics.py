@@ -0,0 +1,246 @@
+"""
+Prometheus-compatible metrics (text exposition format 0.0.4).
+
+Recording is meant to be cheap on the hot path: each labeled series
+keeps one preallocated counter array per thread, so observe()/inc()
+take no lock and allocate no containers; the per-thread shards are only
+summed when /metrics is scraped. Shards of threads that have exited are
+folded into a single retired array, so servers that run every request
+on a new thread (the Werkzeug dev server) keep a bounded number of them.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds; covers sub-millisecond keystrokes up to slow multi-stage AI calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Sharded:
+    """One series: per-thread arrays of fixed size, owned by their thread."""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, list]] = []
+        # 已退出线程的计数合并到这里
+        self._retired = [0] * size
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = [0] * self._size
+            with self._lock:
+                self._reap()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+        return shard
+
+    def _reap(self):
+        """Fold the shards of exited threads into the retired totals (lock held)."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                # 线程已结束，不会再写入这个分片
+                for i, value in enumerate(shard):
+                    self._retired[i] += value
+        self._shards = live
+
+    def _totals(self) -> list:
+        with self._lock:
+            self._reap()
+            totals = list(self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1):
+        self._shard()[0] += amount
+
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class _HistogramChild(_Sharded):
+    # Layout: one slot per finite bucket, one for +Inf, then the sum
+    def __init__(self, bounds: Tuple[float, ...]):
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+
+    def observe(self, value: float):
+        shard = self._shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        totals = self._totals()
+        return totals[:-1], totals[-1]
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], _Sharded] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Series for the given label values (created once, then cached)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects labels {self.labelnames}')
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self) -> _Sharded:
+        raise NotImplementedError
+
+    def _series(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        """Increment the unlabeled series."""
+        self.labels().inc(amount)
+
+    def _render_samples(self):
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value())}'
+                for values, child in self._series()]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket bounds."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """Observe into the unlabeled series."""
+        self.labels().observe(value)
+
+    def _render_samples(self):
+        lines = []
+        for values, child in self._series():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Text exposition of every metric."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    'aiput_requests_total', 'Text submissions handled, by outcome.',
+    ('mode', 'provider', 'outcome'))
+REQUEST_SECONDS = REGISTRY.histogram(
+    'aiput_request_duration_seconds', 'End-to-end handling time of a submission.',
+    ('mode', 'provider'))
+AI_SECONDS = REGISTRY.histogram(
+    'aiput_ai_duration_seconds', 'AI processing time (after acquiring an AI slot).',
+    ('mode', 'provider'))
+INJECTION_STEP_SECONDS = REGISTRY.histogram(
+    'aiput_injection_step_seconds', 'Duration of each injection step (clipboard, paste, ctrl_enter, sound).',
+    ('step', 'method'))
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'aiput_injection_queue_wait_seconds', 'Time from arrival until the injection started.')
+IDEMPOTENCY_HITS = REGISTRY.counter(
+    'aiput_idempotency_hits_total', 'Duplicate submissions answered from the idempotency cache.')
+RETRIES = REGISTRY.counter(
+    'aiput_retries_total', 'AI request retries granted by the shared retry budget.')
+RETRY_BUDGET_EXHAUSTED = REGISTRY.counter(
+    'aiput_retry_budget_exhausted_total', 'AI request retries refused because the retry budget was exhausted.')
+ERRORS = REGISTRY.counter(
+    'aiput_errors_total', 'Failures by stage.',
+    ('stage', 'method'))
@@ -0,0 +1,255 @@
+"""
+Live watching of the machine's IPv4 addresses.
+
+On Linux an rtnetlink socket subscribed to RTMGRP_IPV4_IFADDR delivers
+address add/remove notifications from the kernel, so the watcher thread
+sleeps in select() and costs nothing while the network is stable. The
+initial set comes from an RTM_GETADDR dump. Elsewhere (or if netlink is
+unavailable) the address list is re-read every AIPUT_NETWATCH_INTERVAL
+seconds and diffed.
+
+The callback receives the events and the full current address list;
+it runs on the watcher thread.
+"""
+
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# rtnetlink 常量（linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h）
+NETLINK_ROUTE = 0
+RTMGRP_IPV4_IFADDR = 0x10
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_LABEL = 3
+RT_SCOPE_HOST = 254
+
+NLMSG_HEADER = struct.Struct('=IHHII')   # len, type, flags, seq, pid
+IFADDRMSG = struct.Struct('=BBBBI')      # family, prefixlen, flags, scope, index
+RTATTR = struct.Struct('=HH')            # len, type
+
+
+@dataclass(frozen=True)
+class AddressEvent:
+    """One address appearing or disappearing."""
+    added: bool
+    address: str
+    interface: str = ''
+
+
+# on_change(events, addresses)
+ChangeCallback = Callable[[List[AddressEvent], List[str]], None]
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def parse_address_messages(data: bytes) -> Tuple[List[AddressEvent], bool]:
+    """Parse rtnetlink messages.
+
+    Args:
+        data: Bytes from one recv() on a NETLINK_ROUTE socket.
+
+    Returns:
+        (IPv4 address events, whether NLMSG_DONE/NLMSG_ERROR ended a dump).
+        Host-scope (loopback) addresses are skipped.
+    """
+    events = []
+    done = False
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size or offset + length > len(data):
+            break
+        if msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            done = True
+        elif msg_type in (RTM_NEWADDR, RTM_DELADDR):
+            family, _, _, scope, _ = IFADDRMSG.unpack_from(data, offset + NLMSG_HEADER.size)
+            attributes = _parse_attributes(data, offset + NLMSG_HEADER.size + IFADDRMSG.size, offset + length)
+            # 点对点接口上 IFA_ADDRESS 是对端地址，IFA_LOCAL 才是本机地址
+            raw = attributes.get(IFA_LOCAL) or attributes.get(IFA_ADDRESS)
+            if family == socket.AF_INET and scope != RT_SCOPE_HOST and raw and len(raw) == 4:
+                label = attributes.get(IFA_LABEL, b'').split(b'\0', 1)[0].decode(errors='replace')
+                events.append(AddressEvent(msg_type == RTM_NEWADDR, socket.inet_ntoa(raw), label))
+        offset += _align(length)
+    return events, done
+
+
+def _parse_attributes(data: bytes, start: int, end: int) -> Dict[int, bytes]:
+    attributes = {}
+    offset = start
+    while offset + RTATTR.size <= end:
+        length, attr_type = RTATTR.unpack_from(data, offset)
+        if length < RTATTR.size:
+            break
+        attributes[attr_type] = data[offset + RTATTR.size:offset + length]
+        offset += _align(length)
+    return attributes
+
+
+def _dump_request(seq: int) -> bytes:
+    body = IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0)
+    header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), RTM_GETADDR,
+                               NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+    return header + body
+
+
+def _polled_addresses() -> List[str]:
+    from server.network import get_all_ips
+    return [ip for ip in get_all_ips() if not ip.startswith('0.0.0.0') and ip != '127.0.0.1']
+
+
+class AddressWatcher:
+    """Background thread reporting IPv4 address changes."""
+
+    def __init__(self, on_change: ChangeCallback, poll_interval: Optional[float] = None,
+                 use_netlink: Optional[bool] = None):
+        """Initialize watcher.
+
+        Args:
+            on_change: Called with (events, current addresses) after each change,
+                and once with ([], addresses) when the initial list is known.
+            poll_interval: Seconds between checks for the polling fallback
+                (default: AIPUT_NETWATCH_INTERVAL or 10).
+            use_netlink: Force or disable the rtnetlink backend (default: Linux only).
+        """
+        self.on_change = on_change
+        self.poll_interval = poll_interval or float(os.environ.get('AIPUT_NETWATCH_INTERVAL', '10'))
+        self.use_netlink = sys.platform.startswith('linux') if use_netlink is None else use_netlink
+        self.backend: Optional[str] = None
+        self._addresses: Dict[str, str] = {}   # address -> interface
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        # netlink 模式下用于唤醒 select() 的套接字对
+        self._wakeup: Optional[Tuple[socket.socket, socket.socket]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'AddressWatcher':
+        """Start watching on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='aiput-netwatch', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self._stopped.set()
+        wakeup = self._wakeup
+        if wakeup is not None:
+            try:
+                wakeup[1].send(b'x')
+            except OSError:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    def addresses(self) -> List[str]:
+        """Current IPv4 addresses (loopback excluded)."""
+        with self._lock:
+            return list(self._addresses)
+
+    def _run(self):
+        if self.use_netlink:
+            try:
+                self._watch_netlink()
+                return
+            except OSError as e:
+                print(f"⚠ 无法使用 netlink 监听网络变化，改为定时检查: {e}")
+        self._watch_polling()
+
+    def _apply(self, events: Iterable[AddressEvent], initial: bool = False):
+        """Update the address table and report the effective changes."""
+        changes = []
+        with self._lock:
+            for event in events:
+                if event.added and event.address not in self._addresses:
+                    self._addresses[event.address] = event.interface
+                    changes.append(event)
+                elif not event.added and event.address in self._addresses:
+                    del self._addresses[event.address]
+                    changes.append(event)
+            addresses = list(self._addresses)
+        if changes or initial:
+            try:
+                self.on_change([] if initial else changes, addresses)
+            except Exception as e:
+                print(f"⚠ 处理网络地址变化失败: {e}")
+
+    def _watch_netlink(self):
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE) as sock:
+            # 先订阅再导出当前地址，两者之间发生的变化不会丢失
+            sock.bind((0, RTMGRP_IPV4_IFADDR))
+            sock.send(_dump_request(1))
+            self.backend = 'netlink'
+
+            initial = []
+            while True:
+                events, done = parse_address_messages(sock.recv(65536))
+                initial.extend(events)
+                if done:
+                    break
+            self._apply(initial, initial=True)
+
+            self._wakeup = socket.socketpair()
+            try:
+                self._select_netlink(sock)
+            finally:
+                for end in self._wakeup:
+                    end.close()
+                self._wakeup = None
+
+    def _select_netlink(self, sock: socket.socket):
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            selector.register(self._wakeup[0], selectors.EVENT_READ)
+            while not self._stopped.is_set():
+                for key, _ in selector.select():
+                    if key.fileobj is not sock:
+                        return
+                    try:
+                        data = sock.recv(65536)
+                    except OSError as e:
+                        # ENOBUFS：通知过多被丢弃，重新导出完整列表
+                        print(f"⚠ netlink 接收失败，重新读取地址列表: {e}")
+                        self._resync_netlink()
+                        continue
+                    self._apply(parse_address_messages(data)[0])
+
+    def _resync_netlink(self):
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE) as sock:
+            sock.send(_dump_request(2))
+            current = []
+            while True:
+                events, done = parse_address_messages(sock.recv(65536))
+                current.extend(events)
+                if done:
+                    break
+        self._replace({event.address: event.interface for event in current})
+
+    def _replace(self, current: Dict[str, str]):
+        with self._lock:
+            known = dict(self._addresses)
+        events = [AddressEvent(False, address, interface) for address, interface in known.items()
+                  if address not in current]
+        events += [AddressEvent(True, address, interface) for address, interface in current.items()
+                   if address not in known]
+        self._apply(events)
+
+    def _watch_polling(self):
+        self.backend = 'poll'
+        self._apply([AddressEvent(True, address) for address in _polled_addresses()], initial=True)
+        while not self._stopped.wait(self.poll_interval):
+            self._replace({address: '' for address in _polled_addresses()})
@@ -0,0 +1,98 @@
+"""
+Local address discovery for the listen address and the phone QR code.
+"""
+
+import socket
+
+
+def get_host_ip():
+    """获取主要的本机 IP 地址"""
+    s = None
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(('8.8.8.8', 80))
+        ip = s.getsockname()[0]
+    except Exception:
+        ip = '127.0.0.1'
+    finally:
+        if s is not None:
+            s.close()
+    return ip
+
+
+def get_all_ips():
+    """获取所有可用的本机 IP 地址"""
+    ips = []
+    try:
+        hostname = socket.gethostname()
+        addrs = socket.getaddrinfo(hostname, None)
+        for addr in addrs:
+            ip = addr[4][0]
+            if ':' not in ip and ip != '127.0.0.1':
+                if ip not in ips:
+                    ips.append(ip)
+    except Exception:
+        pass
+    return order_ips(ips)
+
+
+def order_ips(ips):
+    """按优先级排序本机 IP 地址，并在最前面加入 0.0.0.0 选项
+
+    Args:
+        ips: IPv4 addresses (without 127.0.0.1).
+
+    Returns:
+        List for the listen-address selector.
+    """
+    ips = list(ips)
+    if not ips:
+        ips.append('127.0.0.1')
+
+    # 排序逻辑
+    priority_192 = []
+    priority_10 = []
+    other_ips = []
+    virtual_ips = []
+
+    for ip in ips:
+        if ip.startswith('192.168.'):
+            priority_192.append(ip)
+        elif ip.startswith('10.'):
+            priority_10.append(ip)
+        elif ip.startswith('172.'):
+            parts = ip.split('.')
+            if len(parts) >= 2:
+                second = int(parts[1])
+                if 16 <= second <= 31:
+                    virtual_ips.append(ip)
+                else:
+                    other_ips.append(ip)
+        elif ip.startswith('198.18.'):
+            virtual_ips.append(ip)
+        else:
+            other_ips.append(ip)
+
+    ips = priority_192 + priority_10 + other_ips + virtual_ips
+
+    main_ip = get_host_ip()
+    if main_ip in ips:
+        ips.remove(main_ip)
+        if main_ip.startswith('192.168.'):
+            insert_pos = 0
+        elif main_ip.startswith('10.'):
+            insert_pos = len(priority_192)
+        else:
+            insert_pos = len(priority_192) + len(priority_10)
+        ips.insert(insert_pos, main_ip)
+
+    ips.insert(0, '0.0.0.0 (所有网卡)')
+    return ips
+
+
+def get_qr_ips(all_ips=None):
+    """获取用于二维码的 IP 地址（排除 0.0.0.0）"""
+    all_ips = all_ips if all_ips is not None else get_all_ips()
+    # 移除 0.0.0.0 选项
+    qr_ips = [ip for ip in all_ips if not ip.startswith('0.0.0.0')]
+    return qr_ips
@@ -0,0 +1,104 @@
+"""
+Two-stage request scheduler.
+
+Stage 1 (AI) runs on its own persistent loop with bounded parallelism;
+stage 2 (clipboard/keyboard injection) consumes finished results
+strictly in arrival order through the InjectionQueue. Request N+1's
+model call therefore overlaps request N's paste, and a burst of short
+messages is bounded by the slower stage rather than the sum of both.
+"""
+
+import asyncio
+import os
+from typing import Any, Coroutine, Dict, Optional
+
+from server.injection_loop import InjectionLoop, get_injection_loop
+from server.injection_queue import InjectionQueue
+
+
+class RequestScheduler:
+    """Runs the AI stage with bounded parallelism and the injection stage in order."""
+
+    def __init__(self, injection_loop: Optional[InjectionLoop] = None,
+                 max_ai_concurrency: Optional[int] = None,
+                 ai_loop: Optional[InjectionLoop] = None):
+        """Initialize scheduler.
+
+        Args:
+            injection_loop: Loop for the injection stage (defaults to the shared one).
+            max_ai_concurrency: AI requests in flight at once
+                (default: AIPUT_MAX_AI_CONCURRENCY or 4).
+            ai_loop: Persistent loop for the AI stage (a private one by default).
+        """
+        if max_ai_concurrency is None:
+            max_ai_concurrency = int(os.environ.get('AIPUT_MAX_AI_CONCURRENCY', '4'))
+        self.max_ai_concurrency = max(1, max_ai_concurrency)
+        self.injection_queue = InjectionQueue(injection_loop or get_injection_loop())
+        self._owns_ai_loop = ai_loop is None
+        self.ai_loop = ai_loop or InjectionLoop(name='aiput-ai')
+
+        # AI stage state, only touched on the AI loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.ai_active = 0
+        self.ai_waiting = 0
+        self.ai_completed = 0
+
+    def reserve(self) -> int:
+        """Reserve the injection ticket for a newly arrived request."""
+        return self.injection_queue.reserve()
+
+    def cancel(self, ticket: int):
+        """Release a ticket that will not reach the injection stage."""
+        self.injection_queue.cancel(ticket)
+
+    async def run_ai(self, coro: Coroutine) -> Any:
+        """Run an AI coroutine in stage 1; awaitable from any event loop."""
+        return await asyncio.wrap_future(self.ai_loop.submit(self._ai_stage(coro)))
+
+    async def inject(self, ticket: int, coro: Coroutine) -> Any:
+        """Run an injection coroutine in stage 2, in ticket order."""
+        return await self.injection_queue.run(ticket, coro)
+
+    async def _ai_stage(self, coro: Coroutine) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_ai_concurrency)
+
+        self.ai_waiting += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            coro.close()
+            raise
+        finally:
+            self.ai_waiting -= 1
+
+        self.ai_active += 1
+        try:
+            return await coro
+        finally:
+            self.ai_active -= 1
+            self.ai_completed += 1
+            self._semaphore.release()
+
+    @property
+    def busy(self) -> bool:
+        """Whether any request is in the AI stage or waiting for (or running) its injection."""
+        return bool(self.ai_active or self.ai_waiting or self.injection_queue.pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """AI stage occupancy and injection queue statistics."""
+        return {
+            'ai_stage': {
+                'max_concurrency': self.max_ai_concurrency,
+                'active': self.ai_active,
+                'waiting': self.ai_waiting,
+                'completed': self.ai_completed,
+            },
+            'injection_queue': self.injection_queue.stats(),
+        }
+
+    def stop(self):
+        """Stop the AI loop if the scheduler created it."""
+        if self._owns_ai_loop:
+            self.ai_loop.stop()
+            self._semaphore = None
@@ -0,0 +1,80 @@
+"""
+The request-serving core: HTTP server, AI service and text injection.
+
+CoreService owns everything on the latency-critical path of a request.
+`cli.py serve` runs it directly; the GUI runs it in a separate process
+(server/control.py) so Tk work never shares an interpreter with it.
+"""
+
+import socket
+from typing import Optional
+
+from server import TypeHandler, create_http_server, get_injection_loop, KeepAliveTask, get_keep_alive_interval
+from server.startup import start_background_services
+
+
+class CoreService:
+    """Shared handler, background startup and the (re)startable HTTP server."""
+
+    def __init__(self):
+        # 适配器和 AI 服务在后台初始化，HTTP 服务可以立即开始监听
+        self.injection_loop = get_injection_loop()
+        self.type_handler = TypeHandler(None, None, self.injection_loop)
+        self.startup = start_background_services(self.type_handler, with_addresses=False)
+        self.http_server = None
+        self.host: Optional[str] = None
+        self.port: Optional[int] = None
+        self.keep_alive_task: Optional[KeepAliveTask] = None
+
+    @property
+    def running(self) -> bool:
+        return self.http_server is not None
+
+    def start_http(self, host: str, port: int, sock: Optional[socket.socket] = None):
+        """Start (or move) the HTTP server; keep-alive starts once the adapters are ready.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        if self.http_server is not None:
+            self.stop_http()
+        http_server = create_http_server(self.type_handler)
+        http_server.start(host, port, sock=sock)
+        self.http_server, self.host, self.port = http_server, host, port
+        self.startup.when_ready('adapters', self._start_keep_alive)
+
+    def _start_keep_alive(self, platform_adapters):
+        if self.http_server is None or self.keep_alive_task is not None:
+            return
+        if platform_adapters and hasattr(platform_adapters, 'keyboard'):
+            try:
+                interval = get_keep_alive_interval()
+                self.keep_alive_task = KeepAliveTask(platform_adapters.keyboard, interval=interval,
+                                                     injection_loop=self.injection_loop)
+                self.keep_alive_task.start()
+                print(f"✓ Keep-alive 任务已启动 (间隔: {interval}秒)")
+            except Exception as e:
+                print(f"⚠ Keep-alive 任务启动失败: {e}")
+
+    def stop_http(self):
+        """Stop keep-alive and drain the HTTP server (in-flight requests finish)."""
+        if self.keep_alive_task:
+            try:
+                self.keep_alive_task.stop()
+                print("✓ Keep-alive 任务已停止")
+            except Exception as e:
+                print(f"⚠ Keep-alive 任务停止失败: {e}")
+            self.keep_alive_task = None
+        if self.http_server:
+            self.http_server.stop()
+            self.http_server = None
+
+    def shutdown(self):
+        """Stop serving and release the injection loop and adapters."""
+        self.stop_http()
+        # HTTP 服务关闭后不再有新的 AI / 注入任务
+        self.type_handler.scheduler.stop()
+        self.injection_loop.stop()
+        platform_adapters = self.type_handler.platform_adapters
+        if platform_adapters and hasattr(platform_adapters, 'system_tray'):
+            platform_adapters.system_tray.stop()
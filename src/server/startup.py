@@ -0,0 +1,166 @@
+"""
+Staged parallel startup.
+
+Platform detection, adapter creation, AI service setup, provider
+pre-warm and address enumeration are independent enough to run at the
+same time, so they run as background stages with explicit dependencies
+while the window (or the HTTP server) comes up immediately. /type
+requests that arrive early wait only for the stage they actually need.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# 请求等待后台启动阶段的最长时间（秒）
+STARTUP_WAIT_SECONDS = 30
+
+
+class StartupOrchestrator:
+    """Runs named startup stages in background threads, respecting dependencies."""
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+
+    def add(self, name: str, func: Callable[..., Any], after: Iterable[str] = ()):
+        """Register a stage.
+
+        Args:
+            name: Stage name.
+            func: Called with the results of the `after` stages, in order.
+            after: Stages that must finish first.
+        """
+        if self._started is not None:
+            raise RuntimeError('startup already running')
+        after = tuple(after)
+        for dependency in after:
+            if dependency not in self._stages:
+                raise ValueError(f'unknown stage {dependency!r}')
+        self._stages[name] = (func, after)
+        self._futures[name] = concurrent.futures.Future()
+
+    def start(self) -> 'StartupOrchestrator':
+        """Start every stage on its own daemon thread."""
+        self._started = time.monotonic()
+        for name in self._stages:
+            threading.Thread(target=self._run, args=(name,), name=f'aiput-startup-{name}', daemon=True).start()
+        return self
+
+    def _run(self, name: str):
+        func, after = self._stages[name]
+        future = self._futures[name]
+        try:
+            args = [self._futures[dependency].result() for dependency in after]
+        except Exception as e:
+            future.set_exception(e)
+            print(f"  ✗ 启动阶段 {name} 跳过: 依赖失败 ({e})")
+            return
+
+        started = time.monotonic()
+        try:
+            result = func(*args)
+        except Exception as e:
+            self._record(name, started)
+            future.set_exception(e)
+            print(f"  ✗ 启动阶段 {name} 失败: {e}")
+            return
+        elapsed = self._record(name, started)
+        future.set_result(result)
+        print(f"  ✓ 启动阶段 {name}: {elapsed * 1000:.1f} ms "
+              f"(启动后 {(time.monotonic() - self._started) * 1000:.1f} ms)")
+
+    def _record(self, name: str, started: float) -> float:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._timings[name] = elapsed
+        return elapsed
+
+    def future(self, name: str) -> concurrent.futures.Future:
+        """Future of a stage's result."""
+        return self._futures[name]
+
+    def done(self, name: str) -> bool:
+        """Whether a stage has finished (successfully or not)."""
+        return self._futures[name].done()
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Block until a stage finishes; None if it failed or timed out."""
+        try:
+            return self._futures[name].result(timeout)
+        except Exception:
+            return None
+
+    async def wait(self, name: str, timeout: float = STARTUP_WAIT_SECONDS) -> Any:
+        """Await a stage from any event loop; None if it failed or timed out."""
+        future = self._futures[name]
+        if future.done():
+            return self.result(name)
+        try:
+            # shield：超时取消的是等待本身，而不是阶段的 Future
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except Exception:
+            return None
+
+    def when_ready(self, name: str, callback: Callable[[Any], None]):
+        """Call callback(result) once a stage succeeds (on the stage's thread, or now)."""
+        def done(future):
+            if future.exception() is None:
+                callback(future.result())
+        self._futures[name].add_done_callback(done)
+
+    def timings(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, for finished stages."""
+        with self._lock:
+            return {name: round(seconds * 1000, 1) for name, seconds in self._timings.items()}
+
+
+def start_background_services(type_handler, with_addresses: bool = True) -> StartupOrchestrator:
+    """Initialise adapters and the AI service in the background for `type_handler`.
+
+    Stages: platform → adapters, ai_service → ai_prewarm, and addresses.
+    The handler's attributes are filled in as the stages finish, and it
+    waits for them when a request needs them.
+
+    Args:
+        type_handler: Shared TypeHandler.
+        with_addresses: Also enumerate local addresses (stage 'addresses').
+
+    Returns:
+        The running orchestrator.
+    """
+    from server.bootstrap import detect_platform, create_platform_adapters, init_processing_service
+
+    def adapters(platform_info):
+        platform_adapters = create_platform_adapters(platform_info)
+        type_handler.platform_adapters = platform_adapters
+        return platform_adapters
+
+    def ai_service():
+        processing_service = init_processing_service()
+        type_handler.processing_service = processing_service
+        return processing_service
+
+    def ai_prewarm(processing_service):
+        if processing_service is not None:
+            processing_service.prewarm()
+
+    def addresses():
+        from server.network import get_all_ips, get_qr_ips
+        all_ips = get_all_ips()
+        return all_ips, get_qr_ips(all_ips)
+
+    startup = StartupOrchestrator()
+    startup.add('platform', detect_platform)
+    startup.add('adapters', adapters, after=['platform'])
+    startup.add('ai_service', ai_service)
+    startup.add('ai_prewarm', ai_prewarm, after=['ai_service'])
+    if with_addresses:
+        startup.add('addresses', addresses)
+    type_handler.startup = startup
+    return startup.start()
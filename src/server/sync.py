@@ -0,0 +1,124 @@
+"""
+Batched /sync endpoint for the phone's offline outbox.
+
+Submissions made while the phone could not reach the server are kept in
+an IndexedDB outbox with increasing sequence numbers. On reconnect the
+whole outbox is posted at once:
+
+    {"items": [{"seq": 1, "idempotency_key": "...", "text": "...", ...}, ...]}
+
+Items run one after another in seq order through the normal /type flow,
+so text is pasted in the order it was typed. Each item carries the
+idempotency key of its original attempt: an item whose earlier attempt
+did paste, or that a concurrent flush already sent, gets the cached
+outcome instead of being pasted again. When the server is overloaded the
+remaining items are returned as skipped and stay in the outbox.
+
+That guarantee only holds while the server still remembers the key, so
+each item also carries its age ("age_ms", measured on the phone's clock
+since it was queued). Items older than the idempotency TTL minus a
+safety margin are not pasted and come back as expired; the response's
+"max_age_ms" tells the phone the current limit.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from server.core import TypeHandler
+
+
+def get_sync_max_items() -> int:
+    """Largest accepted batch (AIPUT_SYNC_MAX_ITEMS, default 50)."""
+    return int(os.environ.get('AIPUT_SYNC_MAX_ITEMS', '50'))
+
+
+# 原始请求完成后，客户端可能要过一段时间才发现响应丢失并放入发件箱（秒）
+SYNC_AGE_MARGIN = 60
+
+
+def get_sync_max_age(type_handler: TypeHandler) -> float:
+    """Oldest outbox item, in seconds since it was queued, that is still pasted.
+
+    Older items may have been pasted by an attempt whose idempotency key
+    the server has already forgotten.
+    """
+    return max(0.0, type_handler.idempotency.ttl - SYNC_AGE_MARGIN)
+
+
+def _age(item: Dict[str, Any]) -> Optional[float]:
+    age = item.get('age_ms')
+    if isinstance(age, (int, float)) and not isinstance(age, bool):
+        return age / 1000
+    return None
+
+
+def _seq(item: Dict[str, Any]) -> Optional[int]:
+    seq = item.get('seq')
+    return seq if isinstance(seq, int) and not isinstance(seq, bool) else None
+
+
+def _ordered(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Items sorted by seq (stable for items without one), repeated seqs dropped."""
+    seen = set()
+    ordered = []
+    for item in sorted(items, key=lambda item: _seq(item) or 0):
+        seq = _seq(item)
+        if seq is not None:
+            if seq in seen:
+                continue
+            seen.add(seq)
+        ordered.append(item)
+    return ordered
+
+
+async def sync_batch(type_handler: TypeHandler, data: Optional[Dict[str, Any]],
+                     client_ip: str = 'unknown') -> Tuple[int, Dict[str, Any]]:
+    """Process an outbox batch in order.
+
+    Args:
+        type_handler: Shared request handler.
+        data: Decoded JSON body with an 'items' list.
+        client_ip: Remote address for logging.
+
+    Returns:
+        (HTTP status, body). The body's 'results' has one entry per item,
+        in seq order: the /type response plus 'seq', or
+        {'seq', 'success': False, 'skipped': True} for items not attempted,
+        or {'seq', 'success': False, 'expired': True, ...} for items too old
+        to send safely. 'max_age_ms' is the current age limit.
+    """
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return 400, {'success': False, 'error': '请求格式错误：需要 items 列表'}
+    max_items = get_sync_max_items()
+    if len(items) > max_items:
+        return 413, {'success': False, 'error': f'一次最多同步 {max_items} 条'}
+
+    items = _ordered(items)
+    if items:
+        print(f"\n收到来自 {client_ip} 的离线同步请求: {len(items)} 条")
+
+    max_age = get_sync_max_age(type_handler)
+    results = []
+    stopped = False
+    for item in items:
+        seq = item.get('seq')
+        if stopped:
+            results.append({'seq': seq, 'success': False, 'skipped': True})
+            continue
+        age = _age(item)
+        if age is not None and age > max_age:
+            # 幂等键可能已过期：无法确认是否粘贴过，宁可丢弃也不重复粘贴
+            print(f"  离线条目 {seq} 已过期 ({age:.0f} 秒)，不再发送")
+            results.append({'seq': seq, 'success': False, 'expired': True,
+                            'error': '离线消息已过期，未发送'})
+            continue
+        response = await type_handler.handle(item, client_ip)
+        results.append({'seq': seq, **response})
+        if response.get('overloaded'):
+            # 服务器繁忙：后续条目留在客户端，下次同步时按原顺序重试
+            stopped = True
+
+    processed = sum(1 for result in results if not result.get('skipped') and not result.get('expired'))
+    return 200, {'success': True, 'processed': processed, 'results': results,
+                 'max_age_ms': int(max_age * 1000)}
@@ -0,0 +1,63 @@
+"""
+Per-request trace ids and stage timings.
+
+Each submission gets a trace id (the client's X-Request-ID when given)
+and monotonic timestamps at every stage boundary. The timings are
+returned in the JSON body and as a Server-Timing header, and the trace
+id is printed with the request log so user reports can be matched to
+server output.
+"""
+
+import re
+import time
+import uuid
+from typing import Dict, Optional
+
+_TRACE_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class RequestTrace:
+    """Stage durations of one request, in the order they were recorded."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """Initialize trace.
+
+        Args:
+            trace_id: Client-supplied id; replaced by a random one if missing or malformed.
+        """
+        if not trace_id or not _TRACE_ID_RE.match(str(trace_id)):
+            trace_id = new_trace_id()
+        self.trace_id = str(trace_id)
+        self.started = time.monotonic()
+        self._durations: Dict[str, float] = {}
+        self._open: Dict[str, float] = {}
+
+    def record(self, stage: str, started: float, ended: Optional[float] = None):
+        """Record a stage that ran from `started` to `ended` (default: now)."""
+        ended = time.monotonic() if ended is None else ended
+        self._durations[stage] = self._durations.get(stage, 0.0) + (ended - started)
+
+    def begin(self, stage: str):
+        """Mark the start of a stage that is finished with end()."""
+        self._open[stage] = time.monotonic()
+
+    def end(self, stage: str):
+        """Finish a stage started with begin(); ignored if it was never begun."""
+        started = self._open.pop(stage, None)
+        if started is not None:
+            self.record(stage, started)
+
+    def timings(self) -> Dict[str, float]:
+        """Stage durations plus 'total', in milliseconds."""
+        result = {stage: round(seconds * 1000, 1) for stage, seconds in self._durations.items()}
+        result['total'] = round((time.monotonic() - self.started) * 1000, 1)
+        return result
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """Format timings (milliseconds) as a Server-Timing header value."""
+    return ', '.join(f'{stage};dur={duration}' for stage, duration in timings.items())
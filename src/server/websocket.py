@@ -0,0 +1,104 @@
+"""
+WebSocket channel for the phone client.
+
+One connection carries any number of submissions. Protocol (JSON text
+frames):
+
+    client → {"type": "submit", "id": "<client id>", "text": ..., ...}   same fields as /type
+    server → {"type": "ack", "id": ...}
+    server → {"type": "event", "id": ..., "stage": "queued" | "ai_started" | "ai_done"
+                                                 | "pasted" | "submitted" | "error", ...}
+    server → {"type": "result", "id": ..., "success": ..., ...}          same body as /type
+    client → {"type": "ping"}   server → {"type": "pong"}
+
+The server also sends protocol-level pings (AIPUT_WS_HEARTBEAT seconds)
+so dead connections are detected on both ends.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict
+
+from aiohttp import web, WSMsgType
+
+from server.core import TypeHandler
+
+
+def websocket_heartbeat() -> float:
+    """Seconds between server pings (AIPUT_WS_HEARTBEAT, default 20)."""
+    return float(os.environ.get('AIPUT_WS_HEARTBEAT', '20'))
+
+
+async def type_websocket(request: web.Request, type_handler: TypeHandler) -> web.WebSocketResponse:
+    """Serve one phone client connection.
+
+    Args:
+        request: Upgrade request.
+        type_handler: Shared request handler.
+
+    Returns:
+        The closed WebSocketResponse.
+    """
+    heartbeat = websocket_heartbeat()
+    ws = web.WebSocketResponse(heartbeat=heartbeat)
+    await ws.prepare(request)
+
+    loop = asyncio.get_running_loop()
+    outgoing: asyncio.Queue = asyncio.Queue()
+    client_ip = request.headers.get('X-Forwarded-For', request.remote or 'unknown')
+    submissions = set()
+
+    def send(message: Dict[str, Any]):
+        # 进度事件可能来自 AI / 注入线程，统一投递到本连接的发送队列
+        loop.call_soon_threadsafe(outgoing.put_nowait, message)
+
+    async def writer():
+        while True:
+            message = await outgoing.get()
+            if ws.closed:
+                continue
+            try:
+                await ws.send_json(message)
+            except ConnectionError:
+                pass
+
+    async def submit(message_id, data):
+        def on_event(stage, fields):
+            send({'type': 'event', 'id': message_id, 'stage': stage, **fields})
+
+        response = await type_handler.handle(data, client_ip, on_event=on_event)
+        send({'type': 'result', 'id': message_id, **response})
+
+    writer_task = loop.create_task(writer())
+    send({'type': 'hello', 'heartbeat': heartbeat})
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                data = json.loads(msg.data)
+            except ValueError:
+                send({'type': 'error', 'error': '无效的消息格式'})
+                continue
+            if not isinstance(data, dict):
+                send({'type': 'error', 'error': '无效的消息格式'})
+                continue
+
+            kind = data.get('type')
+            if kind == 'ping':
+                send({'type': 'pong'})
+            elif kind == 'submit':
+                message_id = data.get('id')
+                send({'type': 'ack', 'id': message_id})
+                # 连接断开后已提交的请求仍会完成（与 /type 行为一致）
+                task = loop.create_task(submit(message_id, data))
+                submissions.add(task)
+                task.add_done_callback(submissions.discard)
+            else:
+                send({'type': 'error', 'error': f'未知的消息类型: {kind}'})
+    finally:
+        if submissions:
+            await asyncio.gather(*submissions, return_exceptions=True)
+        writer_task.cancel()
+    return ws
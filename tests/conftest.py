@@ -0,0 +1,55 @@
+"""
+测试共用的假平台适配器和 TypeHandler fixture。
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import InjectionLoop, TypeHandler
+
+
+class FakeAdapters:
+    """同时充当剪贴板和键盘的适配器，记录复制、粘贴和提交。"""
+
+    notifications = None
+
+    def __init__(self):
+        self.clipboard = self
+        self.keyboard = self
+        self.copied = []
+        self.pasted = []
+        self.submitted = 0
+
+    def get_preferred_tool(self):
+        return 'fake-tool'
+
+    async def copy_text(self, text):
+        self.copied.append(text)
+        return True
+
+    async def send_paste_command(self):
+        self.pasted.append(self.copied[-1] if self.copied else None)
+        return True
+
+    async def send_ctrl_enter(self):
+        self.submitted += 1
+        return True
+
+
+@pytest.fixture
+def adapters():
+    return FakeAdapters()
+
+
+@pytest.fixture
+def handler(adapters):
+    """使用假适配器和独立注入循环的 TypeHandler，测试结束后停止后台线程。"""
+    loop = InjectionLoop(name='test-handler')
+    handler = TypeHandler(adapters, injection_loop=loop)
+    yield handler
+    handler.scheduler.stop()
+    loop.stop()
@@ -0,0 +1,104 @@
+"""
+systemd 套接字激活与空闲退出测试。
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+sys.path.insert(0, SRC_DIR)
+
+from server import TypeHandler, create_http_server
+from server.activation import ActivityTracker, wait_until_idle
+
+
+def test_listen_fds_adopts_inherited_socket():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    code = (
+        'import os, sys; os.dup2(int(sys.argv[1]), 3); '
+        'os.environ.update(LISTEN_PID=str(os.getpid()), LISTEN_FDS="1"); '
+        'from server.activation import listen_fds, socket_address; '
+        'sockets = listen_fds(); '
+        'print(socket_address(sockets[0])[1], "LISTEN_FDS" in os.environ, len(listen_fds()))'
+    )
+    try:
+        result = subprocess.run([sys.executable, '-c', code, str(listener.fileno())], cwd=SRC_DIR,
+                                pass_fds=(listener.fileno(),), capture_output=True, text=True)
+        port = listener.getsockname()[1]
+    finally:
+        listener.close()
+    assert result.returncode == 0, result.stderr
+    # 环境变量被清除，第二次调用不再返回套接字
+    assert result.stdout.split() == [str(port), 'False', '0']
+
+
+def test_idle_timeout_waits_for_in_flight_requests():
+    activity = ActivityTracker()
+    activity.begin()
+    assert activity.idle_seconds() == 0
+    assert not wait_until_idle(activity, 0.01, _set_after(0.1), poll_interval=0.02)
+    activity.end()
+    assert wait_until_idle(activity, 0.01, threading.Event(), poll_interval=0.02)
+
+
+def test_queued_work_without_a_connection_postpones_idle_exit():
+    activity = ActivityTracker()
+    busy = [True]
+    _set_after(0.15, lambda: busy.clear())
+    stopped = _set_after(1)
+    # /jobs 提交的请求在连接关闭后仍在注入：调度器有任务时不算空闲
+    started = time.monotonic()
+    assert wait_until_idle(activity, 0.05, stopped, poll_interval=0.01, busy=lambda: bool(busy))
+    assert time.monotonic() - started >= 0.15
+
+
+def test_scheduler_is_busy_until_injection_finishes():
+    import asyncio
+    from server import InjectionLoop
+    from server.scheduler import RequestScheduler
+
+    loop = InjectionLoop(name='test-busy')
+    scheduler = RequestScheduler(loop)
+    try:
+        ticket = scheduler.reserve()
+        assert scheduler.busy
+        asyncio.run(scheduler.inject(ticket, asyncio.sleep(0)))
+        assert not scheduler.busy
+        scheduler.cancel(scheduler.reserve())
+        asyncio.run(asyncio.sleep(0.05))
+        assert not scheduler.busy
+    finally:
+        scheduler.stop()
+        loop.stop()
+
+
+def _set_after(seconds, action=None):
+    event = threading.Event()
+    threading.Timer(seconds, action or event.set).start()
+    return event
+
+
+def test_production_server_serves_from_inherited_socket():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    server = create_http_server(TypeHandler(), mode='production')
+    server.start('ignored', 0, sock=listener)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/stats', timeout=5) as response:
+            stats = json.load(response)
+        idle = server.activity.idle_seconds()
+    finally:
+        server.stop()
+    assert 'injection_queue' in stats
+    assert 0 < idle < 5
@@ -0,0 +1,45 @@
+"""
+准入控制 / 过载保护测试。
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.admission import AdmissionController, ADMIT, DEGRADE, REJECT
+from server.core import http_status
+
+
+def _scheduler(pending=0, ai_waiting=0):
+    return SimpleNamespace(injection_queue=SimpleNamespace(depth=pending),
+                           ai_waiting=ai_waiting, max_ai_concurrency=2)
+
+
+def test_injection_backlog_rejects_with_retry_after():
+    controller = AdmissionController(_scheduler(pending=10), max_pending=10, max_ai_backlog=5)
+    for _ in range(5):
+        controller.record_injection(1.0)
+
+    decision = controller.check(ai_requested=False)
+    assert decision.action == REJECT
+    # 10 个待注入请求 × 约 0.77 秒
+    assert 5 <= decision.retry_after <= 10
+    assert controller.stats()['reject_rate'] == 1.0
+
+
+def test_ai_backlog_degrades_or_rejects_by_policy():
+    scheduler = _scheduler(ai_waiting=5)
+    degrade = AdmissionController(scheduler, max_pending=10, max_ai_backlog=5, policy='degrade')
+    assert degrade.check(ai_requested=True).action == DEGRADE
+    assert degrade.check(ai_requested=False).action == ADMIT
+
+    reject = AdmissionController(scheduler, max_pending=10, max_ai_backlog=5, policy='reject')
+    assert reject.check(ai_requested=True).action == REJECT
+    assert reject.stats()['rejected'] == 1
+
+
+def test_overloaded_response_maps_to_503():
+    assert http_status({'success': False, 'overloaded': True, 'retry_after': 7}) == (503, {'Retry-After': '7'})
+    assert http_status({'success': True}) == (200, {})
@@ -0,0 +1,96 @@
+"""
+自适应超时测试。
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.latency import LatencySketch, AdaptiveTimeouts
+from ai.processing_service import ProcessingService
+from ai.processor import AIProcessor
+
+
+class SlowProcessor(AIProcessor):
+    model = 'slow-model'
+
+    async def process_text(self, text, prompt, model=None):
+        await asyncio.sleep(1)
+        return text
+
+    def is_configured(self):
+        return True
+
+
+def test_sketch_quantiles_within_relative_error():
+    sketch = LatencySketch()
+    for i in range(1, 1001):
+        sketch.add(i / 100)
+    assert abs(sketch.quantile(0.5) - 5.0) / 5.0 < 0.03
+    assert abs(sketch.quantile(0.99) - 9.9) / 9.9 < 0.03
+
+
+def test_timeout_follows_p99_and_persists():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'latency.json')
+        timeouts = AdaptiveTimeouts(default_timeout=30, state_path=path)
+        assert timeouts.timeout_for('zai', 'general-refine') == 30
+
+        for _ in range(50):
+            timeouts.record('zai', 'general-refine', 1.5)
+        # 1.5s x 2.0, clamped to AI_TIMEOUT_MIN (5s)
+        assert timeouts.timeout_for('zai', 'general-refine') == 5
+        for _ in range(50):
+            timeouts.record('zai', 'translate-en', 6.0)
+        assert 11 < timeouts.timeout_for('zai', 'translate-en') < 13
+
+        timeouts.save()
+        restored = AdaptiveTimeouts(default_timeout=30, state_path=path)
+        assert restored.timeout_for('zai', 'translate-en') == timeouts.timeout_for('zai', 'translate-en')
+
+
+def test_models_are_tracked_separately_and_saved_off_the_caller_thread():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'latency.json')
+        timeouts = AdaptiveTimeouts(default_timeout=30, state_path=path)
+        for _ in range(50):
+            timeouts.record('zai', 'general-refine', 0.5, 'glm-4.5-air')
+            timeouts.record('zai', 'general-refine', 8.0, 'glm-4.6')
+        # 快速模型的低延迟不会压低大模型的超时
+        assert timeouts.timeout_for('zai', 'general-refine', 'glm-4.5-air') == 5
+        assert timeouts.timeout_for('zai', 'general-refine', 'glm-4.6') > 15
+        # 记录样本时不同步写文件，由定时器或退出时保存
+        assert not os.path.exists(path)
+        timeouts.save()
+        assert os.path.exists(path)
+
+
+def test_timed_out_calls_push_the_timeout_up():
+    with tempfile.TemporaryDirectory() as tmp:
+        timeouts = AdaptiveTimeouts(default_timeout=60, state_path=os.path.join(tmp, 'latency.json'))
+        for _ in range(100):
+            timeouts.record('zai', 'general-refine', 3.0)
+        timeout = timeouts.timeout_for('zai', 'general-refine')
+        assert 5.5 < timeout < 6.5
+
+        # 服务变慢后请求都被超时截断：超时作为删失样本记录，超时时间随之增长直到上限
+        for _ in range(10):
+            for _ in range(5):
+                timeouts.record_timeout('zai', 'general-refine', timeout)
+            timeout = timeouts.timeout_for('zai', 'general-refine')
+        assert timeout == 60
+        timeouts.save()
+
+
+def test_processing_service_records_timeouts(monkeypatch, tmp_path):
+    monkeypatch.setenv('AI_LATENCY_STATE_FILE', str(tmp_path / 'latency.json'))
+    service = ProcessingService()
+    service.register_processor('slow', SlowProcessor)
+    service.timeouts = AdaptiveTimeouts(default_timeout=0.05, state_path=str(tmp_path / 'latency.json'))
+
+    assert asyncio.run(service.process('hello', 'prompt {user_input}', provider='slow')) is None
+    assert service.timeouts.snapshot()['slow/slow-model/default']['samples'] == 1
+    service.timeouts.save()
@@ -0,0 +1,98 @@
+"""
+多阶段 AI 处理流水线测试。
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.modes import ModeConfig
+from ai.processing_service import ProcessingService
+from ai.processor import AIProcessor
+from ai.pipeline import run_pipeline, fuse_prompts, sentence_chunks, PipelineError
+from ai.retry import get_retry_budget
+
+
+class FakeProcessor(AIProcessor):
+    """按提示词给文本加标记的假处理器，流式输出时逐字返回。"""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def process_text(self, text, prompt, model=None):
+        self.calls.append((prompt, text))
+        if self.fail_on and self.fail_on in text:
+            return None
+        await asyncio.sleep(0)
+        return f"{prompt}({text})"
+
+    async def stream_text(self, text, prompt, model=None):
+        self.calls.append((prompt, text))
+        for char in text:
+            await asyncio.sleep(0)
+            yield char
+
+    def is_configured(self):
+        return True
+
+
+async def _collect(fragments):
+    return [chunk async for chunk in fragments]
+
+
+async def _fragments(*parts):
+    for part in parts:
+        yield part
+
+
+def test_sentence_chunks_cut_on_boundaries():
+    chunks = asyncio.run(_collect(sentence_chunks(_fragments("第一句。第二", "句！第三句"), min_chars=1)))
+    assert chunks == ["第一句。", "第二句！", "第三句"]
+
+
+def test_sentence_chunks_keep_decimal_numbers():
+    chunks = asyncio.run(_collect(sentence_chunks(_fragments("Pi is 3.", "14. Done"), min_chars=1)))
+    assert chunks == ["Pi is 3.14. ", "Done"]
+
+
+def test_pipeline_hands_off_sentences_in_order():
+    processor = FakeProcessor()
+    result = asyncio.run(run_pipeline(processor, "一。二。三", ["A", "B"], min_chunk_chars=1))
+
+    assert result == "B(一。) B(二。) B(三)"
+    # 第二阶段按句子分别调用
+    assert [text for prompt, text in processor.calls if prompt == "B"] == ["一。", "二。", "三"]
+
+
+def test_pipeline_counts_as_one_retry_budget_request(monkeypatch, tmp_path):
+    monkeypatch.setenv("AI_LATENCY_STATE_FILE", str(tmp_path / "latency.json"))
+    service = ProcessingService()
+    service.register_processor("fake", FakeProcessor)
+    pipeline = ModeConfig("two-stage", stages=["A", "B"])
+    monkeypatch.setattr(service.modes, "get", lambda mode: pipeline)
+    service.pipeline_chunk_chars = 1
+
+    before = get_retry_budget().stats()["requests_total"]
+    result = asyncio.run(service.process("一。二。三", "", provider="fake", mode="two-stage"))
+    assert result == "B(一。) B(二。) B(三)"
+    # 第二阶段调用了三次，重试预算只记一次请求
+    assert get_retry_budget().stats()["requests_total"] - before == 1
+
+
+def test_pipeline_stage_failure_raises():
+    processor = FakeProcessor(fail_on="二")
+    try:
+        asyncio.run(run_pipeline(processor, "一。二。三", ["A", "B"], min_chunk_chars=1))
+    except PipelineError:
+        pass
+    else:
+        raise AssertionError("PipelineError expected")
+
+
+def test_fuse_prompts_keeps_single_placeholder():
+    fused = fuse_prompts(["整理：\n\n{user_input}", "Translate:\n\n{user_input}"])
+    assert fused.count("{user_input}") == 1
+    assert "整理" in fused and "Translate" in fused
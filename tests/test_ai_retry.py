@@ -0,0 +1,44 @@
+"""
+共享重试预算测试。
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.retry import RetryBudget, get_retry_budget
+from server import metrics
+from server.bootstrap import init_processing_service
+
+
+def test_retries_capped_at_ratio_of_requests():
+    calls = []
+    budget = RetryBudget(ratio=0.1, min_retries=1, on_retry=lambda: calls.append('retry'),
+                         on_exhausted=lambda: calls.append('exhausted'))
+    for _ in range(50):
+        budget.record_request()
+
+    granted = sum(budget.try_acquire() for _ in range(20))
+    assert granted == 5
+    assert budget.stats()['exhausted_total'] == 15
+    assert calls.count('retry') == 5 and calls.count('exhausted') == 15
+
+
+def test_shared_budget_is_exported_on_metrics(monkeypatch, tmp_path):
+    monkeypatch.setenv('AI_LATENCY_STATE_FILE', str(tmp_path / 'latency.json'))
+    init_processing_service()
+    def counted():
+        return metrics.RETRIES.labels().value() + metrics.RETRY_BUDGET_EXHAUSTED.labels().value()
+
+    before = counted()
+    get_retry_budget().try_acquire()
+    assert counted() - before == 1
+    assert 'aiput_retry_budget_exhausted_total ' in metrics.REGISTRY.render()
+
+
+def test_full_jitter_backoff_bounds():
+    budget = RetryBudget(base_delay=0.5, max_delay=2.0)
+    for attempt in range(6):
+        delay = budget.backoff_delay(attempt)
+        assert 0 <= delay <= min(2.0, 0.5 * 2 ** attempt)
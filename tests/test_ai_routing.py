@@ -0,0 +1,69 @@
+"""
+AI 模型分级路由测试。
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.routing import RoutingPolicy, estimate_tokens, TIER_FAST, TIER_LARGE
+
+
+def test_estimate_tokens_counts_cjk_per_char():
+    assert estimate_tokens("你好世界") == 4
+    assert estimate_tokens("hello world!") == 3
+
+
+def test_short_input_goes_to_fast_tier():
+    policy = RoutingPolicy()
+    assert policy.decide("帮我写个标题").tier == TIER_FAST
+    assert policy.decide("长" * 500).tier == TIER_LARGE
+
+
+def test_mode_pin_and_client_overrides():
+    policy = RoutingPolicy()
+    assert policy.decide("短", mode_routing={"tier": "large"}).tier == TIER_LARGE
+    assert policy.decide("长" * 500, latency_budget_ms=1000).tier == TIER_FAST
+    assert policy.decide("短", mode_routing={"tier": "large"}, tier="fast").tier == TIER_FAST
+
+
+def test_malformed_routing_inputs_are_ignored():
+    from server.core import TypeRequest
+
+    policy = RoutingPolicy()
+    # prompts.json 中 routing 不是对象时按未配置处理
+    assert policy.decide("短", mode_routing=["fast"]).tier == TIER_FAST
+    assert TypeRequest.from_json({'latency_budget_ms': 'soon'}).latency_budget_ms is None
+    assert TypeRequest.from_json({'latency_budget_ms': True}).latency_budget_ms is None
+    assert TypeRequest.from_json({'latency_budget_ms': -1}).latency_budget_ms is None
+    assert TypeRequest.from_json({'latency_budget_ms': 1500}).latency_budget_ms == 1500.0
+
+    # 模式中的阈值无效时使用默认值，而不是抛出 TypeError
+    long_text = "x" * 1000
+    for invalid in (None, "soon", [1]):
+        decision = policy.decide(long_text, mode_routing={"fast_latency_budget_ms": invalid,
+                                                          "fast_max_tokens": invalid},
+                                 latency_budget_ms=2000)
+        assert decision.tier == TIER_FAST and decision.reason == "latency budget 2000ms"
+    assert policy.decide(long_text, mode_routing={"fast_latency_budget_ms": "1000"},
+                         latency_budget_ms=2000).tier == TIER_LARGE
+
+
+def test_malformed_env_thresholds_fall_back(monkeypatch):
+    monkeypatch.setenv("AI_FAST_MAX_TOKENS", "many")
+    monkeypatch.setenv("AI_FAST_LATENCY_BUDGET_MS", "")
+    policy = RoutingPolicy()
+    assert (policy.fast_max_tokens, policy.fast_latency_budget_ms) == (60, 3000)
+
+
+def test_fast_model_only_when_configured(monkeypatch):
+    from ai.anthropic_processor import AnthropicProcessor
+    from ai.zai_processor import ZAIProcessor
+
+    monkeypatch.delenv('ANTHROPIC_FAST_MODEL', raising=False)
+    monkeypatch.delenv('ZAI_FAST_MODEL', raising=False)
+    assert AnthropicProcessor().fast_model is None
+    assert ZAIProcessor().fast_model is None
+    monkeypatch.setenv('ZAI_FAST_MODEL', 'glm-4.5-air')
+    assert ZAIProcessor().fast_model == 'glm-4.5-air'
@@ -0,0 +1,124 @@
+"""
+影子流量测试：采样比例、并发上限、候选请求失败不影响主请求、差值统计。
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.processing_service import ProcessingService
+from ai.processor import AIProcessor
+from ai.shadow import ShadowRunner
+from ai.stats import StatsStore
+
+
+class PrimaryProcessor(AIProcessor):
+    model = 'primary-model'
+
+    async def process_text(self, text, prompt, model=None):
+        return f'primary({text})'
+
+    def is_configured(self):
+        return True
+
+
+class BrokenProcessor(AIProcessor):
+    model = 'candidate-model'
+
+    async def process_text(self, text, prompt, model=None):
+        raise RuntimeError('candidate is down')
+
+    def is_configured(self):
+        return True
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_sampling_rate(monkeypatch):
+    monkeypatch.setenv('AI_SHADOW_PROVIDER', 'zai')
+    monkeypatch.setenv('AI_SHADOW_SAMPLE_PERCENT', '25')
+    random.seed(1)
+    sampled = sum(ShadowRunner().should_sample() for _ in range(10000))
+    assert 2300 < sampled < 2700
+
+    monkeypatch.setenv('AI_SHADOW_SAMPLE_PERCENT', '0')
+    assert not any(ShadowRunner().should_sample() for _ in range(1000))
+    # 未配置候选 provider/model 时不采样
+    monkeypatch.delenv('AI_SHADOW_PROVIDER')
+    monkeypatch.setenv('AI_SHADOW_SAMPLE_PERCENT', '100')
+    assert not ShadowRunner().enabled
+
+
+def test_submissions_beyond_the_in_flight_limit_are_dropped(monkeypatch):
+    monkeypatch.setenv('AI_SHADOW_MAX_IN_FLIGHT', '1')
+    runner = ShadowRunner()
+    release = threading.Event()
+    finished = []
+
+    async def slow():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        finished.append(True)
+
+    assert runner.submit(slow())
+    assert not runner.submit(slow())
+    assert runner.dropped == 1
+
+    release.set()
+    _wait_for(lambda: runner._in_flight == 0)
+    assert finished == [True]
+    assert runner.submit(slow())
+    _wait_for(lambda: len(finished) == 2)
+
+
+def test_candidate_failure_does_not_affect_primary(monkeypatch, tmp_path):
+    monkeypatch.setenv('AI_LATENCY_STATE_FILE', str(tmp_path / 'latency.json'))
+    monkeypatch.setenv('AI_SHADOW_PROVIDER', 'broken')
+    monkeypatch.setenv('AI_SHADOW_SAMPLE_PERCENT', '100')
+    service = ProcessingService()
+    service.register_processor('primary', PrimaryProcessor)
+    service.register_processor('broken', BrokenProcessor)
+
+    result = asyncio.run(service.process('hello', 'prompt {user_input}', provider='primary'))
+    assert result == 'primary(hello)'
+
+    _wait_for(lambda: service.stats.recent_shadow())
+    [record] = service.stats.recent_shadow()
+    assert record['primary']['success'] and not record['candidate']['success']
+    assert service.stats.shadow_summary()['broken/candidate-model']['failures'] == 1
+
+
+def test_shadow_deltas_are_candidate_minus_primary():
+    stats = StatsStore()
+    primary = {'provider': 'zai', 'model': 'glm-4.6', 'latency': 1.0,
+               'output_tokens': 10, 'output_length': 40, 'success': True}
+
+    def candidate(latency, output_tokens, output_length, success=True):
+        return {'provider': 'anthropic', 'model': 'small', 'latency': latency,
+                'output_tokens': output_tokens, 'output_length': output_length, 'success': success}
+
+    stats.record_shadow('general-refine', primary, candidate(0.4, 12, 48))
+    stats.record_shadow('general-refine', primary, candidate(0.8, 8, 36))
+    stats.record_shadow('general-refine', primary, candidate(30.0, 0, 0, success=False))
+
+    first = stats.recent_shadow()[0]
+    assert abs(first['latency_delta'] - -0.6) < 1e-9
+    assert first['output_tokens_delta'] == 2 and first['output_length_delta'] == 8
+    assert 'latency_delta' not in stats.recent_shadow()[-1]
+
+    # 平均值只统计成功的候选请求
+    summary = stats.shadow_summary()['anthropic/small']
+    assert summary['samples'] == 3 and summary['failures'] == 1
+    assert abs(summary['mean_latency_delta'] - -0.4) < 1e-9
+    assert summary['mean_output_tokens_delta'] == 0
+    assert summary['mean_output_length_delta'] == 2
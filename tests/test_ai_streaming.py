@@ -0,0 +1,100 @@
+"""
+AI 流式输出测试：基类中的 SSE 读取循环、各 provider 的增量解析和失败回退。
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiohttp import web
+
+from ai.anthropic_processor import AnthropicProcessor
+from ai.processor import AIProcessor, StreamingProcessor
+from ai.zai_processor import ZAIProcessor
+
+ANTHROPIC_EVENTS = [
+    {'type': 'message_start'},
+    {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': 'Hello'}},
+    {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': ', world'}},
+    {'type': 'message_stop'},
+]
+
+OPENAI_EVENTS = [
+    {'choices': [{'delta': {'content': 'Hel'}}]},
+    {'choices': [{'delta': {'content': 'lo'}}]},
+]
+
+
+async def _stream(processor_class, events, status=200):
+    requests = []
+
+    async def messages(request):
+        body = await request.json()
+        requests.append((dict(request.headers), body))
+        if body.get('stream'):
+            if status != 200:
+                return web.Response(status=status)
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            for event in events:
+                await response.write(f'data: {json.dumps(event)}\n\n'.encode())
+            await response.write(b'data: [DONE]\n\n')
+            return response
+        return web.json_response({'content': [{'type': 'text', 'text': 'regular'}]})
+
+    app = web.Application()
+    app.router.add_post('/v1/messages', messages)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        processor = processor_class(api_key='key', model='m', base_url=f'http://127.0.0.1:{port}/v1/messages')
+        fragments = [chunk async for chunk in processor.stream_text('hi', 'fix: {user_input}')]
+    finally:
+        await runner.cleanup()
+    return fragments, requests
+
+
+def test_anthropic_stream_yields_text_deltas():
+    fragments, [(headers, body)] = asyncio.run(_stream(AnthropicProcessor, ANTHROPIC_EVENTS))
+    assert fragments == ['Hello', ', world']
+    assert headers['x-api-key'] == 'key'
+    assert body['stream'] is True and body['model'] == 'm'
+    assert '<user_input>\nhi\n</user_input>' in body['messages'][0]['content']
+
+
+def test_zai_stream_accepts_openai_style_chunks():
+    fragments, [(headers, _)] = asyncio.run(_stream(ZAIProcessor, OPENAI_EVENTS))
+    assert fragments == ['Hel', 'lo']
+    assert headers['Authorization'] == 'Bearer key'
+
+
+def test_stream_falls_back_to_a_regular_request():
+    fragments, requests = asyncio.run(_stream(AnthropicProcessor, ANTHROPIC_EVENTS, status=500))
+    assert fragments == ['regular']
+    assert [body.get('stream', False) for _, body in requests] == [True, False]
+
+
+def test_streaming_is_an_explicit_capability():
+    assert AnthropicProcessor.supports_streaming and ZAIProcessor.supports_streaming
+    assert not AIProcessor.supports_streaming
+
+    class Incomplete(StreamingProcessor):
+        async def process_text(self, text, prompt, model=None):
+            return text
+
+        def is_configured(self):
+            return True
+
+    # 流式处理器必须实现所有请求钩子
+    try:
+        Incomplete()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("TypeError expected")
@@ -0,0 +1,63 @@
+"""
+静态资源预压缩、内容哈希文件名与 ETag 协商测试。
+"""
+
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.assets import AssetBundle, choose_encoding, fingerprinted_name
+
+
+def _site(tmp_path):
+    (tmp_path / 'config').mkdir()
+    (tmp_path / 'index.html').write_text(
+        '<link rel="stylesheet" href="/static/style.css"><script src="/static/app.js"></script>')
+    (tmp_path / 'app.js').write_text('console.log("hello");\n' * 100)
+    (tmp_path / 'style.css').write_text('body { margin: 0; }\n' * 100)
+    (tmp_path / 'config' / 'prompts.json').write_text('{"prompts": []}')
+    return AssetBundle(str(tmp_path))
+
+
+def test_index_references_immutable_fingerprinted_assets(tmp_path):
+    bundle = _site(tmp_path)
+    app_js = fingerprinted_name('app.js', bundle.get('app.js').digest)
+    assert f'src="/static/{app_js}"' in bundle.get('index.html').encodings['identity'].decode()
+
+    status, headers, body = bundle.respond(app_js, 'gzip, deflate')
+    assert status == 200
+    assert headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == (tmp_path / 'app.js').read_bytes()
+
+    # 原始文件名仍可访问，但需要重新验证
+    assert bundle.respond('app.js')[1]['Cache-Control'] == 'no-cache'
+    assert bundle.respond('../requests.jsonl') is None
+
+
+def test_etag_revalidation_per_encoding(tmp_path):
+    bundle = _site(tmp_path)
+    status, headers, _ = bundle.respond('index.html', 'identity')
+    etag = headers['ETag']
+    assert status == 200 and headers['Vary'] == 'Accept-Encoding'
+    assert bundle.respond('index.html', 'identity', etag)[0] == 304
+    assert bundle.respond('index.html', 'identity', f'W/{etag}')[0] == 304
+
+    # 小文件不压缩，任何客户端都得到同一个实体
+    status, headers, body = bundle.respond('config/prompts.json', 'gzip', None)
+    assert 'Content-Encoding' not in headers and body == b'{"prompts": []}'
+    assert bundle.respond('config/prompts.json', 'gzip', headers['ETag'])[0] == 304
+
+    (tmp_path / 'config' / 'prompts.json').write_text('{"prompts": [1]}')
+    bundle.build()
+    assert bundle.respond('config/prompts.json', None, headers['ETag'])[0] == 200
+
+
+def test_choose_encoding_respects_q_values(tmp_path):
+    asset = _site(tmp_path).get('app.js')
+    assert choose_encoding(asset, None) == 'identity'
+    assert choose_encoding(asset, 'gzip;q=0, identity') == 'identity'
+    assert choose_encoding(asset, '*') in asset.encodings
+    assert choose_encoding(asset, 'br;q=1.0, gzip;q=0.5') in ('br', 'gzip')
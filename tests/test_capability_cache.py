@@ -0,0 +1,68 @@
+"""
+平台能力检测缓存测试。
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from platform_detection.cache import CapabilityCache, capability_cache_key
+from platform_detection.detector import PlatformDetector
+
+
+def test_probe_finds_tools_on_path_and_modules(tmp_path):
+    tool = tmp_path / 'xclip'
+    tool.write_text('#!/bin/sh\n')
+    tool.chmod(0o755)
+    old_path = os.environ.get('PATH', '')
+    os.environ['PATH'] = str(tmp_path)
+    try:
+        tools, modules = PlatformDetector._probe(['xdotool', 'xclip'], ['json', 'aiput_no_such_module'])
+    finally:
+        os.environ['PATH'] = old_path
+    assert tools == ['xclip']
+    assert modules == {'json': True, 'aiput_no_such_module': False}
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    cache = CapabilityCache(tmp_path / 'capabilities.json', ttl=60)
+    key = capability_cache_key('Linux', 'Wayland', 'KDE')
+    assert cache.get(key) is None
+
+    cache.put(key, {'keyboard_tools': ['wtype']})
+    assert cache.get(key) == {'keyboard_tools': ['wtype']}
+    # 桌面环境或 PATH 变化时缓存失效
+    assert cache.get(capability_cache_key('Linux', 'Wayland', 'GNOME')) is None
+    old_path = os.environ.get('PATH', '')
+    os.environ['PATH'] = old_path + os.pathsep + str(tmp_path)
+    try:
+        assert cache.get(capability_cache_key('Linux', 'Wayland', 'KDE')) is None
+    finally:
+        os.environ['PATH'] = old_path
+
+    assert CapabilityCache(tmp_path / 'capabilities.json', ttl=-1).get(key) is None
+    (tmp_path / 'capabilities.json').write_text('not json')
+    assert cache.get(key) is None
+
+
+def test_detect_reuses_cached_capabilities(tmp_path):
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return {'probed': True}
+
+    old_cache = os.environ.get('AIPUT_CAPABILITY_CACHE')
+    os.environ['AIPUT_CAPABILITY_CACHE'] = str(tmp_path / 'capabilities.json')
+    try:
+        first = PlatformDetector._cached_capabilities('Linux', 'X11', 'XFCE', probe, True)
+        second = PlatformDetector._cached_capabilities('Linux', 'X11', 'XFCE', probe, True)
+        PlatformDetector._cached_capabilities('Linux', 'X11', 'XFCE', probe, False)
+    finally:
+        if old_cache is None:
+            del os.environ['AIPUT_CAPABILITY_CACHE']
+        else:
+            os.environ['AIPUT_CAPABILITY_CACHE'] = old_cache
+    assert first == second == {'probed': True}
+    assert len(calls) == 2
@@ -0,0 +1,40 @@
+"""
+命令行入口测试：无界面模式不导入 GUI 模块。
+"""
+
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+sys.path.insert(0, SRC_DIR)
+
+from cli import build_parser
+
+
+def test_serve_arguments():
+    args = build_parser().parse_args(['serve', '--port', '40000', '--no-qr'])
+    assert args.command == 'serve' and args.port == 40000 and args.no_qr
+    assert build_parser().parse_args([]).command is None
+
+
+def test_malformed_idle_timeout_env_does_not_break_parsing(monkeypatch):
+    from server.activation import get_idle_timeout
+
+    monkeypatch.setenv('AIPUT_IDLE_TIMEOUT', 'ten minutes')
+    # 默认值在 serve 时由 get_idle_timeout 校验，解析参数不会出错
+    assert build_parser().parse_args(['serve']).idle_timeout is None
+    assert get_idle_timeout() == 0
+    monkeypatch.setenv('AIPUT_IDLE_TIMEOUT', '90')
+    assert get_idle_timeout() == 90
+
+
+def test_serve_path_does_not_import_gui_modules():
+    code = (
+        'import sys; import cli, server.bootstrap, server.network, server.aiohttp_app; '
+        'print(",".join(m for m in ("tkinter", "PIL", "qrcode", "remote_server") if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
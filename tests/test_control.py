@@ -0,0 +1,78 @@
+"""
+服务进程控制测试：图形界面通过控制通道启动独立的服务进程并查询状态。
+"""
+
+import json
+import os
+import queue
+import socket
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import control
+from server.control import CoreProcess
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _next_event(messages, name):
+    while True:
+        message = messages.get(timeout=30)
+        if message['event'] == name:
+            return message
+
+
+def test_core_process_serves_and_shuts_down():
+    messages = queue.Queue()
+    core = CoreProcess(messages.put)
+    port = _free_port()
+    # 连接建立前发送的命令会排队
+    core.start().send({'cmd': 'start', 'host': '127.0.0.1', 'port': port})
+    try:
+        server = _next_event(messages, 'server')
+        assert server['running'] and server['error'] is None
+        assert (server['host'], server['port']) == ('127.0.0.1', port)
+        assert core.process.pid != os.getpid()
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/stats', timeout=10) as response:
+            assert 'admission' in json.loads(response.read())
+
+        # 端口被占用时返回错误，服务进程继续运行
+        with socket.socket() as busy:
+            busy.bind(('127.0.0.1', 0))
+            busy.listen()
+            core.send({'cmd': 'start', 'host': '127.0.0.1', 'port': busy.getsockname()[1]})
+            server = _next_event(messages, 'server')
+        assert not server['running'] and server['error']
+
+        core.send({'cmd': 'stats'})
+        assert 'admission' in _next_event(messages, 'stats')['stats']
+    finally:
+        returncode = core.stop()
+    assert returncode == 0
+    assert _next_event(messages, 'exited')['returncode'] == 0
+
+
+def test_frozen_build_reexecutes_the_gui_entry_point(monkeypatch):
+    monkeypatch.setattr(sys, 'frozen', True, raising=False)
+    assert control.core_command('addr') == [sys.executable, 'core', '--control', 'addr']
+    monkeypatch.delattr(sys, 'frozen')
+    assert control.core_command('addr')[1].endswith('cli.py')
+
+    # 打包后的入口是 remote_server.py：`core` 参数需要在加载界面前交给命令行入口
+    entry = os.path.join(os.path.dirname(__file__), '..', 'src', 'remote_server.py')
+    monkeypatch.setattr(control, '_CLI', entry)
+    messages = queue.Queue()
+    core = CoreProcess(messages.put).start()
+    try:
+        core.send({'cmd': 'stats'})
+        assert 'admission' in _next_event(messages, 'stats')['stats']
+    finally:
+        returncode = core.stop()
+    assert returncode == 0
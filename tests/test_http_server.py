@@ -0,0 +1,81 @@
+"""
+aiohttp 生产服务器测试。
+"""
+
+import asyncio
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import aiohttp
+
+from server import create_http_server
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def _fetch(base_url):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f'{base_url}/type', json={'text': ''}) as response:
+            empty = await response.json()
+        async with session.get(f'{base_url}/') as response:
+            index = await response.text()
+        async with session.get(f'{base_url}/stats') as response:
+            stats = await response.json()
+    return empty, index, stats
+
+
+def test_production_server_serves_type_and_index(handler):
+    port = _free_port()
+    server = create_http_server(handler, mode='production')
+    server.start('127.0.0.1', port)
+    try:
+        empty, index, stats = asyncio.run(_fetch(f'http://127.0.0.1:{port}'))
+    finally:
+        server.stop()
+
+    assert set(empty.pop('timings')) >= {'total'}
+    assert empty.pop('trace_id')
+    assert empty == {'success': False, 'error': '接收到空文本'}
+    assert '<html' in index.lower()
+    assert stats['injection_queue']['processed'] == 1
+
+
+async def _submit_over_websocket(base_url, payload):
+    messages = []
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(f'{base_url}/ws') as ws:
+            await ws.send_json({'type': 'ping'})
+            await ws.send_json({'type': 'submit', 'id': 'm1', **payload})
+            async for msg in ws:
+                message = msg.json()
+                messages.append(message)
+                if message['type'] == 'result':
+                    break
+    return messages
+
+
+def test_websocket_reports_stages_and_result(handler):
+    port = _free_port()
+    server = create_http_server(handler, mode='production')
+    server.start('127.0.0.1', port)
+    try:
+        messages = asyncio.run(_submit_over_websocket(
+            f'http://127.0.0.1:{port}', {'text': 'hello', 'auto_submit': True}))
+    finally:
+        server.stop()
+
+    kinds = [m['type'] for m in messages]
+    assert kinds[:3] == ['hello', 'pong', 'ack']
+    stages = [m['stage'] for m in messages if m['type'] == 'event']
+    assert stages == ['queued', 'pasted', 'submitted']
+    result = messages[-1]
+    assert {'clipboard', 'paste', 'ctrl_enter', 'total'} <= set(result.pop('timings'))
+    assert result.pop('trace_id')
+    assert result == {'type': 'result', 'id': 'm1', 'success': True}
@@ -0,0 +1,48 @@
+"""
+幂等键 / 重复提交抑制测试。
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.idempotency import IdempotencyCache
+
+
+def test_duplicates_are_pasted_once(adapters, handler):
+    async def main():
+        payload = {'text': 'hello', 'idempotency_key': 'k1'}
+        # 双击：两个并发请求
+        first, second = await asyncio.gather(handler.handle(payload), handler.handle(payload))
+        # 网络重试：稍后再次发送（Header 中的 key 优先）
+        retry = await handler.handle({'text': 'hello'}, idempotency_key='k1')
+        return first, second, retry
+
+    first, second, retry = asyncio.run(main())
+    assert adapters.pasted == ['hello']
+    # 重复请求返回首个请求的 trace
+    assert second['trace_id'] == retry['trace_id'] == first['trace_id']
+    for response in (first, second, retry):
+        response.pop('trace_id')
+        response.pop('timings')
+    assert first == {'success': True}
+    assert second == {'success': True, 'duplicate': True}
+    assert retry == {'success': True, 'duplicate': True}
+
+
+def test_failures_are_not_cached_and_cache_is_bounded():
+    cache = IdempotencyCache(max_entries=2, ttl=60)
+
+    owner, _ = cache.begin('failed')
+    cache.finish('failed', {'success': False})
+    assert cache.begin('failed')[0] is True
+
+    for key in ('a', 'b', 'c'):
+        assert cache.begin(key)[0] is True
+        cache.finish(key, {'success': True})
+    assert len(cache) == 2
+    assert cache.begin('a')[0] is True
+    owner, future = cache.begin('c')
+    assert owner is False and future.result() == {'success': True}
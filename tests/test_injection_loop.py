@@ -0,0 +1,146 @@
+"""
+注入事件循环测试。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import InjectionLoop, KeepAliveTask, TypeHandler
+from server.core import TypeRequest
+
+
+class FakeClipboard:
+    def __init__(self):
+        self.threads = set()
+        self.lock = None
+
+    async def copy_text(self, text):
+        # 跨请求复用的 asyncio 资源只在注入循环中可用
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            self.threads.add(threading.current_thread().name)
+        return True
+
+
+class FakeKeyboard:
+    def __init__(self):
+        self.keep_alive_calls = 0
+
+    async def send_paste_command(self):
+        return True
+
+    async def send_ctrl_enter(self):
+        return True
+
+    async def keep_alive(self):
+        self.keep_alive_calls += 1
+        return True
+
+
+def test_adapter_work_runs_on_one_persistent_loop():
+    loop = InjectionLoop(name='test-injection')
+    clipboard = FakeClipboard()
+    adapters = SimpleNamespace(clipboard=clipboard, keyboard=FakeKeyboard(), notifications=None)
+    handler = TypeHandler(adapters, injection_loop=loop)
+    try:
+        # 每个请求使用各自的事件循环，模拟不同前端线程
+        for text in ('one', 'two'):
+            result = asyncio.run(handler.inject(TypeRequest(text=text), text, False))
+            assert result['success'] is True
+        assert clipboard.threads == {'test-injection'}
+        assert loop.run(asyncio.sleep(0, result=42)) == 42
+    finally:
+        loop.stop()
+
+
+def test_keep_alive_task_triggers_immediately_and_stops():
+    loop = InjectionLoop(name='test-keep-alive')
+    keyboard = FakeKeyboard()
+    task = KeepAliveTask(keyboard, interval=0.05, injection_loop=loop)
+    try:
+        task.start()
+        time.sleep(0.18)
+        task.stop()
+        calls = keyboard.keep_alive_calls
+        assert calls >= 2
+        time.sleep(0.1)
+        assert keyboard.keep_alive_calls == calls
+    finally:
+        loop.stop()
+
+
+def test_tool_commands_do_not_block_the_injection_loop():
+    import subprocess
+    import pytest
+    from platform_adapters.linux.commands import run_command
+
+    loop = InjectionLoop(name='test-commands')
+    ticks = []
+
+    async def tick():
+        for _ in range(10):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        ticker = asyncio.ensure_future(tick())
+        # 等待外部工具期间循环继续处理其他任务
+        code = await run_command([sys.executable, '-c', 'import sys, time; sys.stdin.read(); time.sleep(0.3)'],
+                                 input=b'text', timeout=5)
+        await ticker
+        with pytest.raises(subprocess.TimeoutExpired):
+            await run_command([sys.executable, '-c', 'import time; time.sleep(5)'], timeout=0.2)
+        return code
+
+    try:
+        assert loop.run(main()) == 0
+    finally:
+        loop.stop()
+    # 工具运行 0.3 秒期间计时任务没有停顿
+    assert len(ticks) == 10 and ticks[4] - ticks[0] < 0.25
+
+
+def test_notification_sound_does_not_block_the_injection_loop(monkeypatch, tmp_path):
+    from platform_adapters.linux.adapter import LinuxNotificationAdapter
+
+    # 假的 aplay：播放 0.5 秒
+    player = tmp_path / 'aplay'
+    player.write_text(f'#!{sys.executable}\nimport time\ntime.sleep(0.5)\n')
+    player.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+    notifications = LinuxNotificationAdapter(None)
+    notifications._custom_sound = str(player)
+    assert notifications._aplay_available
+
+    loop = InjectionLoop(name='test-sound')
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        ticker = asyncio.ensure_future(tick())
+        started = time.monotonic()
+        played = await notifications.play_notification_sound()
+        returned = time.monotonic()
+        await ticker
+        # 停止循环前等待后台播放结束
+        await asyncio.gather(*notifications._players)
+        return played, started, returned
+
+    try:
+        played, started, returned = loop.run(main())
+    finally:
+        loop.stop()
+    # 播放器在后台继续运行，粘贴流程只等待片刻；等待期间计时任务照常运行
+    assert played and returned - started < 0.5
+    assert ticks[1] < returned
@@ -0,0 +1,64 @@
+"""
+有序注入队列测试。
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import InjectionLoop
+from server.injection_queue import InjectionQueue
+
+
+def test_injection_runs_in_arrival_order_even_if_ready_out_of_order():
+    loop = InjectionLoop(name='test-queue')
+    queue = InjectionQueue(loop)
+    injected = []
+
+    async def paste(text):
+        injected.append(text)
+        await asyncio.sleep(0.01)
+        return text
+
+    async def request(text, ai_delay):
+        ticket = queue.reserve()
+        await asyncio.sleep(ai_delay)  # 模拟 AI 处理耗时
+        return await queue.run(ticket, paste(text))
+
+    async def main():
+        return await asyncio.gather(request('first', 0.08), request('second', 0.0), request('third', 0.03))
+
+    try:
+        assert asyncio.run(main()) == ['first', 'second', 'third']
+        assert injected == ['first', 'second', 'third']
+        stats = queue.stats()
+        assert stats['processed'] == 3
+        assert stats['depth'] == 0
+        assert stats['order_wait']['max_ms'] > 0
+    finally:
+        loop.stop()
+
+
+def test_cancelled_ticket_does_not_block_later_requests():
+    loop = InjectionLoop(name='test-queue-cancel')
+    queue = InjectionQueue(loop)
+
+    async def paste():
+        return 'ok'
+
+    async def main():
+        abandoned = queue.reserve()
+        ticket = queue.reserve()
+        task = asyncio.ensure_future(queue.run(ticket, paste()))
+        await asyncio.sleep(0.02)
+        assert not task.done()
+        queue.cancel(abandoned)
+        return await asyncio.wait_for(task, 1)
+
+    try:
+        assert asyncio.run(main()) == 'ok'
+        assert queue.stats()['skipped'] == 1
+    finally:
+        loop.stop()
@@ -0,0 +1,88 @@
+"""
+异步任务 API（POST /jobs + SSE）测试。
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import aiohttp
+
+from server import TypeHandler, create_http_server
+from server.jobs import JobStore
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+async def _run_job(base_url):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f'{base_url}/jobs', json={'text': ''}) as response:
+            assert response.status == 202
+            job = await response.json()
+        async with session.get(f"{base_url}{job['events']}") as response:
+            assert response.headers['Content-Type'].startswith('text/event-stream')
+            full = _parse_sse(await response.text())
+        # 断线重连：只收到 Last-Event-ID 之后的事件
+        async with session.get(f"{base_url}{job['events']}", headers={'Last-Event-ID': '1'}) as response:
+            resumed = _parse_sse(await response.text())
+        async with session.get(f"{base_url}/jobs/{job['job_id']}") as response:
+            status = await response.json()
+        async with session.get(f'{base_url}/jobs/missing/events') as response:
+            missing = response.status
+    return full, resumed, status, missing
+
+
+def test_job_events_stream_and_resume():
+    port = _free_port()
+    server = create_http_server(TypeHandler(), mode='production')
+    server.start('127.0.0.1', port)
+    try:
+        full, resumed, status, missing = asyncio.run(_run_job(f'http://127.0.0.1:{port}'))
+    finally:
+        server.stop()
+
+    assert [(name, data.get('stage')) for _, name, data in full] == [
+        ('stage', 'queued'), ('stage', 'error'), ('result', None)]
+    assert {k: v for k, v in full[-1][2].items() if k not in ('trace_id', 'timings')} == {
+        'success': False, 'error': '接收到空文本'}
+    assert resumed == full[1:]
+    assert status['done'] is True and status['result'] == full[-1][2]
+    assert missing == 404
+
+
+def test_store_is_bounded_and_evicts_finished_jobs():
+    class InstantHandler:
+        async def handle(self, data, client_ip, on_event=None, idempotency_key=None):
+            return {'success': True}
+
+    async def main():
+        store = JobStore(InstantHandler(), max_entries=2, ttl=60)
+        first = store.submit({}, 'test')
+        second = store.submit({}, 'test')
+        # 表已满且任务未完成：拒绝新任务
+        assert store.submit({}, 'test') is None
+        await asyncio.sleep(0.05)
+        third = store.submit({}, 'test')
+        assert third is not None
+        assert store.get(first.id) is None
+        assert store.get(second.id) is not None
+        assert len(store) == 2
+
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+适配器延迟导入测试：用 python -X importtime 检查启动时实际导入的模块。
+"""
+
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+sys.path.insert(0, SRC_DIR)
+
+# 创建适配器时允许的导入总耗时（微秒）
+IMPORT_BUDGET_US = 500_000
+
+OPTIONAL_MODULES = ('pyautogui', 'pyperclip', 'pystray', 'PIL', 'tkinter', 'pynput', 'AppKit', 'Quartz')
+
+
+def _importtime(code):
+    # 不读写用户的能力检测缓存（~/.cache/aiput），每次都重新检测
+    env = dict(os.environ, AIPUT_CAPABILITY_CACHE='off')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=SRC_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        try:
+            imports[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # 表头
+    return imports
+
+
+def test_factory_imports_only_the_current_platform():
+    imports = _importtime(
+        'from platform_adapters.factory import AdapterFactory; AdapterFactory.create_adapters()')
+
+    adapter_modules = {name for name in imports if name.startswith('platform_adapters.')
+                       and name.endswith('.adapter')}
+    assert len(adapter_modules) == 1
+    assert not [name for name in imports if name.split('.')[0] in OPTIONAL_MODULES]
+
+    # platform_adapters 包含 factory；平台模块在创建适配器时才导入
+    total = imports['platform_adapters'] + sum(imports[name] for name in adapter_modules)
+    assert total < IMPORT_BUDGET_US
+
+
+def test_optional_module_is_imported_on_first_use():
+    from platform_adapters.optional import OptionalModule
+
+    module = OptionalModule('colorsys')
+    assert module.installed
+    assert module.load() is module.load()
+    missing = OptionalModule('aiput_no_such_module')
+    assert not missing.installed and missing.load() is None and not missing.available
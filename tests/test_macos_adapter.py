@@ -89,7 +89,7 @@ async def test_macos_adapter():
     # 8. 测试通知声音
     print("\n=== 8. 测试通知声音 ===")
     print("准备播放通知声音...")
-    success = adapter.notifications.play_notification_sound()
+    success = await adapter.notifications.play_notification_sound()
     print(f"声音播放: {'✓ 成功' if success else '✗ 失败'}")
 
     # 9. 测试 send_text
@@ -0,0 +1,79 @@
+"""
+Prometheus 指标测试。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import metrics
+from server.metrics import MetricsRegistry
+
+
+def test_histogram_aggregates_per_thread_shards():
+    registry = MetricsRegistry()
+    latency = registry.histogram('test_latency_seconds', 'Test latency.', ('stage',), buckets=(0.1, 1.0))
+    series = latency.labels('paste')
+
+    def worker():
+        for _ in range(1000):
+            series.observe(0.05)
+        series.observe(5)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{stage="paste",le="0.1"} 4000' in text
+    assert 'test_latency_seconds_bucket{stage="paste",le="1"} 4000' in text
+    assert 'test_latency_seconds_bucket{stage="paste",le="+Inf"} 4004' in text
+    assert 'test_latency_seconds_count{stage="paste"} 4004' in text
+
+
+def test_shards_of_exited_threads_are_merged():
+    registry = MetricsRegistry()
+    requests = registry.counter('test_requests_total', 'Test requests.').labels()
+
+    # 开发服务器为每个请求创建新线程
+    for _ in range(50):
+        thread = threading.Thread(target=requests.inc)
+        thread.start()
+        thread.join()
+
+    assert requests.value() == 50
+    assert len(requests._shards) == 0
+    requests.inc()
+    assert requests.value() == 51 and len(requests._shards) == 1
+
+
+def _sample(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + ' '):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_handler_records_request_and_step_metrics(handler):
+    # 注册表是全局的，其他测试也会记录注入步骤
+    steps = ('aiput_injection_step_seconds_count{step="clipboard",method="fake-tool"}',
+             'aiput_injection_step_seconds_count{step="paste",method="fake-tool"}')
+    before = metrics.REGISTRY.render()
+    asyncio.run(handler.handle({'text': 'hello'}))
+    # 客户端提交的未知或无法哈希的 mode 不会产生新的时间序列，也不会导致 500
+    for mode in ('made-up-mode', ['list'], {'a': 1}):
+        assert asyncio.run(handler.handle({'text': 'hello', 'mode': mode}))['success']
+
+    text = metrics.REGISTRY.render()
+    assert 'aiput_requests_total{mode="none",provider="none",outcome="success"}' in text
+    other = 'aiput_requests_total{mode="other",provider="none",outcome="success"}'
+    assert _sample(text, other) - _sample(before, other) == 3
+    assert 'made-up-mode' not in text
+    for series in steps:
+        assert _sample(text, series) - _sample(before, series) == 4
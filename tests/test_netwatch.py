@@ -0,0 +1,71 @@
+"""
+网卡地址监视测试：rtnetlink 消息解析与定时检查后备方案。
+"""
+
+import os
+import socket
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import netwatch
+from server.netwatch import (AddressEvent, AddressWatcher, IFA_ADDRESS, IFA_LABEL, IFA_LOCAL,
+                             NLMSG_DONE, RT_SCOPE_HOST, RTM_DELADDR, RTM_NEWADDR,
+                             parse_address_messages)
+
+
+def _attribute(attr_type, value):
+    length = 4 + len(value)
+    return (length.to_bytes(2, sys.byteorder) + attr_type.to_bytes(2, sys.byteorder)
+            + value + b'\0' * ((4 - length % 4) % 4))
+
+
+def _message(msg_type, address=None, label=b'', scope=0, family=socket.AF_INET, local=None):
+    body = netwatch.IFADDRMSG.pack(family, 24, 0, scope, 2)
+    if address:
+        body += _attribute(IFA_ADDRESS, socket.inet_aton(address))
+    if local:
+        body += _attribute(IFA_LOCAL, socket.inet_aton(local))
+    if label:
+        body += _attribute(IFA_LABEL, label + b'\0')
+    return netwatch.NLMSG_HEADER.pack(16 + len(body), msg_type, 0, 0, 0) + body
+
+
+def test_parse_address_messages():
+    data = (_message(RTM_NEWADDR, '192.168.1.20', b'wlan0')
+            + _message(RTM_NEWADDR, '127.0.0.1', b'lo', scope=RT_SCOPE_HOST)
+            + _message(RTM_NEWADDR, '10.8.0.1', b'tun0', local='10.8.0.2')
+            + _message(RTM_DELADDR, '192.168.1.20', b'wlan0')
+            + _message(RTM_NEWADDR, family=socket.AF_INET6)
+            + netwatch.NLMSG_HEADER.pack(20, NLMSG_DONE, 0, 0, 0) + b'\0' * 4)
+    events, done = parse_address_messages(data)
+    assert done
+    assert events == [
+        AddressEvent(True, '192.168.1.20', 'wlan0'),
+        AddressEvent(True, '10.8.0.2', 'tun0'),
+        AddressEvent(False, '192.168.1.20', 'wlan0'),
+    ]
+    # 截断的消息被忽略
+    assert parse_address_messages(data[:10]) == ([], False)
+
+
+def test_polling_fallback_reports_differences(monkeypatch):
+    snapshots = iter([['192.168.1.20'], ['192.168.1.20'], ['10.0.0.5']])
+    monkeypatch.setattr(netwatch, '_polled_addresses', lambda: next(snapshots, ['10.0.0.5']))
+    changes = []
+    changed = threading.Event()
+
+    def on_change(events, addresses):
+        changes.append((events, addresses))
+        if events:
+            changed.set()
+
+    watcher = AddressWatcher(on_change, poll_interval=0.01, use_netlink=False).start()
+    try:
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+    assert watcher.backend == 'poll'
+    assert changes[0] == ([], ['192.168.1.20'])
+    assert changes[1] == ([AddressEvent(False, '192.168.1.20'), AddressEvent(True, '10.0.0.5')], ['10.0.0.5'])
@@ -0,0 +1,50 @@
+"""
+后台二维码渲染测试：缓存命中立即返回，连续输入只渲染最新的值。
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from qr_render import QRRenderer
+
+
+def test_latest_request_wins_and_results_are_memoized():
+    first_started = threading.Event()
+    release = threading.Event()
+    rendered = []
+
+    def render(ip, port):
+        rendered.append(port)
+        if port == 1:
+            first_started.set()
+            release.wait(5)
+        return f'image {ip}:{port}', f'http://{ip}:{port}'
+
+    done = threading.Event()
+    results = []
+
+    def callback(ip, port, image, url):
+        results.append((port, image))
+        if port == 3:
+            done.set()
+
+    renderer = QRRenderer(render)
+    try:
+        renderer.request('10.0.0.2', 1, callback)
+        assert first_started.wait(5)
+        # 渲染期间继续输入：只保留最后一个请求
+        renderer.request('10.0.0.2', 2, callback)
+        renderer.request('10.0.0.2', 3, callback)
+        release.set()
+        assert done.wait(5)
+
+        results.clear()
+        renderer.request('10.0.0.2', 3, callback)
+        assert results == [(3, 'image 10.0.0.2:3')]
+    finally:
+        renderer.stop()
+    assert rendered == [1, 3]
+    assert renderer.renders == 2
@@ -0,0 +1,70 @@
+"""
+两阶段调度器测试。
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import InjectionLoop
+from server.scheduler import RequestScheduler
+
+
+def _run_burst(scheduler, count, ai_seconds, inject_seconds):
+    events = []
+
+    async def ai(i):
+        events.append(('ai_start', i, time.monotonic()))
+        await asyncio.sleep(ai_seconds)
+        return i
+
+    async def paste(i):
+        events.append(('paste_start', i, time.monotonic()))
+        await asyncio.sleep(inject_seconds)
+        events.append(('paste_end', i, time.monotonic()))
+        return i
+
+    async def request(i):
+        ticket = scheduler.reserve()
+        result = await scheduler.run_ai(ai(i))
+        return await scheduler.inject(ticket, paste(result))
+
+    async def main():
+        return await asyncio.gather(*(request(i) for i in range(count)))
+
+    return asyncio.run(main()), events
+
+
+def test_next_ai_call_overlaps_current_paste():
+    injection_loop = InjectionLoop(name='test-sched-inject')
+    scheduler = RequestScheduler(injection_loop, max_ai_concurrency=1)
+    try:
+        results, events = _run_burst(scheduler, 3, ai_seconds=0.05, inject_seconds=0.05)
+    finally:
+        scheduler.stop()
+        injection_loop.stop()
+
+    assert results == [0, 1, 2]
+    times = {(name, i): t for name, i, t in events}
+    # 请求 1 的 AI 调用在请求 0 粘贴结束之前开始
+    assert times[('ai_start', 1)] < times[('paste_end', 0)]
+    assert [i for name, i, _ in events if name == 'paste_start'] == [0, 1, 2]
+    assert scheduler.stats()['ai_stage']['completed'] == 3
+
+
+def test_ai_stage_parallelism_is_bounded():
+    injection_loop = InjectionLoop(name='test-sched-bound')
+    scheduler = RequestScheduler(injection_loop, max_ai_concurrency=2)
+    try:
+        _, events = _run_burst(scheduler, 4, ai_seconds=0.05, inject_seconds=0)
+    finally:
+        scheduler.stop()
+        injection_loop.stop()
+
+    starts = sorted(t for name, _, t in events if name == 'ai_start')
+    # 前两个立即开始，后两个要等第一批完成
+    assert starts[1] - starts[0] < 0.03
+    assert starts[2] - starts[0] >= 0.04
@@ -0,0 +1,64 @@
+"""
+分阶段并行启动测试。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.startup import StartupOrchestrator
+
+
+def test_stages_receive_dependency_results():
+    startup = StartupOrchestrator()
+    startup.add('platform', lambda: 'linux')
+    startup.add('adapters', lambda platform: f'{platform}-adapters', after=['platform'])
+    startup.add('broken', lambda: 1 / 0)
+    startup.add('after_broken', lambda value: value, after=['broken'])
+    startup.start()
+
+    assert startup.result('adapters', timeout=5) == 'linux-adapters'
+    assert startup.result('after_broken', timeout=5) is None
+    assert startup.future('after_broken').exception() is not None
+    assert set(startup.timings()) >= {'platform', 'adapters', 'broken'}
+
+
+def test_wait_timeout_does_not_cancel_stage():
+    release = threading.Event()
+    startup = StartupOrchestrator()
+    startup.add('slow', lambda: release.wait(5) and 'ready')
+    startup.start()
+
+    assert asyncio.run(startup.wait('slow', timeout=0.05)) is None
+    release.set()
+    assert asyncio.run(startup.wait('slow', timeout=5)) == 'ready'
+
+
+def test_type_request_waits_for_adapters(adapters, handler):
+    release = threading.Event()
+    # 适配器在启动阶段完成后才可用
+    handler.platform_adapters = None
+
+    def create_adapters():
+        release.wait(5)
+        handler.platform_adapters = adapters
+        return adapters
+
+    startup = StartupOrchestrator()
+    startup.add('adapters', create_adapters)
+    startup.add('ai_service', lambda: None)
+    handler.startup = startup.start()
+
+    async def scenario():
+        request = asyncio.ensure_future(handler.handle({'text': 'hello'}, '127.0.0.1'))
+        await asyncio.sleep(0.05)
+        assert not request.done()
+        release.set()
+        return await request
+
+    response = asyncio.run(scenario())
+    assert response['success']
+    assert adapters.copied == ['hello']
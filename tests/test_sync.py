@@ -0,0 +1,85 @@
+"""
+离线发件箱批量同步 (/sync) 测试。
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.admission import REJECT, AdmissionDecision
+from server.idempotency import IdempotencyCache
+from server.sync import sync_batch
+
+
+def _run(handler, *batches):
+    async def main():
+        return [await sync_batch(handler, batch, '127.0.0.1') for batch in batches]
+    return asyncio.run(main())
+
+
+def test_batch_is_pasted_in_seq_order_with_deduplication(adapters, handler):
+    batch = {'items': [
+        {'seq': 3, 'text': 'third', 'idempotency_key': 'c'},
+        {'seq': 1, 'text': 'first', 'idempotency_key': 'a'},
+        {'seq': 2, 'text': 'second', 'idempotency_key': 'b'},
+        {'seq': 2, 'text': 'second', 'idempotency_key': 'b'},
+    ]}
+    (status, first), (_, retry) = _run(handler, batch, {'items': batch['items'][:2]})
+
+    assert status == 200
+    assert adapters.pasted == ['first', 'second', 'third']
+    assert [result['seq'] for result in first['results']] == [1, 2, 3]
+    assert first['processed'] == 3 and all(result['success'] for result in first['results'])
+    # 响应丢失后重发：返回已有结果，不会再次粘贴
+    assert all(result['duplicate'] for result in retry['results'])
+    assert adapters.pasted == ['first', 'second', 'third']
+
+
+def test_overloaded_item_leaves_the_rest_queued(adapters, handler):
+    # 第二条被拒绝：准入控制报告过载
+    checks = iter([False, True, False])
+    original_check = handler.admission.check
+
+    def check(ai_requested):
+        decision = original_check(ai_requested)
+        if next(checks):
+            decision = AdmissionDecision(REJECT, retry_after=1, reason='test')
+        return decision
+
+    handler.admission.check = check
+    items = [{'seq': i, 'text': f'item {i}', 'idempotency_key': str(i)} for i in (1, 2, 3)]
+    [(status, body)] = _run(handler, {'items': items})
+
+    assert status == 200
+    assert adapters.pasted == ['item 1']
+    assert [result.get('skipped', False) for result in body['results']] == [False, False, True]
+    assert body['results'][1]['overloaded']
+    assert body['processed'] == 2
+
+
+def test_items_older_than_the_idempotency_ttl_are_not_pasted(adapters, handler):
+    handler.idempotency = IdempotencyCache(ttl=0.05)
+
+    async def main():
+        # 首次提交已粘贴但响应丢失，之后幂等键过期被服务器遗忘
+        await handler.handle({'text': 'pasted once', 'idempotency_key': 'a'}, '127.0.0.1')
+        time.sleep(0.1)
+        return await sync_batch(handler, {'items': [
+            {'seq': 1, 'text': 'pasted once', 'idempotency_key': 'a', 'age_ms': 100},
+        ]}, '127.0.0.1')
+
+    status, body = asyncio.run(main())
+
+    assert status == 200
+    assert adapters.pasted == ['pasted once']
+    assert body['results'] == [{'seq': 1, 'success': False, 'expired': True, 'error': '离线消息已过期，未发送'}]
+    assert body['processed'] == 0 and body['max_age_ms'] == 0
+
+
+def test_rejects_malformed_and_oversized_batches(handler):
+    assert _run(handler, None)[0][0] == 400
+    assert _run(handler, {'items': ['text']})[0][0] == 400
+    assert _run(handler, {'items': [{'seq': i} for i in range(51)]})[0][0] == 413
@@ -0,0 +1,39 @@
+"""
+请求追踪（trace id 与分阶段耗时）测试。
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server.core import http_status
+from server.tracing import RequestTrace, server_timing_header
+
+
+def test_trace_id_is_kept_or_replaced():
+    assert RequestTrace('phone-42').trace_id == 'phone-42'
+    assert RequestTrace('bad id\r\nX-Injected: 1').trace_id != 'bad id\r\nX-Injected: 1'
+    assert len(RequestTrace().trace_id) == 16
+
+
+def test_server_timing_header_format():
+    assert server_timing_header({'paste': 1.5, 'total': 120.0}) == 'paste;dur=1.5, total;dur=120.0'
+
+
+def test_response_carries_stage_timings_and_headers(handler):
+    response = asyncio.run(handler.handle({'text': 'hello', 'auto_submit': True}, trace_id='req-1'))
+
+    assert response['success'] and response['trace_id'] == 'req-1'
+    timings = response['timings']
+    assert list(timings)[-1] == 'total'
+    assert {'queue', 'clipboard', 'clipboard_settle', 'paste', 'paste_settle', 'ctrl_enter'} <= set(timings)
+    # 两次固定的 0.1 秒等待
+    assert timings['clipboard_settle'] >= 90 and timings['paste_settle'] >= 90
+    assert timings['total'] >= timings['clipboard_settle'] + timings['paste_settle']
+
+    status, headers = http_status(response)
+    assert status == 200
+    assert headers['X-Request-ID'] == 'req-1'
+    assert 'clipboard_settle;dur=' in headers['Server-Timing']